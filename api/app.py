@@ -1,6 +1,9 @@
+import time
+_IMPORT_STARTED = time.perf_counter()
+
 import sys
 import os
-from flask import Flask, request, jsonify
+from flask import Flask, Response, g, request
 from flask_cors import CORS
 
 # -----------------------------------------------------------
@@ -10,54 +13,145 @@ ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 if ROOT not in sys.path:
     sys.path.insert(0, ROOT)
 
+from api.responses import respond
+from config.settings import Settings
+from utils.logger import get_logger, get_request_id, set_request_id
+from utils import metrics, profiling
+
 # Initialize Flask app
 app = Flask(__name__)
 CORS(app)  # Enable CORS for frontend
 
 
 # -----------------------------------------------------------
-# LAZY LOADING — optimized for Vercel
+# REQUEST IDS + METRICS (every route)
 # -----------------------------------------------------------
-def load_engines():
-    """Load all engines on-demand to avoid Vercel cold boot crashes."""
+@app.before_request
+def bind_request_id():
+    set_request_id(request.headers.get("X-Request-ID"))
+    g.started = time.perf_counter()
+
+    # ?timings=1 or X-Sifra-Timings: 1 → per-stage "timings" block in the response
+    flag = request.args.get("timings") or request.headers.get("X-Sifra-Timings")
+    g.timings_token = metrics.collect_timings() if str(flag).lower() in ("1", "true") else None
+
+    # ?profile=1 or X-Sifra-Profile: 1 → cProfile + tracemalloc (PROFILING_ENABLED only)
+    if profiling.requested(request.args.get("profile") or request.headers.get("X-Sifra-Profile")):
+        session = profiling.ProfileSession(f"{request.method} {request.path}")
+        g.profile = session if session.start() else "busy"
+
+
+@app.after_request
+def add_request_id(response):
+    response.headers["X-Request-ID"] = get_request_id()
+
+    started = g.pop("started", None)
+    if started is not None:
+        route = request.url_rule.rule if request.url_rule else "unmatched"
+        metrics.observe_request(route, request.method, response.status_code, time.perf_counter() - started)
+
+    session = g.pop("profile", None)
+    if session == "busy":
+        response.headers["X-Sifra-Profile"] = "busy"
+    elif session is not None:
+        meta = session.stop(request_id=get_request_id(), status=response.status_code)
+        response.headers["X-Sifra-Profile-Id"] = meta["profile_id"]
+        response.headers["X-Sifra-Profile-Url"] = f"/profiles/{meta['profile_id']}"
+    return response
+
+
+@app.teardown_request
+def reset_timings(exc=None):
+    token = g.pop("timings_token", None)
+    if token is not None:
+        metrics.request_timings.reset(token)
+
+    # Profiling left running by an unhandled error
+    session = g.pop("profile", None)
+    if session not in (None, "busy"):
+        session.stop(request_id=get_request_id(), status=500)
+
+
+@app.get("/metrics")
+def prometheus_metrics():
+    return Response(metrics.registry.render(), mimetype="text/plain; version=0.0.4")
 
-    # Core modules
-    from data.dataset_loader import DatasetLoader
-    from core.engine_router import EngineRouter
-
-    # Old core engines
-    from tasks.auto_analyze import AutoAnalyze
-    from tasks.auto_predict import AutoPredict
-    from tasks.auto_forecast import AutoForecast
-    from tasks.auto_anomaly import AutoAnomaly
-    from tasks.auto_insights import AutoInsights
-
-    # New SIFRA 2.0 modules
-    from tasks.auto_visualize import AutoVisualize
-    from tasks.auto_eda import AutoEDA
-    from tasks.auto_feature_engineering import AutoFeatureEngineering
-    from tasks.auto_modeler import AutoModeler
-    from tasks.auto_evaluate import AutoEvaluate
-    from tasks.auto_bigdata import AutoBigData
 
+# -----------------------------------------------------------
+# PROFILE ARTIFACTS (request profiling)
+# -----------------------------------------------------------
+@app.get("/profiles/<profile_id>")
+def get_profile(profile_id):
+    if not Settings.PROFILING_ENABLED:
+        return {"error": "Profiling is disabled"}, 404
+    try:
+        return respond(profiling.load_meta(profile_id))
+    except KeyError as e:
+        return {"error": f"Profile not found: {e.args[0]}"}, 404
+
+
+@app.get("/profiles/<profile_id>/<artifact>")
+def get_profile_artifact(profile_id, artifact):
+    if not Settings.PROFILING_ENABLED:
+        return {"error": "Profiling is disabled"}, 404
+    try:
+        path = profiling.artifact_path(profile_id, artifact)
+    except KeyError as e:
+        return {"error": f"Profile not found: {e.args[0]}"}, 404
+
+    from flask import send_file
+    return send_file(path, mimetype=profiling.ARTIFACTS[artifact], as_attachment=artifact.endswith(".pstats"))
+
+
+# -----------------------------------------------------------
+# LAZY LOADING — optimized for Vercel
+# Each route imports and builds only the engines it uses; an engine is
+# constructed once per process and reused (shared with api.dispatch).
+# -----------------------------------------------------------
+ENGINES = {
+    # Core modules
+    "loader": ("data.dataset_loader", "DatasetLoader"),
+    "preprocessor": ("data.preprocessor", "Preprocessor"),
+    "router": ("core.engine_router", "EngineRouter"),
+    "core": ("core.sifra_core", "SifraCore"),
+
+    # Old modules
+    "analyzer": ("tasks.auto_analyze", "AutoAnalyze"),
+    "predictor": ("tasks.auto_predict", "AutoPredict"),
+    "forecaster": ("tasks.auto_forecast", "AutoForecast"),
+    "anomaly": ("tasks.auto_anomaly", "AutoAnomaly"),
+    "insight": ("tasks.auto_insights", "AutoInsights"),
+
+    # New modules
+    "visualize": ("tasks.auto_visualize", "AutoVisualize"),
+    "eda": ("tasks.auto_eda", "AutoEDA"),
+    "feature_eng": ("tasks.auto_feature_engineering", "AutoFeatureEngineering"),
+    "modeler": ("tasks.auto_modeler", "AutoModeler"),
+    "evaluate": ("tasks.auto_evaluate", "AutoEvaluate"),
+    "bigdata": ("tasks.auto_bigdata", "AutoBigData"),
+}
+
+
+# Pre-built engines / caches from the build step (if present)
+from api import snapshot
+snapshot.load()
+
+
+def get_engine(name):
+    from api.dispatch import engine
+    return engine(*ENGINES[name])
+
+
+def startup_report():
+    """
+    Import cost of the API entry point and of every engine built so far.
+    """
+    from api.dispatch import LOAD_TIMES
     return {
-        "loader": DatasetLoader(),
-        "router": EngineRouter(),
-
-        # Old modules
-        "analyzer": AutoAnalyze(),
-        "predictor": AutoPredict(),
-        "forecaster": AutoForecast(),
-        "anomaly": AutoAnomaly(),
-        "insight": AutoInsights(),
-
-        # New modules
-        "visualize": AutoVisualize(),
-        "eda": AutoEDA(),
-        "feature_eng": AutoFeatureEngineering(),
-        "modeler": AutoModeler(),
-        "evaluate": AutoEvaluate(),
-        "bigdata": AutoBigData(),
+        "app_import_ms": APP_IMPORT_MS,
+        "snapshot": snapshot.loaded(),
+        "engines_loaded_ms": dict(LOAD_TIMES),
+        "heavy_modules": {name: name in sys.modules for name in HEAVY_MODULES},
     }
 
 
@@ -69,26 +163,48 @@ def home():
     return {"status": "SIFRA AI API Running", "version": "2.0.0"}
 
 
+@app.get("/startup")
+def startup():
+    return respond(startup_report())
+
+
 # -----------------------------------------------------------
 # FILE UPLOAD HANDLER (CSV only)
 # -----------------------------------------------------------
 @app.post("/upload")
 def upload():
+    """
+    Streams the upload to disk, profiles it chunk by chunk and
+    registers it under a dataset ID usable by the other routes.
+    """
     try:
         if "file" not in request.files:
             return {"error": "No file uploaded"}, 400
 
         file = request.files["file"]
 
-        import pandas as pd
-        df = pd.read_csv(file)
+        from data.dataset_store import dataset_store
+        from tasks.auto_bigdata import AutoBigData
+
+        dataset_id = dataset_store.new_id()
+        path = dataset_store.file_path(dataset_id)
+        file.save(path)
+
+        profile = AutoBigData().profile_csv(path, chunk_size=Settings.UPLOAD_CHUNK_SIZE)
+        if "error" in profile:
+            dataset_store.delete_files(dataset_id)
+            return {"error": f"Upload failed: {profile['error']}"}, 400
+
+        dataset_store.register_file(dataset_id, path, profile)
 
-        return {
+        return respond({
             "status": "success",
-            "rows": len(df),
-            "columns": list(df.columns),
-            "preview": df.head(5).to_dict(orient="records")
-        }
+            "dataset_id": dataset_id,
+            "rows": profile["rows"],
+            "columns": profile["columns"],
+            "dtypes": profile["dtypes"],
+            "preview": profile["preview"]
+        })
 
     except Exception as e:
         return {"error": f"Upload failed: {str(e)}"}, 500
@@ -97,72 +213,234 @@ def upload():
 # -----------------------------------------------------------
 # COMMON DATASET PARSER
 # -----------------------------------------------------------
+def request_params(req):
+    """
+    Route options: query string, overridden by the JSON body (if any).
+    """
+    params = req.args.to_dict()
+    if req.is_json:
+        body = req.get_json(silent=True)
+        if isinstance(body, dict):
+            params.update({k: v for k, v in body.items() if k != "dataset"})
+    return params
+
+
 def extract_dataset(req, loader):
-    if not req.json or "dataset" not in req.json:
-        return None, {"error": "Missing 'dataset'"}, 400
+    """
+    Content-type dispatch shared by every dataset route:
+      application/json      {"dataset": [[...]]} rows or {"dataset": {"col": [...]}}
+      text/csv              CSV body
+      application/x-npy     .npy buffer
+      Arrow IPC stream      application/vnd.apache.arrow.stream
+    or {"dataset_id": ...} referencing a stored dataset.
+    """
+    from data.dataset_store import DatasetNotFound, dataset_store
 
     try:
-        dataset = loader.load_raw(req.json["dataset"])
+        if req.is_json or not req.mimetype:
+            body = req.get_json(silent=True, force=True)
+            if isinstance(body, dict) and "dataset_id" in body:
+                return dataset_store.load(body["dataset_id"]), None, None
+
+            if not isinstance(body, dict) or "dataset" not in body:
+                return None, {"error": "Missing 'dataset' or 'dataset_id'"}, 400
+            dataset = loader.load_json_dataset(body["dataset"])
+        else:
+            payload = req.get_data(cache=False)
+            if not payload:
+                return None, {"error": "Empty request body"}, 400
+            dataset = loader.load_body(payload, req.mimetype)
+
         return dataset, None, None
 
+    except DatasetNotFound as e:
+        return None, {"error": f"Dataset not found: {e.args[0]}"}, 404
+
+    except ImportError as e:
+        return None, {"error": f"Dataset format not available: {str(e)}"}, 415
+
     except Exception as e:
         return None, {"error": f"Dataset error: {str(e)}"}, 400
 
 
+def run_route(task, error=None, array_key=None, dataset=True):
+    """
+    Runs the api.dispatch runner of `task` on this request, so Flask,
+    background jobs and the ASGI app share one option parser and result
+    cache. Options come from request_params(); with dataset=True an
+    inline dataset is parsed from the body (any content type), while a
+    "dataset_id" is resolved by the runner. ValueError → 400 (prefixed
+    with `error`), unknown dataset → 404.
+    """
+    from api.dispatch import run_task
+    from data.dataset_store import DatasetNotFound
+
+    payload = request_params(request)
+    if dataset and not payload.get("dataset_id"):
+        parsed, err, code = extract_dataset(request, get_engine("loader"))
+        if err: return err, code
+        payload["dataset"] = parsed
+
+    try:
+        return respond(run_task(task, payload), array_key=array_key)
+    except DatasetNotFound as e:
+        return {"error": f"Dataset not found: {e.args[0]}"}, 404
+    except ValueError as e:
+        return {"error": f"{error}: {str(e)}" if error else str(e)}, 400
+
+
+# -----------------------------------------------------------
+# DATASET STORE ROUTES
+# -----------------------------------------------------------
+@app.post("/datasets")
+def create_dataset():
+    dataset, err, code = extract_dataset(request, get_engine("loader"))
+    if err: return err, code
+
+    from data.dataset_store import dataset_store
+    return respond(dataset_store.put(dataset))
+
+
+@app.get("/datasets/<dataset_id>")
+def get_dataset(dataset_id):
+    from data.dataset_store import dataset_store
+    try:
+        return respond(dataset_store.meta(dataset_id))
+    except KeyError as e:
+        return {"error": f"Dataset not found: {e.args[0]}"}, 404
+
+
+@app.put("/datasets/<dataset_id>")
+def replace_dataset(dataset_id):
+    dataset, err, code = extract_dataset(request, get_engine("loader"))
+    if err: return err, code
+
+    from data.dataset_store import dataset_store
+    try:
+        return respond(dataset_store.put(dataset, dataset_id=dataset_id))
+    except KeyError as e:
+        return {"error": f"Dataset not found: {e.args[0]}"}, 404
+
+
+@app.delete("/datasets/<dataset_id>")
+def delete_dataset(dataset_id):
+    from data.dataset_store import dataset_store
+    try:
+        dataset_store.delete(dataset_id)
+    except KeyError as e:
+        return {"error": f"Dataset not found: {e.args[0]}"}, 404
+    return respond({"status": "deleted", "dataset_id": dataset_id})
+
+
 # -----------------------------------------------------------
 # OLD ENGINE ROUTES
 # -----------------------------------------------------------
 @app.post("/analyze")
 def analyze():
-    eng = load_engines()
-    dataset, err, code = extract_dataset(request, eng["loader"])
-    if err: return err, code
-    return jsonify(eng["analyzer"].run(dataset))
+    return run_route("analyze")
 
 
 @app.post("/predict")
 def predict():
-    eng = load_engines()
-    dataset, err, code = extract_dataset(request, eng["loader"])
-    if err: return err, code
-    return jsonify(eng["predictor"].run(dataset))
+    return run_route("predict")
+
+
+@app.post("/predict/batch")
+def predict_batch():
+    """
+    Next-value predictions for many series at once:
+      {"series": {"id": [values...], ...}}  or  {"series": [[...], [...]]}
+      {"values": [...flat...], "offsets": [0, 30, 55, ...]}
+    """
+    if not isinstance(request.get_json(silent=True), dict):
+        return {"error": "JSON body required"}, 400
+    return run_route("predict_batch", "Prediction error", dataset=False)
 
 
 @app.post("/forecast")
 def forecast():
-    eng = load_engines()
-    dataset, err, code = extract_dataset(request, eng["loader"])
-    if err: return err, code
+    return run_route("forecast", "Forecast error")
 
-    steps = request.json.get("steps", 5)
-    try: steps = int(steps)
-    except: steps = 5
 
-    return jsonify(eng["forecaster"].run(dataset, steps))
+@app.post("/forecast/series")
+def forecast_series_update():
+    """
+    Live feeds: {"observations": {"series-id": [new values...]}, "steps": 5}
+    Known series are updated from their stored state, new ones fitted.
+    """
+    if not isinstance(request.get_json(silent=True), dict):
+        return {"error": "JSON body required"}, 400
+    return run_route("forecast_series", "Forecast error", dataset=False)
+
+
+@app.get("/forecast/series/<series_id>")
+def forecast_series(series_id):
+    from api.dispatch import forecast_options
+
+    try:
+        steps, _, level = forecast_options(request.args)
+        return respond(get_engine("forecaster").forecast_series(series_id, steps, level))
+    except KeyError:
+        return {"error": f"Unknown series: {series_id}"}, 404
+    except ValueError as e:
+        return {"error": f"Forecast error: {str(e)}"}, 400
+
+
+@app.delete("/forecast/series/<series_id>")
+def forecast_series_delete(series_id):
+    from tasks.forecast_state import forecast_state
+    try:
+        forecast_state.delete(series_id)
+    except KeyError:
+        return {"error": f"Unknown series: {series_id}"}, 404
+    return respond({"deleted": series_id})
 
 
 @app.post("/anomaly")
 def anomaly():
-    eng = load_engines()
-    dataset, err, code = extract_dataset(request, eng["loader"])
-    if err: return err, code
-    return jsonify(eng["anomaly"].run(dataset))
+    return run_route("anomaly")
 
 
 @app.post("/insights")
 def insights():
-    eng = load_engines()
-    dataset, err, code = extract_dataset(request, eng["loader"])
-    if err: return err, code
-    return jsonify(eng["insight"].run(dataset))
+    return run_route("insights")
 
 
 @app.post("/trend")
 def trend():
-    eng = load_engines()
-    dataset, err, code = extract_dataset(request, eng["loader"])
-    if err: return err, code
-    return jsonify({"trend_score": eng["router"].route("trend", dataset)})
+    return run_route("trend")
+
+
+@app.post("/batch")
+def batch():
+    """
+    SifraCore over many small datasets in one request (columnar result):
+      {"goal": "analyze", "datasets": [ds1, ds2, ...]}
+      {"goal": [...one per dataset...], "dataset_ids": [...]}
+      {"goal": "analyze", "values": [[...], ...], "offsets": [0, 30, 55, ...]}
+    """
+    if not isinstance(request.get_json(silent=True), dict):
+        return {"error": "JSON body required"}, 400
+    return run_route("batch", "Batch error", dataset=False)
+
+
+@app.post("/similar")
+def similar():
+    """
+    Past datasets most similar to the query (signature store kNN):
+      {"dataset": ..., "k": 5}  |  {"dataset_id": ...}  |  {"fingerprint": [...]}
+    Optional "method": "auto" (default), "exact" or "lsh".
+    """
+    body = request.get_json(silent=True)
+    if not isinstance(body, dict):
+        return {"error": "JSON body required"}, 400
+    return run_route("similar", "Similarity search error", dataset="fingerprint" not in body)
+
+
+@app.get("/signatures")
+def signatures():
+    from core.hds_unity.signature_store import signature_store
+    return respond(signature_store.stats())
 
 
 # -----------------------------------------------------------
@@ -170,59 +448,128 @@ def trend():
 # -----------------------------------------------------------
 @app.post("/visualize")
 def visualize():
-    eng = load_engines()
-    dataset, err, code = extract_dataset(request, eng["loader"])
-    if err: return err, code
-    return jsonify(eng["visualize"].run(dataset))
+    """
+    Options: "budget" (points per chart), "chart" (line / scatter / bar /
+    histogram). Big files are streamed with {"dataset_id": ..., "stream": true}
+    or a {"file_path": ...} inside DATA_DIR (and optional "columns").
+    """
+    params = request_params(request)
+    streamed = "file_path" in params or str(params.get("stream", False)).lower() in ("1", "true")
+    return run_route("visualize", "Visualization error", array_key="visual_plan.y", dataset=not streamed)
 
 
 @app.post("/eda")
 def eda():
-    eng = load_engines()
-    dataset, err, code = extract_dataset(request, eng["loader"])
-    if err: return err, code
-    return jsonify(eng["eda"].run(dataset))
+    return run_route("eda")
 
 
 @app.post("/feature_engineering")
 def feature_engineering():
-    eng = load_engines()
-    dataset, err, code = extract_dataset(request, eng["loader"])
-    if err: return err, code
-    return jsonify(eng["feature_eng"].run(dataset))
+    return run_route("feature_engineering", "Feature pipeline error", array_key="transformed_data")
+
+
+@app.get("/feature_engineering/pipelines/<pipeline_id>")
+def feature_pipeline(pipeline_id):
+    pipeline = get_engine("feature_eng").get_pipeline(pipeline_id)
+    if pipeline is None:
+        return {"error": f"Unknown pipeline '{pipeline_id}'"}, 404
+    return respond(pipeline.to_dict())
 
 
 @app.post("/modeler")
 def modeler():
-    eng = load_engines()
-    body = request.json
-
-    if "X" not in body or "y" not in body:
+    body = request.get_json(silent=True)
+    if not isinstance(body, dict) or "X" not in body or "y" not in body:
         return {"error": "Provide 'X' and 'y'"}, 400
-
-    return jsonify(eng["modeler"].run(body["X"], body["y"]))
+    return run_route("modeler", array_key="labels", dataset=False)
 
 
 @app.post("/evaluate")
 def evaluate():
-    eng = load_engines()
-    body = request.json
-
-    if "y_true" not in body or "y_pred" not in body:
-        return {"error": "Provide y_true & y_pred"}, 400
-
-    return jsonify(eng["evaluate"].run(body["y_true"], body["y_pred"]))
+    """
+    {"y_true": [...], "y_pred": [...], "segments": [...]} or, streamed
+    from a file, {"dataset_id" | "file_path" inside DATA_DIR, "true_column",
+    "pred_column", "segment_column"}; optional "task_type".
+    """
+    if not isinstance(request.get_json(silent=True), dict):
+        return {"error": "JSON body required"}, 400
+    return run_route("evaluate", array_key="labels", dataset=False)
 
 
 @app.post("/bigdata")
 def bigdata():
-    eng = load_engines()
-    body = request.json
+    return run_route("bigdata", dataset=False)
+
+
+# -----------------------------------------------------------
+# BACKGROUND JOBS (bigdata, modeler, eda, feature_engineering, batch, evaluate, visualize)
+# -----------------------------------------------------------
+_job_manager = None
+
+
+def get_job_manager():
+    """Job manager (and its worker pool) is created on first use."""
+    global _job_manager
+    if _job_manager is None:
+        from api.jobs import JobManager
+        _job_manager = JobManager()
+    return _job_manager
+
+
+@app.post("/jobs")
+def submit_job():
+    body = request.get_json(silent=True)
+    if not isinstance(body, dict) or "type" not in body:
+        return {"error": "Provide job 'type' and its payload"}, 400
+
+    payload = {k: v for k, v in body.items() if k != "type"}
+    try:
+        status = get_job_manager().submit(body["type"], payload)
+    except ValueError as e:
+        return {"error": str(e)}, 400
 
-    if "file_path" not in body:
-        return {"error": "Missing 'file_path'"}, 400
+    return respond(status, status=202)
+
+
+@app.get("/jobs/<job_id>")
+def job_status(job_id):
+    try:
+        return respond(get_job_manager().status(job_id))
+    except KeyError as e:
+        return {"error": f"Job not found: {e.args[0]}"}, 404
+
+
+@app.get("/jobs/<job_id>/result")
+def job_result(job_id):
+    try:
+        manager = get_job_manager()
+        result = manager.result(job_id)
+        if result is None:
+            return respond(manager.status(job_id), status=409)
+    except KeyError as e:
+        return {"error": f"Job not found: {e.args[0]}"}, 404
+
+    return Response(result, mimetype="application/json")
+
+
+@app.post("/jobs/<job_id>/cancel")
+def cancel_job(job_id):
+    try:
+        return respond(get_job_manager().cancel(job_id))
+    except KeyError as e:
+        return {"error": f"Job not found: {e.args[0]}"}, 404
+
+
+# -----------------------------------------------------------
+# STARTUP REPORT
+# -----------------------------------------------------------
+HEAVY_MODULES = ("pandas", "sklearn", "scipy", "pyarrow")
 
-    return jsonify(eng["bigdata"].run(body["file_path"]))
+APP_IMPORT_MS = round((time.perf_counter() - _IMPORT_STARTED) * 1000, 3)
+get_logger("api.app").info(
+    "Startup: api.app imported in %s ms (heavy modules loaded: %s)",
+    APP_IMPORT_MS, [name for name in HEAVY_MODULES if name in sys.modules] or "none"
+)
 
 
 # -----------------------------------------------------------
@@ -0,0 +1,265 @@
+# api/asgi.py
+
+import asyncio
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from urllib.parse import parse_qsl
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from api import dispatch, snapshot
+from config.settings import Settings
+from utils import metrics, profiling, serialization
+from utils.logger import new_request_id
+
+# Response bodies are sent in chunks of this size
+RESPONSE_CHUNK = 64 * 1024
+
+EXECUTORS = {
+    "process": ProcessPoolExecutor,
+    "thread": ThreadPoolExecutor,
+}
+
+# Task runners whose Flask path is not "/<task>"
+TASK_PATHS = {
+    "predict_batch": "/predict/batch",
+    "forecast_series": "/forecast/series",
+}
+
+# Same paths as the Flask app: path → api.dispatch task
+ROUTES = {TASK_PATHS.get(name, f"/{name}"): name for name in dispatch.TASKS}
+
+
+class QueueFull(Exception):
+    """
+    Raised when a route already has ASGI_MAX_QUEUE requests waiting.
+    """
+
+
+class RouteLimiter:
+    """
+    Per-route concurrency limit with a bounded wait queue.
+    """
+
+    def __init__(self, limit, max_queue):
+        self.semaphore = asyncio.Semaphore(limit)
+        self.max_queue = max_queue
+        self.waiting = 0
+
+    async def __aenter__(self):
+        if self.semaphore.locked() and self.waiting >= self.max_queue:
+            raise QueueFull()
+
+        self.waiting += 1
+        try:
+            await self.semaphore.acquire()
+        finally:
+            self.waiting -= 1
+
+    async def __aexit__(self, *exc):
+        self.semaphore.release()
+
+
+class SifraASGI:
+    """
+    Async serving mode for SIFRA AI (pure ASGI, no framework needed):
+        uvicorn api.asgi:app
+
+    Request bodies are read and parsed on the event loop; engines run in
+    a bounded process (or thread) pool through api.dispatch, and their
+    results are serialized inside the worker, so the loop only streams
+    bytes back. Each route has its own concurrency limit and queue.
+
+    Serves the POST task routes at the Flask app's paths (ROUTES) and
+    accepts JSON bodies ({"dataset": ...} or {"dataset_id": ...});
+    uploads, other content types and the job / dataset / per-series
+    GET and DELETE routes are served by the Flask app (api/app.py).
+
+    Request latency is recorded per route like in the Flask app and
+    served at GET /metrics. Stage histograms are recorded where engines
+    run: with the process executor they stay in the worker processes.
+    ?profile=1 / X-Sifra-Profile: 1 profiles the engine run inside its
+    executor worker (not the event loop, which only parses and sends);
+    artifacts land in DATA_DIR/profiles/ and are served by the Flask
+    app's /profiles routes.
+    """
+
+    def __init__(self, executor=None):
+        self.executor = executor
+        self._owns_executor = executor is None
+        self.limiters = {}
+
+    # ------------------------------------------------------------
+    # Executor / limits
+    # ------------------------------------------------------------
+    def get_executor(self):
+        if self.executor is None:
+            self.executor = EXECUTORS[Settings.ASGI_EXECUTOR](max_workers=Settings.ASGI_MAX_WORKERS)
+        return self.executor
+
+    def limiter(self, route):
+        if route not in self.limiters:
+            limit = Settings.ASGI_ROUTE_CONCURRENCY.get(route, Settings.ASGI_DEFAULT_CONCURRENCY)
+            self.limiters[route] = RouteLimiter(limit, Settings.ASGI_MAX_QUEUE)
+        return self.limiters[route]
+
+    def shutdown(self):
+        if self.executor is not None and self._owns_executor:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
+
+    # ------------------------------------------------------------
+    # ASGI entry point
+    # ------------------------------------------------------------
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            return await self.lifespan(receive, send)
+        if scope["type"] != "http":
+            return
+
+        method = scope["method"]
+        path = scope["path"].rstrip("/") or "/"
+
+        started, status = time.perf_counter(), 500
+        try:
+            status = await self.handle(scope, receive, send, method, path)
+        finally:
+            route = path if path in ROUTES or path in ("/", "/metrics") else "unmatched"
+            metrics.observe_request(route, method, status, time.perf_counter() - started)
+
+    async def handle(self, scope, receive, send, method, path):
+        """
+        Serves one HTTP request; returns the response status.
+        """
+        if path == "/" and method in ("GET", "HEAD"):
+            return await self.send_json(send, 200, {"status": "SIFRA AI API Running", "version": "2.0.0"})
+        if path == "/metrics" and method == "GET":
+            return await self.send_bytes(send, 200, metrics.registry.render().encode(),
+                                         content_type=b"text/plain; version=0.0.4")
+
+        route = ROUTES.get(path)
+        if route is None:
+            return await self.send_json(send, 404, {"error": f"Unknown route: {path}"})
+        if method != "POST":
+            return await self.send_json(send, 405, {"error": "Method not allowed"})
+
+        body = await self.read_body(receive)
+        if body is None:
+            return await self.send_json(send, 413, {"error": "Request body too large"})
+
+        payload, error = self.parse_payload(scope, body)
+        if error:
+            return await self.send_json(send, 400, {"error": error})
+
+        request_id = self.header(scope, b"x-request-id") or new_request_id()
+        headers = [(b"x-request-id", request_id.encode())]
+
+        flag = payload.pop("profile", None) or self.header(scope, b"x-sifra-profile")
+        label = f"{method} {path}" if profiling.requested(flag) else None
+
+        try:
+            async with self.limiter(route):
+                loop = asyncio.get_running_loop()
+                status, data, profile = await loop.run_in_executor(
+                    self.get_executor(), dispatch.run_encoded, route, payload, request_id, label
+                )
+        except QueueFull:
+            return await self.send_json(send, 503, {"error": f"Too many queued '{route}' requests"},
+                                        headers=headers + [(b"retry-after", b"1")])
+
+        if profile == "busy":
+            headers.append((b"x-sifra-profile", b"busy"))
+        elif profile is not None:
+            headers.append((b"x-sifra-profile-id", profile["profile_id"].encode()))
+            headers.append((b"x-sifra-profile-url", f"/profiles/{profile['profile_id']}".encode()))
+
+        return await self.send_bytes(send, status, data, headers)
+
+    async def lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                self.get_executor()
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                self.shutdown()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    # ------------------------------------------------------------
+    # Request parsing (event loop)
+    # ------------------------------------------------------------
+    async def read_body(self, receive):
+        limit = Settings.ASGI_MAX_BODY_MB * 1024 * 1024
+        chunks, size = [], 0
+
+        while True:
+            message = await receive()
+            chunk = message.get("body", b"")
+            size += len(chunk)
+            if size > limit:
+                return None
+            chunks.append(chunk)
+            if not message.get("more_body", False):
+                return b"".join(chunks)
+
+    def header(self, scope, name):
+        for key, value in scope.get("headers", []):
+            if key.lower() == name:
+                return value.decode("latin-1")
+        return None
+
+    def parse_payload(self, scope, body):
+        """
+        JSON body merged with query-string params (body wins).
+        """
+        payload = {}
+        if body:
+            try:
+                payload = serialization.orjson.loads(body) if serialization.orjson else json.loads(body)
+            except ValueError:
+                return None, "Invalid JSON body"
+            if not isinstance(payload, dict):
+                return None, "JSON body must be an object"
+
+        query = scope.get("query_string", b"").decode("latin-1")
+        for key, value in parse_qsl(query):
+            payload.setdefault(key, value)
+
+        return payload, None
+
+    # ------------------------------------------------------------
+    # Responses (event loop)
+    # ------------------------------------------------------------
+    async def send_json(self, send, status, result, headers=None):
+        return await self.send_bytes(send, status, serialization.dumps(result), headers)
+
+    async def send_bytes(self, send, status, data, headers=None, content_type=b"application/json"):
+        await send({
+            "type": "http.response.start",
+            "status": status,
+            "headers": [
+                (b"content-type", content_type),
+                (b"content-length", str(len(data)).encode()),
+                (b"access-control-allow-origin", b"*"),
+            ] + (headers or []),
+        })
+
+        for start in range(0, max(len(data), 1), RESPONSE_CHUNK):
+            await send({
+                "type": "http.response.body",
+                "body": data[start:start + RESPONSE_CHUNK],
+                "more_body": start + RESPONSE_CHUNK < len(data),
+            })
+        return status
+
+
+# Pre-built engines / caches from the build step (inherited by forked workers)
+snapshot.load()
+
+app = SifraASGI()
@@ -0,0 +1,425 @@
+# api/dispatch.py
+
+import importlib
+import os
+import time
+
+# -----------------------------------------------------------
+# Plain-function task runners.
+# Used where a route's work runs outside the Flask request:
+#   - background jobs (api/jobs.py) run these in worker processes
+#   - the ASGI app (api/asgi.py) runs them in its executor pool
+# Each runner imports only the engine it needs; engines are built
+# once per worker process (or restored from the startup snapshot,
+# api/snapshot.py) and reused.
+# -----------------------------------------------------------
+
+_ENGINES = {}
+
+# "module.Class" → milliseconds spent importing + constructing it
+LOAD_TIMES = {}
+
+
+def engine(module_name, class_name):
+    key = (module_name, class_name)
+    if key not in _ENGINES:
+        from api import snapshot
+
+        started = time.perf_counter()
+        instance = snapshot.restore_engine(module_name, class_name)
+        if instance is None:
+            module = importlib.import_module(module_name)
+            instance = getattr(module, class_name)()
+            snapshot.restore_pending_state()
+        _ENGINES[key] = instance
+        LOAD_TIMES[f"{module_name}.{class_name}"] = round((time.perf_counter() - started) * 1000, 3)
+    return _ENGINES[key]
+
+
+def load_payload_dataset(payload, clean=False):
+    """
+    Resolves {"dataset": ...} or {"dataset_id": ...} from a JSON payload.
+    "dataset" may also be already parsed (a DataFrame / array, as the
+    Flask routes pass request bodies of any content type).
+    """
+    if payload.get("dataset_id"):
+        from data.dataset_store import dataset_store
+        if clean:
+            return dataset_store.clean(payload["dataset_id"], engine("data.preprocessor", "Preprocessor"))
+        return dataset_store.load(payload["dataset_id"])
+
+    if "dataset" not in payload:
+        raise ValueError("Missing 'dataset' or 'dataset_id'")
+    if hasattr(payload["dataset"], "shape"):
+        return payload["dataset"]
+
+    return engine("data.dataset_loader", "DatasetLoader").load_json_dataset(payload["dataset"])
+
+
+def cached(payload, key, compute):
+    """
+    Memoizes a result on the referenced stored dataset (if any).
+    """
+    if not payload.get("dataset_id"):
+        return compute()
+
+    from data.dataset_store import dataset_store
+    return dataset_store.artifact(payload["dataset_id"], key, compute)
+
+
+# -----------------------------------------------------------
+# SIFRA CORE ROUTES
+# -----------------------------------------------------------
+def run_analyze(payload, progress=None):
+    dataset = load_payload_dataset(payload, clean=True)
+    return cached(payload, "analyze", lambda: engine("tasks.auto_analyze", "AutoAnalyze").run(dataset))
+
+
+def predict_options(params):
+    """
+    (axis, level) of a predict request, or raises ValueError.
+    """
+    axis = params.get("axis", "column")
+    if axis not in ("column", "row"):
+        raise ValueError("'axis' must be 'column' or 'row'")
+    try:
+        level = float(params.get("level", 0.95))
+    except (TypeError, ValueError):
+        level = -1
+    if not 0 < level < 1:
+        raise ValueError("'level' must be in (0, 1)")
+    return axis, level
+
+
+def run_predict(payload, progress=None):
+    axis, level = predict_options(payload)
+    dataset = load_payload_dataset(payload, clean=True)
+    return cached(payload, f"predict:{axis}:{level}",
+                  lambda: engine("tasks.auto_predict", "AutoPredict").run(dataset, axis, level))
+
+
+def run_predict_batch(payload, progress=None):
+    _, level = predict_options({"level": payload.get("level", 0.95)})
+
+    predictor = engine("tasks.auto_predict", "AutoPredict")
+    if "values" in payload:
+        if "offsets" not in payload:
+            raise ValueError("Provide 'offsets' with 'values'")
+        return predictor.run_many(payload["values"], payload["offsets"], level)
+    if not isinstance(payload.get("series"), (dict, list)):
+        raise ValueError("Missing 'series' or 'values' + 'offsets'")
+    return predictor.run_many(payload["series"], level=level)
+
+
+def forecast_options(params):
+    """
+    (steps, season, level) of a forecast request, or raises ValueError.
+    """
+    try:
+        steps = int(params.get("steps", 5))
+        season = int(params["season"]) if params.get("season") else None
+        level = float(params.get("level", 0.95))
+    except (TypeError, ValueError):
+        raise ValueError("'steps' and 'season' must be integers and 'level' a number")
+    if steps < 1 or not 0 < level < 1 or (season is not None and season < 2):
+        raise ValueError("'steps' must be positive, 'level' in (0, 1) and 'season' at least 2")
+    return steps, season, level
+
+
+def run_forecast(payload, progress=None):
+    steps, season, level = forecast_options(payload)
+    dataset = load_payload_dataset(payload, clean=True)
+    return cached(payload, f"forecast:{steps}:{season}:{level}",
+                  lambda: engine("tasks.auto_forecast", "AutoForecast").run(dataset, steps, season, level))
+
+
+def run_forecast_series(payload, progress=None):
+    """
+    Live feeds: {"observations": {"series-id": [new values...]}, "steps": 5}
+    """
+    if not isinstance(payload.get("observations"), dict):
+        raise ValueError("Provide 'observations' as {series_id: [values...]}")
+    steps, season, level = forecast_options(payload)
+    return engine("tasks.auto_forecast", "AutoForecast").update_series(payload["observations"], steps, season, level)
+
+
+def run_anomaly(payload, progress=None):
+    dataset = load_payload_dataset(payload, clean=True)
+    return cached(payload, "anomaly", lambda: engine("tasks.auto_anomaly", "AutoAnomaly").run(dataset))
+
+
+def run_insights(payload, progress=None):
+    dataset = load_payload_dataset(payload, clean=True)
+    return cached(payload, "insights", lambda: engine("tasks.auto_insights", "AutoInsights").run(dataset))
+
+
+def run_trend(payload, progress=None):
+    dataset = load_payload_dataset(payload, clean=True)
+    router = engine("core.engine_router", "EngineRouter")
+    return cached(payload, "trend", lambda: {"trend_score": router.route("trend", dataset)})
+
+
+def load_batch(payload):
+    """
+    Datasets of a batch request: {"datasets": [...]}, {"dataset_ids": [...]}
+    or stacked rows {"values": [[...]], "offsets": [...]}.
+    Returns (datasets, offsets).
+    """
+    if "values" in payload:
+        if "offsets" not in payload:
+            raise ValueError("Provide 'offsets' with 'values'")
+        import numpy as np
+        return np.asarray(payload["values"], dtype=float), payload["offsets"]
+
+    if payload.get("dataset_ids"):
+        from data.dataset_store import dataset_store
+        preprocessor = engine("data.preprocessor", "Preprocessor")
+        return [dataset_store.clean(dataset_id, preprocessor) for dataset_id in payload["dataset_ids"]], None
+
+    if not isinstance(payload.get("datasets"), list):
+        raise ValueError("Missing 'datasets', 'dataset_ids' or 'values' + 'offsets'")
+
+    loader = engine("data.dataset_loader", "DatasetLoader")
+    return [loader.load_json_dataset(dataset) for dataset in payload["datasets"]], None
+
+
+def run_batch(payload, progress=None):
+    datasets, offsets = load_batch(payload)
+    result = engine("core.sifra_core", "SifraCore").run_many(payload.get("goal", "analyze"), datasets, offsets)
+    if progress is not None:
+        progress(1.0)
+    return result
+
+
+def run_similar(payload, progress=None):
+    """
+    Nearest stored datasets by fingerprint. The query is either a
+    {"fingerprint": [...]} or a dataset (fingerprinted, not stored).
+    """
+    from core.hds_unity.memory_signature import FINGERPRINT_FIELDS
+    from core.hds_unity.signature_store import signature_store
+
+    try:
+        k = max(1, min(int(payload.get("k", 5)), 1000))
+    except (TypeError, ValueError):
+        raise ValueError("'k' must be an integer")
+
+    if "fingerprint" in payload:
+        fingerprint = payload["fingerprint"]
+    else:
+        dataset = load_payload_dataset(payload, clean=True)
+        core = engine("core.sifra_core", "SifraCore")
+        fingerprint = core.run(
+            payload.get("goal", "analyze"), dataset, remember=False, stages=("memory_signature",)
+        )["analysis_result"]["fingerprint"]
+
+    started = time.perf_counter()
+    method, neighbors = signature_store.search(fingerprint, k, payload.get("method", "auto"))
+
+    return {
+        "fields": list(FINGERPRINT_FIELDS),
+        "fingerprint": fingerprint,
+        "method": method,
+        "neighbors": neighbors,
+        "search_ms": round((time.perf_counter() - started) * 1000, 3),
+        "store_size": signature_store.count,
+    }
+
+
+# -----------------------------------------------------------
+# ADVANCED MODULE ROUTES
+# -----------------------------------------------------------
+def visualize_options(params):
+    """
+    (budget, chart, columns) of a visualize request, or raises ValueError.
+    """
+    from tasks.auto_visualize import CHARTS
+
+    try:
+        budget = int(params["budget"]) if params.get("budget") else None
+    except (TypeError, ValueError):
+        raise ValueError("'budget' must be an integer")
+    chart = params.get("chart") or None
+    columns = params.get("columns") or None
+    if isinstance(columns, str):
+        columns = [c.strip() for c in columns.split(",") if c.strip()]
+
+    if budget is not None and budget < 10:
+        raise ValueError("'budget' must be at least 10 points")
+    if chart is not None and chart not in CHARTS:
+        raise ValueError(f"'chart' must be one of: {', '.join(CHARTS)}")
+    return budget, chart, columns
+
+
+def run_visualize(payload, progress=None):
+    """
+    Chart plan of a dataset, or streamed from a file with
+    {"dataset_id": ..., "stream": true} / {"file_path": ...} (DATA_DIR only).
+    """
+    budget, chart, columns = visualize_options(payload)
+    visualizer = engine("tasks.auto_visualize", "AutoVisualize")
+
+    if "file_path" in payload or str(payload.get("stream", False)).lower() in ("1", "true"):
+        return {
+            "status": "success",
+            "visual_plan": visualizer.visualize_file(
+                load_payload_file(payload), columns, chart, budget, progress=progress
+            ),
+        }
+
+    dataset = load_payload_dataset(payload)
+    return cached(payload, f"visualize:{budget}:{chart}", lambda: visualizer.run(dataset, budget, chart))
+
+
+def data_dir_path(file_path):
+    """
+    Real path of a request-supplied file, which must resolve inside
+    DATA_DIR — request bodies must not read arbitrary server files.
+    """
+    from config.settings import Settings
+
+    root = os.path.realpath(Settings.DATA_DIR)
+    path = os.path.realpath(os.path.join(root, str(file_path).strip().replace('"', '').replace("'", "")))
+    if os.path.commonpath([root, path]) != root:
+        raise ValueError("'file_path' must be inside the data directory")
+    return path
+
+
+def load_payload_file(payload):
+    """
+    Resolves {"dataset_id": ...} (or a {"file_path": ...} inside
+    DATA_DIR) to a file on disk for streaming engines.
+    """
+    if payload.get("dataset_id"):
+        from data.dataset_store import dataset_store
+        return dataset_store.path(payload["dataset_id"])
+    if "file_path" in payload:
+        return data_dir_path(payload["file_path"])
+    raise ValueError("Missing 'file_path' or 'dataset_id'")
+
+
+def run_bigdata(payload, progress=None):
+    return engine("tasks.auto_bigdata", "AutoBigData").run(load_payload_file(payload), progress=progress)
+
+
+def run_modeler(payload, progress=None):
+    modeler = engine("tasks.auto_modeler", "AutoModeler")
+    if "X" in payload and "y" in payload:
+        return modeler.run(payload["X"], payload["y"], progress=progress)
+    return modeler.run(load_payload_dataset(payload), progress=progress)
+
+
+def run_evaluate(payload, progress=None):
+    """
+    In memory: {"y_true": [...], "y_pred": [...], "segments": [...]}
+    Streamed from a file: {"dataset_id" | "file_path" (DATA_DIR only),
+    "true_column", "pred_column", "segment_column"}. Both accept "task_type".
+    """
+    evaluator = engine("tasks.auto_evaluate", "AutoEvaluate")
+    task_type = payload.get("task_type")
+    if task_type not in (None, "classification", "regression", "clustering"):
+        raise ValueError("'task_type' must be 'classification', 'regression' or 'clustering'")
+
+    if "true_column" in payload or "pred_column" in payload:
+        if not payload.get("true_column") or not payload.get("pred_column"):
+            raise ValueError("Provide true_column & pred_column")
+        return evaluator.evaluate_file(
+            load_payload_file(payload), payload["true_column"], payload["pred_column"],
+            segment_column=payload.get("segment_column"), task_type=task_type, progress=progress
+        )
+
+    if "y_true" not in payload or "y_pred" not in payload:
+        raise ValueError("Provide y_true & y_pred")
+    segments = payload.get("segments")
+    if segments is not None and len(segments) != len(payload["y_true"]):
+        raise ValueError("'segments' must have one key per sample")
+    return evaluator.run(payload["y_true"], payload["y_pred"], segments=segments, task_type=task_type)
+
+
+def run_eda(payload, progress=None):
+    dataset = load_payload_dataset(payload)
+    result = cached(payload, "eda", lambda: engine("tasks.auto_eda", "AutoEDA").run(dataset))
+    if progress is not None:
+        progress(1.0)
+    return result
+
+
+def run_feature_engineering(payload, progress=None):
+    result = engine("tasks.auto_feature_engineering", "AutoFeatureEngineering").run(
+        load_payload_dataset(payload),
+        refit=str(payload.get("refit", False)).lower() in ("1", "true"),
+        pipeline=payload.get("pipeline"),
+        types=payload.get("types")
+    )
+    if progress is not None:
+        progress(1.0)
+    return result
+
+
+TASKS = {
+    "analyze": run_analyze,
+    "predict": run_predict,
+    "predict_batch": run_predict_batch,
+    "forecast": run_forecast,
+    "forecast_series": run_forecast_series,
+    "anomaly": run_anomaly,
+    "insights": run_insights,
+    "trend": run_trend,
+    "batch": run_batch,
+    "similar": run_similar,
+    "visualize": run_visualize,
+    "eda": run_eda,
+    "feature_engineering": run_feature_engineering,
+    "modeler": run_modeler,
+    "evaluate": run_evaluate,
+    "bigdata": run_bigdata,
+}
+
+# Routes worth running as background jobs
+JOB_TASKS = ("bigdata", "modeler", "eda", "feature_engineering", "batch", "evaluate", "visualize")
+
+
+def run_task(name, payload, progress=None):
+    if name not in TASKS:
+        raise KeyError(f"Unknown task type: {name}")
+    return TASKS[name](payload, progress=progress)
+
+
+def run_encoded(name, payload, request_id=None, profile=None):
+    """
+    Runs a task and serializes the result inside the worker, so only
+    compact JSON bytes travel back to the serving process.
+    profile: label to profile the run under — cProfile + tracemalloc
+    run here, in the worker thread / process executing the engine.
+    Returns (http_status, body_bytes, profile) where profile is the
+    profile meta dict, "busy" (another run is being profiled) or None.
+    """
+    from utils import profiling
+    from utils.logger import set_request_id
+
+    set_request_id(request_id)
+
+    session = profiling.ProfileSession(profile) if profile else None
+    if session is None or not session.start():
+        return (*_encoded(name, payload), None if session is None else "busy")
+
+    try:
+        status, body = _encoded(name, payload)
+    except BaseException:
+        session.stop(request_id=request_id, status=500)
+        raise
+    return status, body, session.stop(request_id=request_id, status=status)
+
+
+def _encoded(name, payload):
+    from data.dataset_store import DatasetNotFound
+    from utils import serialization
+
+    try:
+        return 200, serialization.dumps(run_task(name, payload))
+    except DatasetNotFound as e:
+        return 404, serialization.dumps({"error": f"Dataset not found: {e.args[0]}"})
+    except ValueError as e:
+        return 400, serialization.dumps({"error": str(e)})
+    except Exception as e:
+        return 500, serialization.dumps({"error": f"{name} failed: {str(e)}"})
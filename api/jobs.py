@@ -0,0 +1,279 @@
+# api/jobs.py
+
+import json
+import os
+import re
+import threading
+import time
+import uuid
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from config.settings import Settings
+from utils import serialization
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+_ID_PATTERN = re.compile(r"^[0-9a-f]{16}$")
+
+TERMINAL = ("done", "failed", "cancelled")
+
+
+class JobCancelled(BaseException):
+    """
+    Raised inside a running job once cancellation is requested.
+    BaseException so engine-level `except Exception` blocks let it through.
+    """
+
+
+def _write_json(path, data):
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as fh:
+        json.dump(data, fh)
+    os.replace(tmp, path)
+
+
+def _read_json(path):
+    try:
+        with open(path, "r", encoding="utf-8") as fh:
+            return json.load(fh)
+    except (OSError, ValueError):
+        return None
+
+
+# -----------------------------------------------------------
+# WORKER SIDE (runs inside the backend: process or thread)
+# -----------------------------------------------------------
+class ProgressReporter:
+    """
+    Progress callback handed to engines.
+    Writes progress.json (throttled) and raises JobCancelled when the
+    cancel flag file appears.
+    """
+
+    def __init__(self, job_dir, interval=None):
+        self.job_dir = job_dir
+        self.interval = Settings.JOB_PROGRESS_INTERVAL if interval is None else interval
+        self._last = 0.0
+
+    def __call__(self, fraction, message=None):
+        if os.path.exists(os.path.join(self.job_dir, "cancel")):
+            raise JobCancelled()
+
+        now = time.monotonic()
+        if now - self._last < self.interval and fraction < 1.0:
+            return
+        self._last = now
+
+        _write_json(os.path.join(self.job_dir, "progress.json"), {
+            "progress": round(float(fraction), 4),
+            "message": message,
+            "updated": time.time(),
+        })
+
+
+def execute_job(job_type, payload, job_dir):
+    """
+    Job entry point (must stay a picklable top-level function).
+    The result is persisted to result.json by the worker itself.
+    """
+    from api.dispatch import run_task
+    from utils.logger import set_request_id
+
+    set_request_id(os.path.basename(job_dir))
+    report = ProgressReporter(job_dir)
+    report(0.0, "started")
+
+    result = run_task(job_type, payload, progress=report)
+
+    path = os.path.join(job_dir, "result.json")
+    with open(f"{path}.tmp", "wb") as fh:
+        fh.write(serialization.dumps(result))
+    os.replace(f"{path}.tmp", path)
+
+    report(1.0, "finished")
+    return "done"
+
+
+# -----------------------------------------------------------
+# BACKENDS (anything with submit(fn, *args) → Future)
+# -----------------------------------------------------------
+class LocalProcessBackend:
+    """
+    Local process pool — no external broker required.
+    """
+
+    def __init__(self, max_workers=None):
+        self.executor = ProcessPoolExecutor(max_workers=max_workers)
+
+    def submit(self, fn, *args):
+        return self.executor.submit(fn, *args)
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+class ThreadBackend(LocalProcessBackend):
+    """
+    In-process thread pool (for platforms without multiprocessing).
+    """
+
+    def __init__(self, max_workers=None):
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="sifra-job")
+
+
+BACKENDS = {
+    "process": LocalProcessBackend,
+    "thread": ThreadBackend,
+}
+
+
+# -----------------------------------------------------------
+# JOB MANAGER (API side)
+# -----------------------------------------------------------
+class JobManager:
+    """
+    Background job subsystem for long-running SIFRA AI routes.
+      - submit / status / result / cancel
+      - per job-type concurrency limits (excess jobs wait in a queue)
+      - status, progress and results persisted under DATA_DIR/jobs/<id>/
+    """
+
+    def __init__(self, backend=None, root=None, limits=None):
+        if backend is None:
+            backend = BACKENDS[Settings.JOB_BACKEND](Settings.JOB_MAX_WORKERS)
+        self.backend = backend
+
+        self.root = root or os.path.join(Settings.DATA_DIR, "jobs")
+        os.makedirs(self.root, exist_ok=True)
+
+        self.limits = dict(Settings.JOB_CONCURRENCY)
+        self.limits.update(limits or {})
+
+        self._running = {}
+        self._queued = {}
+        self._futures = {}
+        self._lock = threading.RLock()
+        logger.debug("Job manager ready")
+
+    # ------------------------------------------------------------
+    # Paths / status files
+    # ------------------------------------------------------------
+    def job_dir(self, job_id):
+        if not isinstance(job_id, str) or not _ID_PATTERN.match(job_id):
+            raise KeyError(f"Invalid job id: {job_id!r}")
+        return os.path.join(self.root, job_id)
+
+    def _set_status(self, job_id, **fields):
+        path = os.path.join(self.job_dir(job_id), "status.json")
+        fields["job_id"] = job_id
+        status = _read_json(path) or {}
+        status.update(fields)
+        _write_json(path, status)
+        return status
+
+    def _limit(self, job_type):
+        return self.limits.get(job_type, Settings.JOB_DEFAULT_CONCURRENCY)
+
+    # ------------------------------------------------------------
+    # Submit / schedule
+    # ------------------------------------------------------------
+    def submit(self, job_type, payload):
+        from api.dispatch import JOB_TASKS
+
+        if job_type not in JOB_TASKS:
+            raise ValueError(f"Unknown job type: {job_type}")
+
+        job_id = uuid.uuid4().hex[:16]
+        os.makedirs(self.job_dir(job_id))
+        status = self._set_status(job_id, type=job_type, status="queued", submitted=time.time())
+
+        with self._lock:
+            if self._running.get(job_type, 0) < self._limit(job_type):
+                self._start(job_id, job_type, payload)
+            else:
+                self._queued.setdefault(job_type, deque()).append((job_id, payload))
+
+        return status
+
+    def _start(self, job_id, job_type, payload):
+        self._running[job_type] = self._running.get(job_type, 0) + 1
+        future = self.backend.submit(execute_job, job_type, payload, self.job_dir(job_id))
+        self._futures[job_id] = future
+        future.add_done_callback(lambda f: self._finished(job_id, job_type, f))
+
+    def _finished(self, job_id, job_type, future):
+        if future.cancelled():
+            self._set_status(job_id, status="cancelled", finished=time.time())
+        else:
+            error = future.exception()
+            if error is None:
+                self._set_status(job_id, status="done", finished=time.time())
+            elif isinstance(error, JobCancelled):
+                self._set_status(job_id, status="cancelled", finished=time.time())
+            else:
+                self._set_status(job_id, status="failed", error=str(error), finished=time.time())
+
+        with self._lock:
+            self._futures.pop(job_id, None)
+            self._running[job_type] -= 1
+
+            queue = self._queued.get(job_type)
+            if queue:
+                next_id, payload = queue.popleft()
+                self._start(next_id, job_type, payload)
+
+    # ------------------------------------------------------------
+    # Status / result / cancel
+    # ------------------------------------------------------------
+    def status(self, job_id):
+        job_dir = self.job_dir(job_id)
+        status = _read_json(os.path.join(job_dir, "status.json"))
+        if status is None:
+            raise KeyError(f"Unknown job id: {job_id}")
+
+        progress = _read_json(os.path.join(job_dir, "progress.json"))
+        if progress is not None:
+            status.update(progress)
+            if status["status"] == "queued":
+                status["status"] = "running"
+        else:
+            status.setdefault("progress", 0.0)
+
+        if status["status"] == "done":
+            status["progress"] = 1.0
+
+        return status
+
+    def result(self, job_id):
+        """
+        Persisted JSON result bytes, or None while the job is not done.
+        """
+        if self.status(job_id)["status"] != "done":
+            return None
+        with open(os.path.join(self.job_dir(job_id), "result.json"), "rb") as fh:
+            return fh.read()
+
+    def cancel(self, job_id):
+        status = self.status(job_id)
+        if status["status"] in TERMINAL:
+            return status
+
+        with self._lock:
+            queue = self._queued.get(status["type"], deque())
+            for item in list(queue):
+                if item[0] == job_id:
+                    queue.remove(item)
+                    return self._set_status(job_id, status="cancelled", finished=time.time())
+
+            # Running (or waiting inside the pool): flag + best-effort future cancel
+            open(os.path.join(self.job_dir(job_id), "cancel"), "w").close()
+            future = self._futures.get(job_id)
+            if future is not None:
+                future.cancel()
+
+        return self.status(job_id)
+
+    def shutdown(self):
+        self.backend.shutdown()
@@ -0,0 +1,94 @@
+# api/responses.py
+
+import json
+
+import numpy as np
+from flask import Response, request
+
+from utils import serialization
+from utils.metrics import request_timings
+
+MIME_JSON = "application/json"
+MIME_NPY = "application/x-npy"
+MIME_ARROW = "application/vnd.apache.arrow.stream"
+MIME_B64 = "application/vnd.sifra.b64+json"
+
+OFFERED = [MIME_JSON, MIME_B64, MIME_NPY, MIME_ARROW]
+
+
+# -----------------------------------------------------------
+# Helpers
+# -----------------------------------------------------------
+def _lookup(result, path):
+    """
+    Resolves a dotted key path ("visual_plan.y") inside the result.
+    """
+    node = result
+    for key in path.split("."):
+        if not isinstance(node, dict) or key not in node:
+            return None
+        node = node[key]
+    return node
+
+
+def _replace(result, path, value):
+    keys = path.split(".")
+    copy = dict(result)
+    node = copy
+    for key in keys[:-1]:
+        node[key] = dict(node[key])
+        node = node[key]
+    node[keys[-1]] = value
+    return copy
+
+
+def _json_response(result, status):
+    if serialization.orjson is not None:
+        return Response(serialization.dumps(result), status=status, mimetype=MIME_JSON)
+    return Response(serialization.iter_json(result), status=status, mimetype=MIME_JSON)
+
+
+# -----------------------------------------------------------
+# Response layer shared by every route
+# -----------------------------------------------------------
+def respond(result, array_key=None, status=200):
+    """
+    Serializes an engine result.
+    JSON by default; when array_key names a NumPy array in the result,
+    the Accept header may request it as .npy, Arrow IPC or base64 float32.
+    Requested per-stage timings are added as a "timings" block.
+    """
+    if isinstance(result, tuple):
+        result, status = result
+
+    timings = request_timings.get()
+    if timings is not None and isinstance(result, dict):
+        result = dict(result, timings=timings)
+
+    mime = request.accept_mimetypes.best_match(OFFERED, default=MIME_JSON)
+    array = _lookup(result, array_key) if array_key else None
+
+    if mime == MIME_JSON or array is None:
+        return _json_response(result, status)
+
+    array = np.asarray(array)
+    if array.dtype.kind not in "biuf":
+        return _json_response(result, status)
+
+    headers = {"X-Sifra-Shape": json.dumps(list(array.shape))}
+
+    if mime == MIME_B64:
+        encoded = _replace(result, array_key, serialization.to_base64(array))
+        return Response(serialization.dumps(encoded), status=status, mimetype=MIME_B64)
+
+    if mime == MIME_NPY:
+        return Response(serialization.to_npy(array), status=status, mimetype=MIME_NPY, headers=headers)
+
+    try:
+        meta = {k: v for k, v in result.items() if k != array_key.split(".")[0]}
+        names = result.get("feature_names")
+        body = serialization.to_arrow(array, column_names=names, metadata=meta)
+    except ImportError:
+        return {"error": "Arrow output requires pyarrow"}, 406
+
+    return Response(body, status=status, mimetype=MIME_ARROW, headers=headers)
@@ -0,0 +1,310 @@
+# api/snapshot.py
+"""
+Warm-start snapshot for serverless cold starts.
+
+Build step (run once at deploy time, e.g. in the Vercel build command):
+    python -m api.snapshot build
+    python -m api.snapshot build --pipelines saved_pipelines/
+    python -m api.snapshot info
+
+The snapshot holds pre-built engines (pickled one by one) plus reusable
+module state: compiled feature pipelines (column plans, category
+vocabularies, scaler) and the date-format cache. At startup only the
+file is read; each engine is unpickled the first time a route asks for
+it, so routes still import only what they use.
+
+A snapshot is only used with the Python / numpy versions and the exact
+source code (content hash of SOURCE_PACKAGES) it was built with; after a
+code change it is ignored until rebuilt.
+"""
+
+import argparse
+import ast
+import hashlib
+import inspect
+import os
+import pickle
+import sys
+import textwrap
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from config.settings import Settings
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+FORMAT_VERSION = 1
+
+# Modules exposing snapshot_state() / restore_state(state)
+STATE_MODULES = (
+    "data.type_inference",
+    "tasks.auto_feature_engineering",
+)
+
+# Packages whose source the snapshotted engines are built from
+SOURCE_PACKAGES = ("api", "config", "core", "data", "tasks", "utils")
+
+_loaded = None   # {"engines": {key: bytes}, "state": {module: bytes}}
+
+
+def source_hash():
+    """
+    Content hash of every .py file of SOURCE_PACKAGES, so a snapshot
+    pickled by other code is rebuilt instead of restored.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for package in SOURCE_PACKAGES:
+        for folder, dirs, files in os.walk(os.path.join(ROOT, package)):
+            dirs[:] = sorted(d for d in dirs if d != "__pycache__")
+            for filename in sorted(f for f in files if f.endswith(".py")):
+                path = os.path.join(folder, filename)
+                digest.update(os.path.relpath(path, ROOT).encode())
+                with open(path, "rb") as fh:
+                    digest.update(fh.read())
+    return digest.hexdigest()
+
+
+def _fingerprint():
+    import numpy as np
+    return {
+        "format": FORMAT_VERSION,
+        "python": list(sys.version_info[:2]),
+        "numpy": np.__version__,
+        "source": source_hash(),
+    }
+
+
+# ------------------------------------------------------------
+# BUILD
+# ------------------------------------------------------------
+def build(path=None, engines=None, pipeline_dir=None, warm=True):
+    """
+    Builds engines, optionally warms their caches on a small synthetic
+    dataset and loads saved pipelines, then writes the snapshot.
+    """
+    from api import dispatch
+
+    path = path or Settings.SNAPSHOT_PATH
+    names = engines or Settings.SNAPSHOT_ENGINES
+    started = time.perf_counter()
+
+    for module_name, class_name in names:
+        dispatch.engine(module_name, class_name)
+
+    if pipeline_dir:
+        from data.feature_pipeline import FeaturePipeline
+        from tasks.auto_feature_engineering import _cache_pipeline
+        for filename in sorted(os.listdir(pipeline_dir)):
+            if filename.endswith(".json"):
+                _cache_pipeline(FeaturePipeline.load(os.path.join(pipeline_dir, filename)))
+
+    if warm:
+        _warm(names)
+
+    snapshot = dict(_fingerprint(), created=time.time(), engines={}, state={})
+
+    for (module_name, class_name), instance in dispatch._ENGINES.items():
+        if (module_name, class_name) in names:
+            snapshot["engines"][f"{module_name}.{class_name}"] = pickle.dumps(instance, pickle.HIGHEST_PROTOCOL)
+
+    for module_name in STATE_MODULES:
+        module = sys.modules.get(module_name)
+        if module is not None:
+            snapshot["state"][module_name] = pickle.dumps(module.snapshot_state(), pickle.HIGHEST_PROTOCOL)
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(f"{path}.tmp", "wb") as fh:
+        pickle.dump(snapshot, fh, pickle.HIGHEST_PROTOCOL)
+    os.replace(f"{path}.tmp", path)
+
+    logger.info("Snapshot written to %s in %.1f ms", path, (time.perf_counter() - started) * 1000)
+    return describe(snapshot)
+
+
+def _warm(names):
+    """
+    One pass of every snapshotted engine over a tiny mixed dataset, so
+    lazily filled caches (date formats, ...) are populated.
+    """
+    import pandas as pd
+    from api import dispatch
+
+    frame = pd.DataFrame({
+        "amount": [10.5, 12.0, None, 14.25],
+        "date": ["2024-01-01", "2024-01-02", "2024-01-03", "2024-01-04"],
+        "city": ["Pune", "Delhi", "Pune", None],
+    })
+
+    for module_name, class_name in names:
+        instance = dispatch.engine(module_name, class_name)
+        try:
+            if class_name == "Preprocessor":
+                instance.clean(frame.copy())
+            elif class_name == "EngineRouter":
+                instance.route("trend", frame.copy())
+            elif class_name == "AutoForecast":
+                instance.run(frame.copy(), 5)
+            elif class_name not in ("AutoModeler", "AutoEvaluate", "AutoBigData") and hasattr(instance, "run"):
+                instance.run(frame.copy())
+        except Exception as e:
+            logger.warning("Warm-up of %s.%s failed: %s", module_name, class_name, e)
+
+
+def describe(snapshot):
+    return {
+        "format": snapshot.get("format"),
+        "python": snapshot.get("python"),
+        "numpy": snapshot.get("numpy"),
+        "source": snapshot.get("source"),
+        "created": snapshot.get("created"),
+        "engines": sorted(snapshot.get("engines", {})),
+        "state": sorted(snapshot.get("state", {})),
+    }
+
+
+# ------------------------------------------------------------
+# LOAD (startup)
+# ------------------------------------------------------------
+def load(path=None):
+    """
+    Reads the snapshot file (engines stay pickled until requested).
+    A missing or incompatible snapshot is ignored.
+    """
+    global _loaded
+
+    path = path or Settings.SNAPSHOT_PATH
+    if not Settings.SNAPSHOT_ENABLED or not os.path.exists(path):
+        return False
+
+    started = time.perf_counter()
+    try:
+        with open(path, "rb") as fh:
+            snapshot = pickle.load(fh)
+    except Exception as e:
+        logger.warning("Ignoring unreadable snapshot %s: %s", path, e)
+        return False
+
+    fingerprint = _fingerprint()
+    if any(snapshot.get(key) != value for key, value in fingerprint.items()):
+        logger.warning("Ignoring snapshot %s built for %s", path,
+                       {key: snapshot.get(key) for key in fingerprint})
+        return False
+
+    _loaded = {"engines": dict(snapshot["engines"]), "state": dict(snapshot["state"])}
+    logger.info("Snapshot loaded from %s in %.1f ms (%d engines)",
+                path, (time.perf_counter() - started) * 1000, len(_loaded["engines"]))
+    return True
+
+
+def loaded():
+    return _loaded is not None
+
+
+def restore_engine(module_name, class_name):
+    """
+    Pre-built engine from the snapshot (None when not snapshotted).
+    """
+    if _loaded is None:
+        return None
+
+    data = _loaded["engines"].pop(f"{module_name}.{class_name}", None)
+    if data is None:
+        return None
+
+    try:
+        instance = pickle.loads(data)
+    except Exception as e:
+        logger.warning("Could not restore %s.%s from snapshot: %s", module_name, class_name, e)
+        return None
+
+    missing = _missing_attributes(instance)
+    if missing:
+        logger.warning("Not restoring %s.%s from snapshot, missing attributes: %s",
+                       module_name, class_name, ", ".join(missing))
+        return None
+
+    restore_pending_state()
+    return instance
+
+
+def _assigned_attributes(cls):
+    """
+    Names the class's __init__ assigns on self (empty when unknown).
+    """
+    try:
+        tree = ast.parse(textwrap.dedent(inspect.getsource(cls.__init__)))
+    except (OSError, TypeError, SyntaxError):
+        return set()
+    return {
+        node.attr for node in ast.walk(tree)
+        if isinstance(node, ast.Attribute) and isinstance(node.ctx, ast.Store)
+        and isinstance(node.value, ast.Name) and node.value.id == "self"
+    }
+
+
+def _missing_attributes(instance, seen=None):
+    """
+    Attributes the current code sets in __init__ that a restored engine
+    (or an engine it holds, e.g. EngineRouter.core) lacks.
+    """
+    seen = set() if seen is None else seen
+    if id(instance) in seen or not hasattr(instance, "__dict__"):
+        return []
+    seen.add(id(instance))
+
+    cls = type(instance)
+    name = cls.__name__
+    missing = [f"{name}.{attr}" for attr in sorted(_assigned_attributes(cls) - set(vars(instance)))]
+    for value in vars(instance).values():
+        if type(value).__module__.split(".")[0] in SOURCE_PACKAGES:
+            missing.extend(_missing_attributes(value, seen))
+    return missing
+
+
+def restore_pending_state():
+    """
+    Restores module state once its module has been imported.
+    """
+    if _loaded is None:
+        return
+
+    for module_name in list(_loaded["state"]):
+        module = sys.modules.get(module_name)
+        if module is not None:
+            module.restore_state(pickle.loads(_loaded["state"].pop(module_name)))
+
+
+# ------------------------------------------------------------
+# CLI
+# ------------------------------------------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="SIFRA AI startup snapshot")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    build_cmd = sub.add_parser("build", help="build the snapshot file")
+    build_cmd.add_argument("--output", default=None)
+    build_cmd.add_argument("--pipelines", default=None, help="directory of saved FeaturePipeline .json files")
+    build_cmd.add_argument("--no-warm", action="store_true")
+
+    info_cmd = sub.add_parser("info", help="describe an existing snapshot")
+    info_cmd.add_argument("--path", default=None)
+
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        info = build(args.output, pipeline_dir=args.pipelines, warm=not args.no_warm)
+    else:
+        with open(args.path or Settings.SNAPSHOT_PATH, "rb") as fh:
+            info = describe(pickle.load(fh))
+
+    for key, value in info.items():
+        print(f"{key:10s} {value}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,83 @@
+# benchmarks/cases.py
+
+import numpy as np
+
+
+# ------------------------------------------------------------
+# Engine cases: name → (factory, call(engine, frame))
+# ------------------------------------------------------------
+def _numeric(frame):
+    return frame.select_dtypes("number")
+
+
+def _xy(frame):
+    numeric = _numeric(frame).fillna(0).to_numpy()
+    return numeric[:, :-1], numeric[:, -1]
+
+
+def _sifra_core():
+    from core.sifra_core import SifraCore
+    return SifraCore()
+
+
+def _engine(module_name, class_name):
+    def factory():
+        import importlib
+        return getattr(importlib.import_module(module_name), class_name)()
+    return factory
+
+
+def _evaluate(engine, frame):
+    values = _numeric(frame).iloc[:, 0].fillna(0).to_numpy()
+    labels = (values > np.median(values)).astype(int)
+    return engine.run(labels, np.roll(labels, 1))
+
+
+ENGINES = {
+    "sifra_core": (_sifra_core, lambda e, f: e.run("analyze", f)),
+    "preprocessor": (_engine("data.preprocessor", "Preprocessor"), lambda e, f: e.clean(f)),
+    "analyze": (_engine("tasks.auto_analyze", "AutoAnalyze"), lambda e, f: e.run(f)),
+    "predict": (_engine("tasks.auto_predict", "AutoPredict"), lambda e, f: e.run(f)),
+    "forecast": (_engine("tasks.auto_forecast", "AutoForecast"), lambda e, f: e.run(f, 5)),
+    "anomaly": (_engine("tasks.auto_anomaly", "AutoAnomaly"), lambda e, f: e.run(f)),
+    "insights": (_engine("tasks.auto_insights", "AutoInsights"), lambda e, f: e.run(f)),
+    "visualize": (_engine("tasks.auto_visualize", "AutoVisualize"), lambda e, f: e.run(f)),
+    "eda": (_engine("tasks.auto_eda", "AutoEDA"), lambda e, f: e.run(f)),
+    "feature_engineering": (_engine("tasks.auto_feature_engineering", "AutoFeatureEngineering"),
+                            lambda e, f: e.run(f, refit=True)),
+    "modeler": (_engine("tasks.auto_modeler", "AutoModeler"), lambda e, f: e.run(*_xy(f))),
+    "evaluate": (_engine("tasks.auto_evaluate", "AutoEvaluate"), _evaluate),
+}
+
+
+# ------------------------------------------------------------
+# API route cases: route → request body built from a frame
+# ------------------------------------------------------------
+ROUTES = (
+    "analyze", "predict", "forecast", "anomaly", "insights", "trend",
+    "visualize", "eda", "feature_engineering", "modeler", "evaluate",
+)
+
+
+def _columnar(frame):
+    columns = {}
+    for name, col in frame.items():
+        columns[str(name)] = col.astype(object).where(col.notna(), None).tolist()
+    return {"dataset": columns}
+
+
+def route_body(route, frame):
+    if route == "modeler":
+        X, y = _xy(frame)
+        return {"X": X.tolist(), "y": y.tolist()}
+
+    if route == "evaluate":
+        values = _numeric(frame).iloc[:, 0].fillna(0).to_numpy()
+        labels = (values > np.median(values)).astype(int)
+        return {"y_true": labels.tolist(), "y_pred": np.roll(labels, 1).tolist()}
+
+    return _columnar(frame)
+
+
+def bigdata_engine():
+    return _engine("tasks.auto_bigdata", "AutoBigData")()
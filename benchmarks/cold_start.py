@@ -0,0 +1,87 @@
+# benchmarks/cold_start.py
+"""
+Cold start with and without the startup snapshot (api/snapshot.py).
+
+    python -m api.snapshot build
+    python -m benchmarks.cold_start --runs 5
+    python -m benchmarks.cold_start --routes analyze eda --runs 10
+
+Every run is a fresh interpreter: import api.app, then one request.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from benchmarks import cases, generators
+from benchmarks.imports import RESULTS_DIR, bench_route
+from config.settings import Settings
+
+MODES = {
+    "cold": {"SIFRA_SNAPSHOT": "0"},
+    "snapshot": {"SIFRA_SNAPSHOT": "1"},
+}
+
+
+def summarize(runs):
+    totals = [run["import_ms"] + run["first_request_ms"] for run in runs]
+    return {
+        "runs": len(runs),
+        "import_ms": round(statistics.median(run["import_ms"] for run in runs), 3),
+        "first_request_ms": round(statistics.median(run["first_request_ms"] for run in runs), 3),
+        "total_ms": round(statistics.median(totals), 3),
+        "total_min_ms": round(min(totals), 3),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="SIFRA AI snapshot cold-start benchmark")
+    parser.add_argument("--routes", nargs="*", choices=cases.ROUTES, default=list(cases.ROUTES))
+    parser.add_argument("--runs", type=int, default=5, help="fresh interpreters per route and mode")
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(Settings.SNAPSHOT_PATH):
+        print(f"No snapshot at {Settings.SNAPSHOT_PATH}; run `python -m api.snapshot build` first")
+        return 1
+
+    frame = generators.make("mixed", "small").head(500)
+    report = {"created": time.time(), "runs": args.runs, "routes": {}}
+
+    print(f"{'route':24s} {'cold total':>12s} {'snapshot total':>16s} {'speedup':>9s}")
+    for route in args.routes:
+        body = cases.route_body(route, frame)
+        report["routes"][route] = {}
+
+        for mode, env in MODES.items():
+            runs = [bench_route(route, body, **env) for _ in range(args.runs)]
+            errors = [run["error"] for run in runs if "error" in run]
+            if errors:
+                report["routes"][route][mode] = {"error": errors[0]}
+            else:
+                report["routes"][route][mode] = summarize(runs)
+
+        cold, warm = report["routes"][route]["cold"], report["routes"][route]["snapshot"]
+        if "error" in cold or "error" in warm:
+            print(f"/{route:23s} ERROR {(cold.get('error') or warm.get('error'))[:80]}")
+            continue
+        print(f"/{route:23s} {cold['total_ms']:>9.1f} ms {warm['total_ms']:>13.1f} ms "
+              f"{cold['total_ms'] / warm['total_ms']:>8.2f}x")
+
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    output = args.output or os.path.join(RESULTS_DIR, "cold-start-" + time.strftime("%Y%m%d-%H%M%S") + ".json")
+    with open(output, "w", encoding="utf-8") as fh:
+        json.dump(report, fh, indent=2)
+    print(f"\nResults written to {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
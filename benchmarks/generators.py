@@ -0,0 +1,108 @@
+# benchmarks/generators.py
+
+import os
+
+import numpy as np
+import pandas as pd
+
+# Rows per dataset shape at each scale
+SCALES = {
+    "small": 10000,
+    "medium": 100000,
+    "large": 1000000,
+}
+
+
+# ------------------------------------------------------------
+# In-memory datasets (deterministic per seed)
+# ------------------------------------------------------------
+def tall(rows, cols=6, seed=0):
+    """
+    Many rows, few numeric columns (random walks + noise).
+    """
+    rng = np.random.default_rng(seed)
+    data = np.cumsum(rng.normal(size=(rows, cols)), axis=0)
+    return pd.DataFrame(data, columns=[f"x{i}" for i in range(cols)])
+
+
+def wide(rows, cols=400, seed=0):
+    """
+    Few rows, many numeric columns.
+    """
+    rng = np.random.default_rng(seed)
+    rows = max(rows // 50, 100)
+    return pd.DataFrame(rng.normal(size=(rows, cols)), columns=[f"x{i}" for i in range(cols)])
+
+
+def mixed(rows, seed=0):
+    """
+    Numeric, date strings, text and missing values in one frame.
+    """
+    rng = np.random.default_rng(seed)
+    dates = pd.Timestamp("2020-01-01") + pd.to_timedelta(rng.integers(0, 3650, rows), unit="D")
+
+    frame = pd.DataFrame({
+        "amount": rng.gamma(2.0, 50.0, rows).round(2),
+        "count": rng.integers(0, 100, rows),
+        "ratio": rng.random(rows),
+        "date": dates.strftime("%Y-%m-%d"),
+        "city": rng.choice(["Pune", "Delhi", "Mumbai", "Chennai", "Kolkata"], rows),
+        "status": rng.choice(["new", "active", "closed"], rows),
+    })
+    frame.loc[rng.random(rows) < 0.05, "amount"] = np.nan
+    frame.loc[rng.random(rows) < 0.02, "city"] = None
+    return frame
+
+
+def categorical(rows, cols=8, cardinality=50, seed=0):
+    """
+    Mostly categorical columns plus one numeric target.
+    """
+    rng = np.random.default_rng(seed)
+    frame = pd.DataFrame({
+        f"cat{i}": rng.integers(0, cardinality, rows).astype(str) for i in range(cols)
+    })
+    frame = "v" + frame
+    frame["value"] = rng.normal(size=rows)
+    return frame
+
+
+SHAPES = {
+    "tall": tall,
+    "wide": wide,
+    "mixed": mixed,
+    "categorical": categorical,
+}
+
+
+def make(shape, scale="small", seed=0):
+    return SHAPES[shape](SCALES[scale], seed=seed)
+
+
+# ------------------------------------------------------------
+# Large CSV files for AutoBigData (written chunk by chunk)
+# ------------------------------------------------------------
+def write_csv(path, target_bytes, cols=8, chunk_rows=100000, seed=0):
+    """
+    Writes a numeric CSV of roughly target_bytes without holding it in
+    memory. Existing files of at least that size are reused.
+    Returns (path, rows).
+    """
+    if os.path.exists(path) and os.path.getsize(path) >= target_bytes:
+        with open(path, "rb") as fh:
+            rows = sum(1 for _ in fh) - 1
+        return path, rows
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    rng = np.random.default_rng(seed)
+    columns = [f"x{i}" for i in range(cols)]
+    rows = 0
+
+    with open(path, "w", encoding="utf-8", newline="") as fh:
+        fh.write(",".join(columns) + "\n")
+        while fh.tell() < target_bytes:
+            chunk = pd.DataFrame(rng.normal(size=(chunk_rows, cols)).round(6), columns=columns)
+            chunk.to_csv(fh, header=False, index=False)
+            rows += chunk_rows
+
+    return path, rows
@@ -0,0 +1,71 @@
+# benchmarks/harness.py
+
+import gc
+import statistics
+import time
+import tracemalloc
+
+
+def measure(fn, rows=0, repeat=5, warmup=1):
+    """
+    Runs fn() warmup + repeat times and reports latency percentiles,
+    throughput (rows/s) and peak traced memory.
+    Peak memory comes from one extra run under tracemalloc, so the
+    timed runs are not slowed down by allocation tracing.
+    """
+    for _ in range(warmup):
+        fn()
+
+    samples = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    samples.sort()
+    median = statistics.median(samples)
+
+    return {
+        "repeat": repeat,
+        "rows": rows,
+        "latency_ms": {
+            "min": round(samples[0] * 1000, 3),
+            "median": round(median * 1000, 3),
+            "p95": round(samples[min(len(samples) - 1, int(0.95 * len(samples)))] * 1000, 3),
+            "mean": round(statistics.fmean(samples) * 1000, 3),
+        },
+        "throughput_rows_s": round(rows / median, 1) if rows and median else None,
+        "peak_mem_mb": round(peak / (1024 * 1024), 3),
+    }
+
+
+def compare(results, baseline, threshold=0.2):
+    """
+    Median-latency comparison against a saved baseline.
+    Returns a list of regressions slower than (1 + threshold) × baseline.
+    """
+    regressions = []
+    for key, current in results.items():
+        before = baseline.get(key)
+        if not before or "latency_ms" not in before or "latency_ms" not in current:
+            continue
+
+        old, new = before["latency_ms"]["median"], current["latency_ms"]["median"]
+        if old and new > old * (1 + threshold):
+            regressions.append({
+                "benchmark": key,
+                "baseline_ms": old,
+                "current_ms": new,
+                "ratio": round(new / old, 3),
+            })
+
+    return regressions
@@ -0,0 +1,137 @@
+# benchmarks/imports.py
+"""
+Import-time / cold-start benchmark.
+
+    python -m benchmarks.imports                 # modules + every route, fresh interpreter each
+    python -m benchmarks.imports --top 20
+
+Each measurement runs in a new interpreter (python -X importtime), so
+nothing is shared with earlier imports.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from benchmarks import cases, generators
+
+RESULTS_DIR = os.path.join(ROOT, "benchmarks", "results")
+
+MODULES = (
+    "api.app",
+    "core.sifra_core",
+    "data.preprocessor",
+    "tasks.auto_modeler",
+    "tasks.auto_evaluate",
+    "tasks.auto_feature_engineering",
+    "tasks.auto_bigdata",
+)
+
+# Runs inside a fresh interpreter: import the app, hit one route
+_ROUTE_SCRIPT = """
+import json, sys, time
+started = time.perf_counter()
+from api.app import app
+imported = time.perf_counter()
+body = json.loads(sys.stdin.read())
+response = app.test_client().post("/{route}", json=body)
+done = time.perf_counter()
+print(json.dumps({{
+    "status": response.status_code,
+    "import_ms": round((imported - started) * 1000, 3),
+    "first_request_ms": round((done - imported) * 1000, 3),
+    "modules": sorted(m for m in ("pandas", "sklearn", "scipy", "pyarrow") if m in sys.modules),
+}}))
+"""
+
+
+def _env(**overrides):
+    env = dict(os.environ, PYTHONPATH=ROOT, SIFRA_LOG_LEVEL="WARNING", **overrides)
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    return env
+
+
+def parse_importtime(stderr):
+    """
+    -X importtime lines → {package: (self_us, cumulative_us)}.
+    """
+    costs = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        costs[name.strip()] = (int(self_us), int(cumulative_us))
+    return costs
+
+
+def bench_module(module, top):
+    started = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, env=_env(), cwd=ROOT
+    )
+    wall = time.perf_counter() - started
+    costs = parse_importtime(proc.stderr)
+
+    heaviest = sorted(costs.items(), key=lambda item: item[1][0], reverse=True)[:top]
+    return {
+        "cumulative_ms": round(costs.get(module, (0, 0))[1] / 1000, 3),
+        "process_wall_ms": round(wall * 1000, 3),
+        "top_self_ms": {name: round(self_us / 1000, 3) for name, (self_us, _) in heaviest},
+    }
+
+
+def bench_route(route, body, **env):
+    proc = subprocess.run(
+        [sys.executable, "-c", _ROUTE_SCRIPT.format(route=route)],
+        input=json.dumps(body), capture_output=True, text=True, env=_env(**env), cwd=ROOT
+    )
+    try:
+        return json.loads(proc.stdout.strip().splitlines()[-1])
+    except (IndexError, ValueError):
+        return {"error": proc.stderr.strip()[-300:]}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="SIFRA AI import-time benchmark")
+    parser.add_argument("--top", type=int, default=10, help="heaviest imports listed per module")
+    parser.add_argument("--routes", nargs="*", choices=cases.ROUTES, default=list(cases.ROUTES))
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args(argv)
+
+    report = {"created": time.time(), "modules": {}, "routes": {}}
+
+    print("Module import cost (fresh interpreter)")
+    for module in MODULES:
+        result = bench_module(module, args.top)
+        report["modules"][module] = result
+        print(f"  {module:36s} {result['cumulative_ms']:>9.1f} ms")
+
+    frame = generators.make("mixed", "small").head(500)
+    print("\nCold start per route (import api.app + first request)")
+    for route in args.routes:
+        result = bench_route(route, cases.route_body(route, frame))
+        report["routes"][route] = result
+        if "error" in result:
+            print(f"  /{route:34s} ERROR {result['error'][:80]}")
+        else:
+            print(f"  /{route:34s} import {result['import_ms']:>8.1f} ms   first request "
+                  f"{result['first_request_ms']:>8.1f} ms   loads {', '.join(result['modules']) or '-'}")
+
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    output = args.output or os.path.join(RESULTS_DIR, "imports-" + time.strftime("%Y%m%d-%H%M%S") + ".json")
+    with open(output, "w", encoding="utf-8") as fh:
+        json.dump(report, fh, indent=2)
+    print(f"\nResults written to {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
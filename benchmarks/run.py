@@ -0,0 +1,158 @@
+# benchmarks/run.py
+"""
+SIFRA AI benchmark suite.
+
+    python -m benchmarks.run                               # engines, small scale
+    python -m benchmarks.run --scale medium --routes       # + API routes
+    python -m benchmarks.run --bigdata-mb 2048             # + AutoBigData on a 2 GB CSV
+    python -m benchmarks.run --save-baseline               # store as baseline
+    python -m benchmarks.run --baseline benchmarks/results/baseline.json --threshold 0.2
+
+Exits with status 1 when any benchmark regresses past the threshold.
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from benchmarks import cases, generators
+from benchmarks.harness import compare, measure
+
+RESULTS_DIR = os.path.join(ROOT, "benchmarks", "results")
+BASELINE = os.path.join(RESULTS_DIR, "baseline.json")
+
+
+# ------------------------------------------------------------
+# Suites
+# ------------------------------------------------------------
+def bench_engines(frames, names, repeat):
+    results = {}
+    for name in names:
+        factory, call = cases.ENGINES[name]
+        engine = factory()
+        for shape, frame in frames.items():
+            key = f"engine:{name}:{shape}"
+            try:
+                results[key] = measure(lambda: call(engine, frame), rows=len(frame), repeat=repeat)
+            except Exception as e:
+                results[key] = {"error": str(e)}
+            print(f"{key:48s} {_summary(results[key])}")
+    return results
+
+
+def bench_routes(frames, names, repeat):
+    from api.app import app
+
+    client = app.test_client()
+    results = {}
+    for name in names:
+        for shape, frame in frames.items():
+            key = f"route:{name}:{shape}"
+            body = cases.route_body(name, frame)
+
+            def call():
+                response = client.post(f"/{name}", json=body)
+                if response.status_code != 200:
+                    raise RuntimeError(f"HTTP {response.status_code}: {response.get_data(as_text=True)[:200]}")
+
+            try:
+                results[key] = measure(call, rows=len(frame), repeat=repeat)
+            except Exception as e:
+                results[key] = {"error": str(e)}
+            print(f"{key:48s} {_summary(results[key])}")
+    return results
+
+
+def bench_bigdata(size_mb, repeat):
+    path, rows = generators.write_csv(
+        os.path.join(RESULTS_DIR, "data", f"bigdata_{size_mb}mb.csv"), size_mb * 1024 * 1024
+    )
+    engine = cases.bigdata_engine()
+    key = f"engine:bigdata:{size_mb}mb"
+    result = measure(lambda: engine.run(path), rows=rows, repeat=repeat, warmup=0)
+    result["file_mb"] = round(os.path.getsize(path) / (1024 * 1024), 1)
+    print(f"{key:48s} {_summary(result)}")
+    return {key: result}
+
+
+def _summary(result):
+    if "error" in result:
+        return f"ERROR {result['error'][:60]}"
+    return f"median {result['latency_ms']['median']:>10.2f} ms   peak {result['peak_mem_mb']:>8.2f} MB"
+
+
+# ------------------------------------------------------------
+# CLI
+# ------------------------------------------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="SIFRA AI benchmark suite")
+    parser.add_argument("--scale", choices=sorted(generators.SCALES), default="small")
+    parser.add_argument("--shapes", nargs="+", choices=sorted(generators.SHAPES), default=sorted(generators.SHAPES))
+    parser.add_argument("--engines", nargs="*", choices=sorted(cases.ENGINES), default=None,
+                        help="engines to run (default: all; pass no names to skip)")
+    parser.add_argument("--routes", nargs="*", choices=cases.ROUTES, default=None,
+                        help="also benchmark API routes (default names: all)")
+    parser.add_argument("--bigdata-mb", type=int, default=0, help="AutoBigData CSV size (0 = skip)")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", default=None)
+    parser.add_argument("--baseline", default=None)
+    parser.add_argument("--threshold", type=float, default=0.2)
+    parser.add_argument("--save-baseline", action="store_true")
+    args = parser.parse_args(argv)
+
+    frames = {shape: generators.make(shape, args.scale) for shape in args.shapes}
+
+    results = {}
+    engines = sorted(cases.ENGINES) if args.engines is None else args.engines
+    results.update(bench_engines(frames, engines, args.repeat))
+
+    if args.routes is not None:
+        results.update(bench_routes(frames, args.routes or list(cases.ROUTES), args.repeat))
+
+    if args.bigdata_mb:
+        results.update(bench_bigdata(args.bigdata_mb, max(1, args.repeat // 5)))
+
+    report = {
+        "created": time.time(),
+        "scale": args.scale,
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "results": results,
+    }
+
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    output = args.output or os.path.join(RESULTS_DIR, time.strftime("%Y%m%d-%H%M%S") + ".json")
+    with open(output, "w", encoding="utf-8") as fh:
+        json.dump(report, fh, indent=2)
+    print(f"\nResults written to {output}")
+
+    if args.save_baseline:
+        with open(BASELINE, "w", encoding="utf-8") as fh:
+            json.dump(report, fh, indent=2)
+        print(f"Baseline saved to {BASELINE}")
+        return 0
+
+    baseline_path = args.baseline or (BASELINE if os.path.exists(BASELINE) else None)
+    if baseline_path:
+        with open(baseline_path, "r", encoding="utf-8") as fh:
+            baseline = json.load(fh)
+
+        regressions = compare(results, baseline.get("results", {}), args.threshold)
+        for item in regressions:
+            print(f"REGRESSION {item['benchmark']}: {item['baseline_ms']} → {item['current_ms']} ms (×{item['ratio']})")
+        if regressions:
+            return 1
+        print(f"No regressions beyond {args.threshold:.0%} against {baseline_path}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,5 +1,8 @@
 # config/settings.py
 
+import os
+import tempfile
+
 class Settings:
     """
     Global configuration for SIFRA AI.
@@ -10,16 +13,112 @@ class Settings:
     API_HOST = "0.0.0.0"
     API_PORT = 5000
 
+    # Writable storage (uploads, dataset store); /tmp on Vercel
+    DATA_DIR = os.environ.get("SIFRA_DATA_DIR", os.path.join(tempfile.gettempdir(), "sifra"))
+    UPLOAD_CHUNK_SIZE = 50000
+
+    # Dataset store: in-process LRU budget before spilling to disk
+    DATASET_STORE_MEMORY_MB = 512
+
+    # Background jobs (/jobs): backend = "process" or "thread"
+    JOB_BACKEND = os.environ.get("SIFRA_JOB_BACKEND", "process")
+    JOB_MAX_WORKERS = 2
+    JOB_CONCURRENCY = {"bigdata": 1, "modeler": 2, "eda": 2, "feature_engineering": 2}
+    JOB_DEFAULT_CONCURRENCY = 2
+    JOB_PROGRESS_INTERVAL = 0.5   # seconds between progress.json writes
+
+    # ASGI serving mode (api/asgi.py): engines run in an executor pool
+    ASGI_EXECUTOR = os.environ.get("SIFRA_ASGI_EXECUTOR", "process")   # or "thread"
+    ASGI_MAX_WORKERS = int(os.environ.get("SIFRA_ASGI_WORKERS", os.cpu_count() or 2))
+    ASGI_ROUTE_CONCURRENCY = {"bigdata": 1, "modeler": 1, "eda": 2, "feature_engineering": 2}
+    ASGI_DEFAULT_CONCURRENCY = 4
+    ASGI_MAX_QUEUE = 32           # waiting requests per route before 503
+    ASGI_MAX_BODY_MB = 256
+
     # Forecasting default steps
     FORECAST_STEPS = 5
 
-    # Logging
+    # Logging (utils/logger.py): queued, non-blocking handlers
     ENABLE_LOGS = True
+    LOG_LEVEL = os.environ.get("SIFRA_LOG_LEVEL", "INFO").upper()   # DEBUG for per-step diagnostics
+    LOG_FORMAT = os.environ.get("SIFRA_LOG_FORMAT", "json")          # or "text"
+    LOG_FILE = os.path.join("logs", "sifra.log")
+    LOG_CONSOLE = True
+
+    # Metrics (utils/metrics.py, GET /metrics)
+    METRICS_ENABLED = True
+    METRICS_STAGE_BUCKETS = (0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+    METRICS_REQUEST_BUCKETS = (0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+    METRICS_SIZE_BUCKETS = (100, 1000, 10000, 100000, 1000000, 10000000)
+
+    # SifraCore stage values kept per cleaned dataset (shared across goals)
+    CORE_CACHE_SIZE = 128
+    CORE_WORKERS = os.cpu_count() or 1
+    CORE_PARALLEL_MIN = 1000000   # cells before independent stages run on a thread pool
+
+    # Similar-dataset search (core/hds_unity/signature_store.py)
+    SIGNATURE_STORE_ENABLED = os.environ.get("SIFRA_SIGNATURES", "1") == "1"
+    SIGNATURE_LSH_MIN = 50000      # entries before switching to approximate search
+    SIGNATURE_KEEP = 200000        # newest fingerprints kept; the log is compacted at twice this
+    SIGNATURE_LSH_TABLES = 12
+    SIGNATURE_LSH_BITS = 5
+    SIGNATURE_LSH_WIDTH = 2.0      # ~0.95 recall@10 at 1M entries
+
+    # Startup snapshot (api/snapshot.py): pre-built engines + caches
+    SNAPSHOT_ENABLED = os.environ.get("SIFRA_SNAPSHOT", "1") == "1"
+    SNAPSHOT_PATH = os.environ.get(
+        "SIFRA_SNAPSHOT_PATH",
+        os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "build", "sifra_snapshot.pkl")
+    )
+    SNAPSHOT_ENGINES = (
+        ("data.dataset_loader", "DatasetLoader"),
+        ("data.preprocessor", "Preprocessor"),
+        ("core.engine_router", "EngineRouter"),
+        ("tasks.auto_analyze", "AutoAnalyze"),
+        ("tasks.auto_predict", "AutoPredict"),
+        ("tasks.auto_forecast", "AutoForecast"),
+        ("tasks.auto_anomaly", "AutoAnomaly"),
+        ("tasks.auto_insights", "AutoInsights"),
+        ("tasks.auto_visualize", "AutoVisualize"),
+        ("tasks.auto_eda", "AutoEDA"),
+        ("tasks.auto_feature_engineering", "AutoFeatureEngineering"),
+        ("tasks.auto_modeler", "AutoModeler"),
+        ("tasks.auto_evaluate", "AutoEvaluate"),
+        ("tasks.auto_bigdata", "AutoBigData"),
+    )
+
+    # Request profiling (utils/profiling.py): X-Sifra-Profile: 1 or ?profile=1
+    PROFILING_ENABLED = os.environ.get("SIFRA_PROFILING", "0") == "1"
+    PROFILE_TOP = 50              # functions / allocation sites per report
+    PROFILE_TRACEBACK_DEPTH = 10
+    PROFILE_KEEP = 50             # newest profiles kept on disk
+
+    # Silhouette (tasks/silhouette.py): exact up to SILHOUETTE_EXACT_MAX points, sampled above
+    SILHOUETTE_EXACT_MAX = 50000
+    SILHOUETTE_SAMPLE_SIZE = 5000
+    SILHOUETTE_TILE_ROWS = 256
+    SILHOUETTE_TILE_COLS = 2048      # 256 x 2048 float64 distances = 4 MB per tile
+    SILHOUETTE_PARALLEL_MIN = 10000  # points before spreading row blocks over processes
+    SILHOUETTE_WORKERS = os.cpu_count() or 1
+
+    # Visualization (tasks/auto_visualize.py): points per chart before downsampling
+    VISUALIZE_POINT_BUDGET = 2000
+    VISUALIZE_DENSITY_BINS = 64
+    VISUALIZE_HISTOGRAM_BINS = 50
+    VISUALIZE_TOP_CATEGORIES = 30
+    VISUALIZE_DASHBOARD_CHARTS = 50   # charts per kind in a dashboard plan
+
+    # Column profiles shared by AutoEDA and AutoVisualize (tasks/column_profile.py)
+    PROFILE_CACHE_SIZE = 16
 
     # Preprocessor settings
     FILL_NAN_VALUE = 0
     DATE_CONVERSION_MODE = "timestamp"   # or 'ordinal'
 
+    # Type inference: values sampled per column + cached date formats
+    TYPE_INFERENCE_SAMPLE_SIZE = 64
+    DATE_FORMAT_CACHE_SIZE = 4096
+
     # Anomaly detection sensitivity
     ANOMALY_THRESHOLD_STD = 2.0
 
@@ -28,4 +127,7 @@ class Settings:
 
     # Insights
     TOP_INSIGHTS_LIMIT = 5
+
+    # Feature engineering: compiled pipelines kept per schema hash
+    FEATURE_PIPELINE_CACHE_SIZE = 32
 settings = Settings()
\ No newline at end of file
@@ -1,53 +1,66 @@
 # core/engine_router.py
 
+from core import goals
 from core.sifra_core import SifraCore
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
 
 class EngineRouter:
     """
     Routes user goals to appropriate SIFRA AI engine functions.
+
+    Engines are registered per canonical goal (see core.goals) with the
+    SifraCore stages they need and default options, so routing is one
+    dict lookup and the core only computes what the engine reads.
     """
 
     def __init__(self):
         self.core = SifraCore()
-        print("[ENGINE ROUTER] Ready.")
-
-    def route(self, goal, dataset):
-        """
-        Automatically selects internal engine to execute.
-        """
-        print(f"[ROUTER] Received goal: {goal}")
+        self.routes = {}   # canonical goal → (handler, options)
 
-        # Normalize goal
-        goal = goal.lower().strip()
+        # ---- Full reasoning pipeline ----
+        for goal in ("analyze", "predict", "forecast", "anomaly", "insights"):
+            self.register(goal, self._pipeline)
 
-        # ---- Analysis ----
-        if goal in ["analyze", "analysis", "auto_analyze"]:
-            return self.core.run("analyze", dataset)
+        # ---- Trend Extraction (trend channel only) ----
+        self.register("trend", self._trend, stages=("trend",), remember=False)
 
-        # ---- Prediction ----
-        if goal in ["predict", "prediction", "auto_predict"]:
-            return self.core.run("predict", dataset)
+        logger.debug("Engine router ready")
 
-        # ---- Forecast ----
-        if goal in ["forecast", "future", "auto_forecast"]:
-            return self.core.run("forecast", dataset)
+    def register(self, goal, handler, aliases=(), stages=None, **options):
+        """
+        Routes `goal` and its aliases to handler(goal, dataset, **options).
+        stages: SifraCore stages the engine needs (None = all);
+        options: defaults the caller of route() can override.
+        """
+        goal = goals.register(goal, aliases)
+        self.routes[goal] = (handler, dict(options, stages=stages))
+        return goal
 
-        # ---- Anomaly Detection ----
-        if goal in ["anomaly", "anomalies", "auto_anomaly"]:
-            return self.core.run("anomaly", dataset)
+    def route(self, goal, dataset, **options):
+        """
+        Automatically selects internal engine to execute.
+        """
+        logger.debug("Received goal: %s", goal)
 
-        # ---- Insights ----
-        if goal in ["insights", "auto_insights", "insight"]:
-            return self.core.run("insights", dataset)
+        name = goals.canonical(goal)
+        if name not in self.routes:
+            logger.warning("Unknown goal: %s", goal)
+            return {
+                "error": "Unknown task",
+                "goal": goal.lower().strip()
+            }
 
-        # ---- Trend Extraction ----
-        if goal in ["trend", "pattern", "statistics"]:
-            return self.core.analyze_data(dataset)
+        handler, defaults = self.routes[name]
+        return handler(name, dataset, **dict(defaults, **options))
 
-        # ---- Default ----
-        print("[ROUTER] Unknown goal. Returning error.")
+    # ------------------------------------------------------
+    #  BUILT-IN ENGINES
+    # ------------------------------------------------------
+    def _pipeline(self, goal, dataset, stages=None, remember=True):
+        return self.core.run(goal, dataset, remember=remember, stages=stages)
 
-        return {
-            "error": "Unknown task",
-            "goal": goal
-        }
+    def _trend(self, goal, dataset, stages=None, remember=False):
+        result = self.core.run(goal, dataset, remember=remember, stages=stages)
+        return result["analysis_result"]["trend_score"]
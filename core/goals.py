@@ -0,0 +1,37 @@
+# core/goals.py
+"""
+Canonical SIFRA goals and their aliases, shared by EngineRouter
+(routing), IntentModule (intent vectors) and ContextModule (task type),
+so every alias resolves the same way everywhere.
+"""
+
+_ALIASES = {}   # alias → canonical goal
+
+
+def _normalize(goal):
+    return str(goal).lower().strip()
+
+
+def register(goal, aliases=()):
+    """
+    Adds a goal and its aliases; returns the canonical name.
+    """
+    goal = _normalize(goal)
+    for alias in (goal,) + tuple(aliases):
+        _ALIASES[_normalize(alias)] = goal
+    return goal
+
+
+def canonical(goal):
+    """
+    Canonical goal for a goal or alias (None when unknown).
+    """
+    return _ALIASES.get(_normalize(goal))
+
+
+register("analyze", ("analysis", "auto_analyze"))
+register("predict", ("prediction", "auto_predict"))
+register("forecast", ("future", "auto_forecast"))
+register("anomaly", ("anomalies", "auto_anomaly"))
+register("insights", ("insight", "auto_insights"))
+register("trend", ("pattern", "statistics"))
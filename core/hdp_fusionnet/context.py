@@ -2,6 +2,21 @@
 
 import numpy as np
 
+from core import goals
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# map canonical goals to numeric context
+TASK_MAP = {
+    "analyze": 1,
+    "predict": 2,
+    "forecast": 3,
+    "anomaly": 4,
+    "insights": 5
+}
+
+
 class ContextModule:
     """
     HDP-FusionNet Context Module.
@@ -13,7 +28,7 @@ class ContextModule:
     """
 
     def __init__(self):
-        print("[HDP-FUSIONNET] Context Module Loaded")
+        logger.debug("Context module loaded")
 
     def detect_context(self, goal, dataset):
         """
@@ -32,16 +47,7 @@ class ContextModule:
         else:
             variability = float(np.mean(np.std(ds, axis=1)))
 
-        # map goals to numeric context
-        task_map = {
-            "analyze": 1,
-            "predict": 2,
-            "forecast": 3,
-            "anomaly": 4,
-            "insights": 5
-        }
-
-        task_type = task_map.get(goal, 0)
+        task_type = self.task_type(goal)
 
         return [
             float(task_type),
@@ -49,3 +55,6 @@ class ContextModule:
             float(cols),
             float(variability)
         ]
+
+    def task_type(self, goal):
+        return TASK_MAP.get(goals.canonical(goal), 0)
@@ -2,6 +2,10 @@
 
 import numpy as np
 
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
 class EmotionModule:
     """
     Detects 'data emotion' — instability or volatility in dataset.
@@ -9,7 +13,7 @@ class EmotionModule:
     """
 
     def __init__(self):
-        print("[HDP-FUSIONNET] Emotion Module Loaded")
+        logger.debug("Emotion module loaded")
 
     def detect_emotion(self, dataset):
         """
@@ -1,5 +1,20 @@
 # core/hdp_fusionnet/intent.py
 
+from core import goals
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# intent vector per canonical goal (aliases resolve through core.goals)
+INTENTS = {
+    "analyze": [1, 0, 0, 0, 0],
+    "predict": [0, 1, 0, 0, 0],
+    "forecast": [0, 0, 1, 0, 0],
+    "anomaly": [0, 0, 0, 1, 0],
+    "insights": [0, 0, 0, 0, 1],
+}
+
+
 class IntentModule:
     """
     HDP-FusionNet intent engine.
@@ -7,7 +22,7 @@ class IntentModule:
     """
 
     def __init__(self):
-        print("[HDP-FUSIONNET] Intent Module Loaded")
+        logger.debug("Intent module loaded")
 
     # ---------------------------------------------------------
     # (NEW) Primary method required by SIFRA Core
@@ -18,36 +33,7 @@ class IntentModule:
         Maps a goal/task to a 5-dimensional intent vector.
         """
 
-        goal = goal.lower().strip()
-
-        mapping = {
-            # ANALYSIS
-            "analyze": [1, 0, 0, 0, 0],
-            "analysis": [1, 0, 0, 0, 0],
-            "auto_analyze": [1, 0, 0, 0, 0],
-
-            # PREDICT
-            "predict": [0, 1, 0, 0, 0],
-            "prediction": [0, 1, 0, 0, 0],
-            "auto_predict": [0, 1, 0, 0, 0],
-
-            # FORECAST
-            "forecast": [0, 0, 1, 0, 0],
-            "future": [0, 0, 1, 0, 0],
-            "auto_forecast": [0, 0, 1, 0, 0],
-
-            # ANOMALY
-            "anomaly": [0, 0, 0, 1, 0],
-            "anomalies": [0, 0, 0, 1, 0],
-            "auto_anomaly": [0, 0, 0, 1, 0],
-
-            # INSIGHTS
-            "insights": [0, 0, 0, 0, 1],
-            "insight": [0, 0, 0, 0, 1],
-            "auto_insights": [0, 0, 0, 0, 1],
-        }
-
-        return mapping.get(goal, [0, 0, 0, 0, 0])
+        return list(INTENTS.get(goals.canonical(goal), [0, 0, 0, 0, 0]))
 
     # ---------------------------------------------------------
     # (OLD) Legacy method (kept for compatibility)
@@ -1,5 +1,10 @@
 # core/hdp_fusionnet/meaning.py
 
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
 class MeaningModule:
     """
     Combines intent vector + context vector into a
@@ -7,7 +12,7 @@ class MeaningModule:
     """
 
     def __init__(self):
-        print("[HDP-FUSIONNET] Meaning Module Loaded")
+        logger.debug("Meaning module loaded")
 
     def create_meaning(self, intent_vec, context_vec):
         """
@@ -2,6 +2,11 @@
 
 import numpy as np
 
+from core import segment_ops
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
 class CorrelationChannel:
     """
     Computes correlation strength inside each row.
@@ -9,7 +14,7 @@ class CorrelationChannel:
     """
 
     def __init__(self):
-        print("[HDS-UNITY] Correlation Channel Loaded")
+        logger.debug("Correlation channel loaded")
 
     def compute_correlation(self, dataset):
         """
@@ -23,17 +28,9 @@ class CorrelationChannel:
         if len(ds.shape) == 1:
             ds = ds.reshape(1, -1)
 
-        corr_scores = []
-
-        for row in ds:
-            seq = np.arange(len(row))
-
-            # If row contains only 1 unique value, correlation is 0
-            if np.std(row) == 0:
-                corr_scores.append(0)
-                continue
-
-            corr = np.corrcoef(row, seq)[0, 1]
-            corr_scores.append(corr)
+        # One vectorized pass over all rows (constant rows score 0)
+        rows, cols = ds.shape
+        offsets = np.arange(rows + 1, dtype=np.int64) * cols
+        corr_scores = segment_ops.segment_position_corr(ds.astype(float).ravel(), offsets)
 
         return float(np.mean(corr_scores))
@@ -2,6 +2,10 @@
 
 import numpy as np
 
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
 class FusionMatrix:
     """
     Fusion Matrix combines all pattern channels into a single representation.
@@ -9,7 +13,7 @@ class FusionMatrix:
     """
 
     def __init__(self):
-        print("[HDS-UNITY] Fusion Matrix Module Loaded")
+        logger.debug("Fusion matrix module loaded")
 
     def fuse(self, trend_score, corr_score, var_score):
         """
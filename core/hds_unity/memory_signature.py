@@ -2,6 +2,17 @@
 
 import numpy as np
 
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Layout of MemorySignature.fingerprint
+FINGERPRINT_FIELDS = ("trend", "correlation", "variation", "emotion", "rows", "cols", "signature")
+
+
+def _signed_log(x):
+    return np.sign(x) * np.log1p(np.abs(x))
+
 class MemorySignature:
     """
     Memory Signature compresses Fusion Matrix into a stable pattern signature.
@@ -9,7 +20,7 @@ class MemorySignature:
     """
 
     def __init__(self):
-        print("[HDS-UNITY] Memory Signature Module Loaded")
+        logger.debug("Memory signature module loaded")
 
     def generate_signature(self, fusion_vector):
         """
@@ -22,3 +33,29 @@ class MemorySignature:
 
         # Signature = weighted combination
         return float((mean_val * 0.7) + (var_val * 0.3))
+
+    def fingerprint(self, fusion_vector, context_vec, emotion_score):
+        """
+        Fixed-length fingerprint used to find similar datasets
+        (layout: FINGERPRINT_FIELDS). Unbounded values are log-scaled so
+        no single channel dominates the distance.
+        Works on one dataset or on a batch (leading axis).
+        """
+
+        fusion = np.asarray(fusion_vector, dtype=float)
+        context = np.asarray(context_vec, dtype=float)
+        emotion = np.asarray(emotion_score, dtype=float)
+
+        signature = fusion.mean(axis=-1) * 0.7 + fusion.var(axis=-1) * 0.3
+
+        vector = np.stack([
+            _signed_log(fusion[..., 0]),
+            fusion[..., 1],
+            _signed_log(fusion[..., 2]),
+            emotion,
+            np.log1p(context[..., 1]),
+            np.log1p(context[..., 2]),
+            _signed_log(signature),
+        ], axis=-1)
+
+        return np.nan_to_num(vector, nan=0.0, posinf=0.0, neginf=0.0)
@@ -0,0 +1,303 @@
+# core/hds_unity/signature_store.py
+
+import json
+import os
+import threading
+import time
+import uuid
+
+import numpy as np
+
+from config.settings import Settings
+from utils.file_lock import file_lock
+from utils.logger import get_logger, get_request_id
+
+logger = get_logger(__name__)
+
+
+# ------------------------------------------------------------
+# Indexes
+# ------------------------------------------------------------
+class BruteForceIndex:
+    """
+    Exact k-nearest neighbours (Euclidean) by one matrix product.
+    """
+
+    def search(self, vectors, queries, k, candidates=None):
+        """
+        Returns (ids, distances), each (queries, k), nearest first.
+        `candidates` restricts the search to those row ids.
+        """
+        ids = np.arange(len(vectors)) if candidates is None else candidates
+        pool = vectors[ids]
+        k = min(k, len(ids))
+        if k == 0:
+            return np.empty((len(queries), 0), dtype=np.int64), np.empty((len(queries), 0))
+
+        # |q - v|^2 = |q|^2 - 2 q.v + |v|^2
+        dist = (queries * queries).sum(axis=1)[:, None] - 2.0 * queries @ pool.T + (pool * pool).sum(axis=1)[None, :]
+        np.maximum(dist, 0.0, out=dist)
+
+        top = np.argpartition(dist, k - 1, axis=1)[:, :k]
+        top_dist = np.take_along_axis(dist, top, axis=1)
+        order = np.argsort(top_dist, axis=1)
+        top = np.take_along_axis(top, order, axis=1)
+        return ids[top], np.sqrt(np.take_along_axis(top_dist, order, axis=1))
+
+
+class LSHIndex:
+    """
+    Approximate k-nearest neighbours: p-stable (Euclidean) LSH.
+
+    Each of `tables` hash tables projects a vector on `bits` random
+    directions and quantizes them with bucket width `width`
+    (floor((a.v + b) / w)). Buckets are kept as sorted key arrays, so
+    lookups are np.searchsorted calls. Candidates from all tables are
+    re-ranked exactly.
+    """
+
+    def __init__(self, dim, tables, bits, width, seed=0):
+        rng = np.random.default_rng(seed)
+        self.width = width
+        self.projections = rng.normal(size=(tables, dim, bits))
+        self.offsets = rng.uniform(0, width, size=(tables, bits))
+        self.mixer = rng.integers(1, 2 ** 31 - 1, size=bits, dtype=np.int64)
+        self.keys = [np.empty(0, dtype=np.int64) for _ in range(tables)]
+        self.ids = [np.empty(0, dtype=np.int64) for _ in range(tables)]
+        self.size = 0
+
+    def hash(self, vectors):
+        """
+        (tables, n) bucket keys.
+        """
+        codes = np.floor((np.einsum("nd,tdb->tnb", vectors, self.projections) + self.offsets[:, None, :]) / self.width)
+        return (codes.astype(np.int64) * self.mixer).sum(axis=2)
+
+    def add(self, vectors, start):
+        """
+        Indexes vectors whose row ids start at `start`.
+        """
+        if len(vectors) == 0:
+            return
+        keys = self.hash(vectors)
+        new_ids = np.arange(start, start + len(vectors), dtype=np.int64)
+        for t in range(len(self.keys)):
+            merged_keys = np.concatenate([self.keys[t], keys[t]])
+            merged_ids = np.concatenate([self.ids[t], new_ids])
+            order = np.argsort(merged_keys, kind="stable")
+            self.keys[t], self.ids[t] = merged_keys[order], merged_ids[order]
+        self.size = start + len(vectors)
+
+    def candidates(self, query):
+        keys = self.hash(query[None, :])[:, 0]
+        found = []
+        for t, key in enumerate(keys):
+            lo, hi = np.searchsorted(self.keys[t], [key, key + 1])
+            found.append(self.ids[t][lo:hi])
+        return np.unique(np.concatenate(found))
+
+
+# ------------------------------------------------------------
+# Store
+# ------------------------------------------------------------
+class SignatureStore:
+    """
+    Persistent store of dataset fingerprints (MemorySignature.fingerprint)
+    with k-nearest-neighbour queries.
+
+    Storage is one append-only JSON-lines log under DATA_DIR/signatures/,
+    so every worker process can append safely and picks up the others'
+    entries on its next query. Entries are identified by signature_id.
+    Once the log holds twice SIGNATURE_KEEP entries it is rewritten with
+    only the newest SIGNATURE_KEEP (appends and compaction share a file
+    lock; readers see the new file and reload it), bounding both the
+    log and each worker's in-memory copy.
+
+    Search is exact (brute force) below SIGNATURE_LSH_MIN entries and
+    approximate (LSH + exact re-ranking) above it.
+    """
+
+    def __init__(self, root=None):
+        self.root = root or os.path.join(Settings.DATA_DIR, "signatures")
+        self.path = os.path.join(self.root, "signatures.jsonl")
+        self._exact = BruteForceIndex()
+        self._lock = threading.RLock()
+        self._reset()
+
+    def _reset(self):
+        self.vectors = None
+        self.meta = []
+        self.count = 0
+        self._read_offset = 0
+        self._inode = None   # log file the offset refers to (compaction replaces it)
+        self._lsh = None
+
+    # ------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------
+    def add(self, fingerprint, **meta):
+        return self.add_many(np.asarray(fingerprint, dtype=float)[None, :], [meta])[0]
+
+    def add_many(self, fingerprints, metas=None):
+        """
+        Appends fingerprints (n, dim); returns their signature ids.
+        """
+        fingerprints = np.asarray(fingerprints, dtype=float)
+        metas = metas or [{} for _ in range(len(fingerprints))]
+        created = time.time()
+        request_id = get_request_id()
+
+        ids, lines = [], []
+        for vector, meta in zip(fingerprints.tolist(), metas):
+            entry = dict(meta, signature_id=uuid.uuid4().hex[:16], created=created, fingerprint=vector)
+            if request_id != "-":
+                entry.setdefault("request_id", request_id)
+            ids.append(entry["signature_id"])
+            lines.append(json.dumps(entry) + "\n")
+
+        with self._lock, self._file_lock():
+            with open(self.path, "a", encoding="utf-8") as fh:
+                fh.write("".join(lines))
+
+        self.refresh()   # compacts once the log is over its limit
+        return ids
+
+    def _file_lock(self):
+        return file_lock(os.path.join(self.root, "signatures.lock"))
+
+    def refresh(self):
+        """
+        Loads entries appended since the last read (by any process) and
+        compacts the log once it holds twice SIGNATURE_KEEP entries.
+        """
+        with self._lock:
+            self._load()
+            if self.count > 2 * Settings.SIGNATURE_KEEP:
+                self.compact()
+            return self.count
+
+    def _load(self):
+        try:
+            fh = open(self.path, "rb")
+        except OSError:
+            if self.count:
+                self._reset()
+            return
+
+        with fh:
+            stat = os.fstat(fh.fileno())   # the file actually opened, even if replaced since
+            if stat.st_ino != self._inode or stat.st_size < self._read_offset:
+                self._reset()   # compacted by another process: read the new log from the start
+                self._inode = stat.st_ino
+            if stat.st_size == self._read_offset:
+                return
+            fh.seek(self._read_offset)
+            chunk = fh.read()
+
+        complete = chunk[:chunk.rfind(b"\n") + 1]   # ignore a half-written last line
+        self._read_offset += len(complete)
+
+        entries = [json.loads(line) for line in complete.splitlines() if line]
+        if entries:
+            self._append([entry.pop("fingerprint") for entry in entries], entries)
+            logger.debug("Loaded %d signatures (%d total)", len(entries), self.count)
+
+    def compact(self):
+        """
+        Rewrites the log with only the newest SIGNATURE_KEEP entries.
+        """
+        with self._lock, self._file_lock():
+            self._load()   # everything appended up to the lock
+            start = max(0, self.count - Settings.SIGNATURE_KEEP)
+            if start == 0:
+                return
+
+            vectors, metas = self.vectors[start:self.count].copy(), self.meta[start:]
+            data = "".join(
+                json.dumps(dict(meta, fingerprint=vector)) + "\n" for vector, meta in zip(vectors.tolist(), metas)
+            ).encode("utf-8")
+            with open(f"{self.path}.tmp", "wb") as fh:
+                fh.write(data)
+            os.replace(f"{self.path}.tmp", self.path)
+
+            self._reset()
+            self._append(vectors, metas)
+            self._read_offset, self._inode = len(data), os.stat(self.path).st_ino
+            logger.info("Compacted signature log: dropped %d, kept %d", start, self.count)
+
+    def _append(self, vectors, metas):
+        vectors = np.asarray(vectors, dtype=float)
+        if self.vectors is None:
+            self.vectors = np.empty((max(1024, len(vectors)), vectors.shape[1]))
+        needed = self.count + len(vectors)
+        if needed > len(self.vectors):
+            grown = np.empty((max(needed, 2 * len(self.vectors)), self.vectors.shape[1]))
+            grown[:self.count] = self.vectors[:self.count]
+            self.vectors = grown
+
+        self.vectors[self.count:needed] = vectors
+        self.meta.extend(metas)
+        self.count = needed
+
+    # ------------------------------------------------------------
+    # Search
+    # ------------------------------------------------------------
+    def _lsh_index(self):
+        """
+        Built on first LSH query; new entries are merged in batches.
+        """
+        if self._lsh is None:
+            self._lsh = LSHIndex(
+                self.vectors.shape[1], Settings.SIGNATURE_LSH_TABLES,
+                Settings.SIGNATURE_LSH_BITS, Settings.SIGNATURE_LSH_WIDTH
+            )
+        if self._lsh.size < self.count:
+            self._lsh.add(self.vectors[self._lsh.size:self.count], self._lsh.size)
+        return self._lsh
+
+    def search(self, fingerprint, k=5, method="auto"):
+        """
+        k nearest stored fingerprints: (method used, [{"distance", ...entry}]).
+        method: "auto", "exact" or "lsh".
+        """
+        if method not in ("auto", "exact", "lsh"):
+            raise ValueError(f"Unknown search method: {method}")
+
+        query = np.asarray(fingerprint, dtype=float).reshape(1, -1)
+
+        with self._lock:
+            self.refresh()
+            if self.count == 0:
+                return "exact", []
+
+            vectors = self.vectors[:self.count]
+            if query.shape[1] != vectors.shape[1]:
+                raise ValueError(f"Fingerprint must have {vectors.shape[1]} values")
+
+            if method == "auto":
+                method = "lsh" if self.count >= Settings.SIGNATURE_LSH_MIN else "exact"
+
+            candidates = None
+            if method == "lsh":
+                candidates = self._lsh_index().candidates(query[0])
+                if len(candidates) < k:
+                    method, candidates = "exact", None   # too few colliding buckets
+
+            ids, dist = self._exact.search(vectors, query, k, candidates)
+            return method, [
+                dict(self.meta[i], distance=float(d)) for i, d in zip(ids[0], dist[0])
+            ]
+
+    def stats(self):
+        with self._lock:
+            self.refresh()
+            return {
+                "count": self.count,
+                "dimensions": None if self.vectors is None else int(self.vectors.shape[1]),
+                "index": "lsh" if self.count >= Settings.SIGNATURE_LSH_MIN else "exact",
+                "keep": Settings.SIGNATURE_KEEP,
+            }
+
+
+# Singleton instance (the log is read on first use)
+signature_store = SignatureStore()
@@ -2,6 +2,10 @@
 
 import numpy as np
 
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
 class TrendChannel:
     """
     Computes trend using a simple slope formula.
@@ -9,7 +13,7 @@ class TrendChannel:
     """
 
     def __init__(self):
-        print("[HDS-UNITY] Trend Channel Module Loaded")
+        logger.debug("Trend channel module loaded")
 
     def compute_trend(self, data):
         """
@@ -2,6 +2,10 @@
 
 import numpy as np
 
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
 class VariationChannel:
     """
     Variation Channel measures volatility or spread within each row.
@@ -9,7 +13,7 @@ class VariationChannel:
     """
 
     def __init__(self):
-        print("[HDS-UNITY] Variation Channel Loaded")
+        logger.debug("Variation channel loaded")
 
     def compute_variation(self, dataset):
         ds = np.array(dataset)
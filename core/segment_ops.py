@@ -0,0 +1,154 @@
+# core/segment_ops.py
+"""
+Vectorized reductions over ragged segments of a flat array.
+
+Segments use CSR-style offsets: segment i is values[offsets[i]:offsets[i + 1]],
+so len(offsets) == number of segments + 1. Empty segments are allowed.
+Used by SifraCore.run_many to score many small datasets in one pass.
+"""
+
+import numpy as np
+
+
+def as_offsets(offsets):
+    offsets = np.asarray(offsets, dtype=np.int64)
+    if offsets.ndim != 1 or len(offsets) == 0 or offsets[0] != 0 or np.any(np.diff(offsets) < 0):
+        raise ValueError("offsets must start at 0 and be non-decreasing")
+    return offsets
+
+
+def lengths(offsets):
+    return np.diff(offsets)
+
+
+def positions(offsets):
+    """
+    Position of every element inside its own segment (0, 1, 2, ...).
+    """
+    counts = lengths(offsets)
+    return np.arange(offsets[-1]) - np.repeat(offsets[:-1], counts)
+
+
+def _reduceat(ufunc, values, offsets, empty):
+    """
+    ufunc.reduceat with empty segments set to `empty`
+    (plain reduceat returns values[start] for them).
+    """
+    out = np.full(len(offsets) - 1, empty, dtype=float)
+    counts = lengths(offsets)
+    filled = counts > 0
+    if filled.any():
+        out[filled] = ufunc.reduceat(values, offsets[:-1][filled])
+    return out
+
+
+def segment_sum(values, offsets):
+    return _reduceat(np.add, values, offsets, 0.0)
+
+
+def segment_min(values, offsets):
+    return _reduceat(np.minimum, values, offsets, np.nan)
+
+
+def segment_max(values, offsets):
+    return _reduceat(np.maximum, values, offsets, np.nan)
+
+
+def segment_mean(values, offsets):
+    """
+    NaN for empty segments (like np.mean of an empty array).
+    """
+    counts = lengths(offsets)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return segment_sum(values, offsets) / counts
+
+
+def centered(values, offsets, means=None):
+    """
+    values minus their segment mean (two-pass, numerically stable).
+    """
+    if means is None:
+        means = segment_mean(values, offsets)
+    return values - np.repeat(means, lengths(offsets))
+
+
+def segment_std(values, offsets):
+    """
+    Population standard deviation (ddof=0) per segment.
+    """
+    dev = centered(values, offsets)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.sqrt(segment_sum(dev * dev, offsets) / lengths(offsets))
+
+
+def segment_slope(values, offsets):
+    """
+    Least-squares slope of each segment against its positions
+    (np.polyfit(arange(n), segment, 1)[0]); 0.0 below two points.
+    """
+    counts = lengths(offsets)
+    x = positions(offsets).astype(float)
+    x -= np.repeat((counts - 1) / 2.0, counts)
+
+    sxy = segment_sum(x * centered(values, offsets), offsets)
+    sxx = counts * (counts * counts - 1) / 12.0   # sum of (i - mean)^2 over 0..n-1
+
+    slope = np.zeros(len(counts))
+    ok = counts >= 2
+    slope[ok] = sxy[ok] / sxx[ok]
+    return slope
+
+
+def segment_position_corr(values, offsets):
+    """
+    Pearson correlation of each segment with its positions
+    (np.corrcoef(segment, arange(n))[0, 1]); 0.0 for constant segments.
+    """
+    counts = lengths(offsets)
+    x = positions(offsets).astype(float)
+    x -= np.repeat((counts - 1) / 2.0, counts)
+    dev = centered(values, offsets)
+
+    sxy = segment_sum(x * dev, offsets)
+    syy = segment_sum(dev * dev, offsets)
+    sxx = counts * (counts * counts - 1) / 12.0
+
+    corr = np.zeros(len(counts))
+    varying = segment_max(values, offsets) != segment_min(values, offsets)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        corr[varying] = sxy[varying] / np.sqrt(sxx[varying] * syy[varying])
+    return np.clip(corr, -1.0, 1.0)
+
+
+def segment_diff(values, offsets):
+    """
+    First differences inside each segment (never across a boundary).
+    Returns (diffs, diff_offsets).
+    """
+    counts = lengths(offsets)
+    keep = np.ones(max(len(values) - 1, 0), dtype=bool)
+    bounds = offsets[1:-1]
+    bounds = bounds[(bounds > 0) & (bounds < len(values))]
+    keep[bounds - 1] = False   # values[b] - values[b - 1] spans two segments
+
+    diffs = np.diff(values)[keep]
+    diff_counts = np.maximum(counts - 1, 0)
+    return diffs, np.concatenate(([0], np.cumsum(diff_counts)))
+
+
+def segment_moments(values, offsets):
+    """
+    Least-squares sufficient statistics of each segment against its
+    positions t = 0..n-1 (centered, so no cancellation):
+    (n, mean_t, mean_y, ctt, cty, cyy).
+    """
+    counts = lengths(offsets).astype(float)
+    mean_t = (counts - 1) / 2.0
+    x = positions(offsets) - np.repeat(mean_t, lengths(offsets))
+    mean_y = segment_mean(values, offsets)
+    dev = centered(values, offsets, mean_y)
+
+    ctt = counts * (counts * counts - 1) / 12.0
+    cty = segment_sum(x * dev, offsets)
+    cyy = segment_sum(dev * dev, offsets)
+    return counts, mean_t, mean_y, ctt, cty, cyy
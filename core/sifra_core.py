@@ -1,5 +1,11 @@
 # core/sifra_core.py
 
+import contextvars
+import hashlib
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
 import numpy as np
 
 # -------- HDP-FUSIONNET MODULES --------
@@ -14,15 +20,168 @@ from core.hds_unity.correlation_channel import CorrelationChannel
 from core.hds_unity.variation_channel import VariationChannel
 from core.hds_unity.fusion_matrix import FusionMatrix
 from core.hds_unity.memory_signature import MemorySignature
+from core.hds_unity.signature_store import signature_store
 
 # -------- PREPROCESSOR --------
 from data.preprocessor import Preprocessor
 
+# -------- BATCH MODE --------
+from core import segment_ops
+
 # -------- SETTINGS --------
 from config.settings import Settings
 
-# -------- LOGGER --------
+# -------- LOGGER / METRICS --------
 from utils.logger import SifraLogger
+from utils.metrics import stage
+
+# Goal-independent results per cleaned dataset, shared by every SifraCore
+# (each task engine has its own instance): content hash → entry
+_RESULT_CACHE = OrderedDict()
+_CACHE_LOCK = threading.Lock()
+
+
+# Pipeline stages, with the stages each one reads
+STAGES = {
+    "intent": (),
+    "context": (),
+    "meaning": ("intent", "context"),
+    "emotion": (),
+    "trend": (),
+    "correlation": (),
+    "variation": (),
+    "fusion": ("trend", "correlation", "variation"),
+    "memory_signature": ("fusion", "context", "emotion"),
+}
+
+# Stages that read the cleaned data (timed with its size)
+_DATA_STAGES = ("context", "emotion", "trend", "correlation", "variation")
+
+# Stages whose value depends on the data only, cached per dataset
+# (context is re-stamped with the goal's task type on reuse)
+_CACHED_STAGES = _DATA_STAGES + ("fusion", "memory_signature")
+
+# Result keys and the stage that computes them (intent is always there)
+_OUTPUTS = {
+    "context_vector": "context",
+    "meaning_vector": "meaning",
+    "emotion_score": "emotion",
+    "trend_score": "trend",
+    "correlation_score": "correlation",
+    "variation_score": "variation",
+    "fusion_vector": "fusion",
+    "memory_signature": "memory_signature",
+    "fingerprint": "memory_signature",
+}
+
+_POOL = None
+_POOL_LOCK = threading.Lock()
+
+
+def required_stages(stages=None):
+    """
+    The requested stages plus everything they depend on
+    (all stages when `stages` is None).
+    """
+    if stages is None:
+        return set(STAGES)
+    needed = set()
+    pending = [stages] if isinstance(stages, str) else list(stages)
+    while pending:
+        name = pending.pop()
+        if name not in STAGES:
+            raise ValueError(f"Unknown pipeline stage: {name}")
+        if name not in needed:
+            needed.add(name)
+            pending.extend(STAGES[name])
+    return needed
+
+
+def stage_levels(needed, done=()):
+    """
+    `needed` stages grouped into levels: a stage only reads stages of
+    earlier levels (or `done`), so the stages of a level are independent.
+    """
+    done = set(done)
+    pending = [name for name in STAGES if name in needed and name not in done]
+    levels = []
+    while pending:
+        level = [name for name in pending if done.issuperset(STAGES[name])]
+        if not level:
+            raise ValueError(f"Unresolvable pipeline stages: {pending}")
+        levels.append(level)
+        done.update(level)
+        pending = [name for name in pending if name not in done]
+    return levels
+
+
+def _pool():
+    global _POOL
+    with _POOL_LOCK:
+        if _POOL is None:
+            _POOL = ThreadPoolExecutor(max_workers=Settings.CORE_WORKERS, thread_name_prefix="sifra-core")
+        return _POOL
+
+
+class StageGraph:
+    """
+    Lazily evaluated stages of one run. get() computes a stage (and the
+    stages it reads) the first time it is asked for, once; values given
+    up front (e.g. from the result cache) are never recomputed.
+
+    Independent stages run concurrently on the core thread pool when
+    the data has at least CORE_PARALLEL_MIN cells (NumPy releases the
+    GIL in its kernels); each task runs in a copy of the caller's
+    context, so per-request stage timings still see it.
+    """
+
+    def __init__(self, functions, data, values=None):
+        self.functions = functions     # stage → fn(values of the stages it reads)
+        self.data = data
+        self.values = dict(values or {})
+        self.computed = set()          # stages computed by this graph (not given)
+
+    def get(self, *names):
+        levels = stage_levels(required_stages(names), done=self.values)
+        parallel = Settings.CORE_WORKERS > 1 and np.size(self.data) >= Settings.CORE_PARALLEL_MIN
+
+        for level in levels:
+            if parallel and len(level) > 1:
+                pool = _pool()
+                futures = [pool.submit(contextvars.copy_context().run, self._compute, name) for name in level]
+                results = [future.result() for future in futures]
+            else:
+                results = [self._compute(name) for name in level]
+            self.values.update(zip(level, results))
+            self.computed.update(level)
+
+        return [self.values[name] for name in names]
+
+    def _compute(self, name):
+        with stage(name, self.data if name in _DATA_STAGES else None):
+            return self.functions[name](self.values)
+
+
+def _select(result, needed):
+    """
+    Result without the keys of stages that did not run.
+    """
+    out = {key: value for key, value in result.items() if key not in _OUTPUTS or _OUTPUTS[key] in needed}
+    out["analysis_result"] = {
+        key: value for key, value in result["analysis_result"].items() if _OUTPUTS[key] in needed
+    }
+    return out
+
+
+def dataset_key(clean_data):
+    """
+    Content hash of a cleaned array (shape + dtype + bytes).
+    """
+    data = np.ascontiguousarray(clean_data)
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"{data.shape}{data.dtype}".encode())
+    digest.update(data.view(np.uint8).ravel() if data.size else b"")
+    return digest.hexdigest()
 
 
 class SifraCore:
@@ -54,7 +213,7 @@ class SifraCore:
         # Preprocessor
         self.preprocessor = Preprocessor()
 
-        self.log.info("SIFRA Core initialized successfully.")
+        self.log.debug("SIFRA Core initialized successfully.")
 
     # ------------------------------------------------------
     #  ANALYSIS ONLY (utility for trend option)
@@ -66,7 +225,7 @@ class SifraCore:
     # ------------------------------------------------------
     #  FULL REASONING PIPELINE
     # ------------------------------------------------------
-    def run(self, goal, dataset):
+    def run(self, goal, dataset, remember=True, stages=None):
         """
         Full thinking pipeline used by:
         - analyze
@@ -74,48 +233,194 @@ class SifraCore:
         - forecast
         - anomaly
         - insights
+        With remember=True the dataset's fingerprint is added to the
+        signature store (similar-dataset search).
+
+        stages: the pipeline stages to compute (see STAGES), e.g.
+        ("trend",); the stages they read run too. None runs all of
+        them. Keys of the stages that did not run are left out.
+        """
+
+        needed = required_stages(stages) | {"intent"}
+        self.log.info("Running %s pipeline for goal: %s",
+                      "full" if len(needed) == len(STAGES) else "partial", goal)
+
+        # Preprocess dataset
+        with stage("preprocess", dataset):
+            clean_data = self.preprocessor.clean(dataset)
+
+        # Same data seen before (any goal): only the goal-specific stages run again
+        key = dataset_key(clean_data)
+        graph = StageGraph(self._stage_functions(goal, clean_data), clean_data, self._cached(goal, key))
+        graph.get(*needed)
+        values = graph.values
+        self.log.debug("Computed stages: %s", sorted(graph.computed))
+
+        if graph.computed.intersection(_CACHED_STAGES):
+            self._remember(key, {name: values[name] for name in _CACHED_STAGES if name in values})
+
+        if "memory_signature" in graph.computed and remember and Settings.SIGNATURE_STORE_ENABLED:
+            context_vec = values["context"]
+            signature_store.add(values["memory_signature"][1], goal=goal, rows=context_vec[1], cols=context_vec[2])
+
+        return self._result(goal, values, needed)
+
+    def _stage_functions(self, goal, clean_data):
+        """
+        Stage → function of the values of the stages it reads.
+        """
+        return {
+            # HDP-FusionNet
+            "intent": lambda values: self.intent.detect_intent(goal),
+            "context": lambda values: self.context.detect_context(goal, clean_data),
+            "meaning": lambda values: self.meaning.create_meaning(values["intent"], values["context"]),
+            "emotion": lambda values: self.emotion.detect_emotion(clean_data),
+
+            # HDS-Unity
+            "trend": lambda values: self.trend.compute_trend(clean_data),
+            "correlation": lambda values: self.corr.compute_correlation(clean_data),
+            "variation": lambda values: self.variation.compute_variation(clean_data),
+            "fusion": lambda values: self.fusion.fuse(values["trend"], values["correlation"], values["variation"]),
+            "memory_signature": lambda values: (
+                self.memory.generate_signature(values["fusion"]),
+                self.memory.fingerprint(values["fusion"], values["context"], values["emotion"]),
+            ),
+        }
+
+    def _result(self, goal, values, needed):
+        signature, fingerprint = values.get("memory_signature", (None, None))
+        fusion_vector = values.get("fusion")
+
+        return _select({
+            "intent_vector": values["intent"],
+            "context_vector": values.get("context"),
+            "meaning_vector": values.get("meaning"),
+            "emotion_score": values.get("emotion"),
+            "analysis_result": {
+                "trend_score": values.get("trend"),
+                "correlation_score": values.get("correlation"),
+                "variation_score": values.get("variation"),
+                "fusion_vector": None if fusion_vector is None else fusion_vector.tolist(),
+                "memory_signature": signature,
+                "fingerprint": None if fingerprint is None else fingerprint.tolist(),
+            },
+            "message": f"Task '{goal}' executed successfully."
+        }, needed)
+
+    # ------------------------------------------------------
+    #  RESULT CACHE
+    # ------------------------------------------------------
+    def _cached(self, goal, key):
+        """
+        Cached stage values of a dataset (empty when unseen), with the
+        context re-stamped with this goal's task type.
+        """
+        with _CACHE_LOCK:
+            entry = _RESULT_CACHE.get(key)
+            if entry is None:
+                return {}
+            _RESULT_CACHE.move_to_end(key)
+            entry = dict(entry)
+
+        self.log.debug("Reusing cached stages %s for %s", sorted(entry), key)
+        if "context" in entry:
+            entry["context"] = [float(self.context.task_type(goal))] + entry["context"][1:]
+        return entry
+
+    def _remember(self, key, values):
+        """
+        Merges newly computed stage values into the dataset's entry.
+        """
+        if Settings.CORE_CACHE_SIZE <= 0:
+            return
+        with _CACHE_LOCK:
+            _RESULT_CACHE[key] = dict(_RESULT_CACHE.get(key, {}), **values)
+            _RESULT_CACHE.move_to_end(key)
+            while len(_RESULT_CACHE) > Settings.CORE_CACHE_SIZE:
+                _RESULT_CACHE.popitem(last=False)
+
+    # ------------------------------------------------------
+    #  BATCH PIPELINE (many independent datasets)
+    # ------------------------------------------------------
+    def run_many(self, goal, datasets, offsets=None, remember=True):
         """
+        Runs the reasoning pipeline over many small datasets at once.
+
+        datasets:
+          - a list of datasets (DataFrame / array), one per series
+          - a 3D array (series, rows, cols)
+          - a 2D array of stacked rows, with row `offsets` (len = series + 1)
+        goal: one goal for all series or a list with one goal per series.
+
+        Every channel is computed with segment reductions over the
+        concatenated data instead of one call per series. Results are
+        columnar: row i of each array belongs to series i.
+        """
+
+        with stage("batch_preprocess", datasets):
+            values, row_offsets, series_rows, shapes = self._stack_many(datasets, offsets)
+
+        count = len(series_rows) - 1
+        goals = [goal] * count if isinstance(goal, str) else list(goal)
+        if len(goals) != count:
+            raise ValueError(f"Got {len(goals)} goals for {count} datasets")
 
-        self.log.info(f"Running full pipeline for goal: {goal}")
+        self.log.info("Running batch pipeline over %d datasets", count)
 
-        # STEP 1 — Preprocess dataset
-        clean_data = self.preprocessor.clean(dataset)
+        # Element offsets of each series (rows are contiguous)
+        series_offsets = row_offsets[series_rows]
 
-        # STEP 2 — HDP: Intent
-        intent_vec = self.intent.detect_intent(goal)
-        self.log.info(f"Intent Vector: {intent_vec}")
+        # HDP: Intent / Context / Meaning
+        with stage("batch_intent"):
+            intents = {g: self.intent.detect_intent(g) for g in set(goals)}
+            intent_vec = np.array([intents[g] for g in goals], dtype=float).reshape(count, -1)
 
-        # STEP 3 — HDP: Context
-        context_vec = self.context.detect_context(goal, clean_data)
-        self.log.info(f"Context Vector: {context_vec}")
+        with stage("batch_variation", values):
+            row_std = segment_ops.segment_std(values, row_offsets)
+            var_score = segment_ops.segment_mean(row_std, series_rows)
 
-        # STEP 4 — HDP: Meaning = Intent + Context
-        meaning_vec = self.meaning.create_meaning(intent_vec, context_vec)
-        self.log.info(f"Meaning Vector: {meaning_vec}")
+        with stage("batch_context"):
+            context_vec = np.column_stack([
+                [self.context.task_type(g) for g in goals],
+                shapes[:, 0],
+                shapes[:, 1],
+                var_score,      # context variability = mean row std
+            ]).astype(float).reshape(count, 4)
 
-        # STEP 5 — HDP: Emotion (data volatility)
-        emotion_score = self.emotion.detect_emotion(clean_data)
-        self.log.info(f"Emotion Score: {emotion_score}")
+        with stage("batch_meaning"):
+            meaning_vec = np.hstack([intent_vec, context_vec])
 
-        # STEP 6 — HDS: Trend Channel
-        trend_score = self.trend.compute_trend(clean_data)
+        # HDP: Emotion (std of within-row differences)
+        with stage("batch_emotion", values):
+            diffs, diff_rows = segment_ops.segment_diff(values, row_offsets)
+            diff_series = diff_rows[series_rows]
+            emotion_score = np.minimum(1.0, segment_ops.segment_std(diffs, diff_series) / 10)
+            emotion_score[segment_ops.lengths(diff_series) == 0] = 0.0
 
-        # STEP 7 — HDS: Correlation
-        corr_score = self.corr.compute_correlation(clean_data)
+        # HDS: Trend / Correlation
+        with stage("batch_trend", values):
+            trend_score = segment_ops.segment_slope(values, series_offsets)
 
-        # STEP 8 — HDS: Variation
-        var_score = self.variation.compute_variation(clean_data)
+        with stage("batch_correlation", values):
+            row_corr = segment_ops.segment_position_corr(values, row_offsets)
+            corr_score = segment_ops.segment_mean(row_corr, series_rows)
 
-        # STEP 9 — HDS: Fusion of all pattern channels
-        fusion_vector = self.fusion.fuse(trend_score, corr_score, var_score)
-        self.log.info(f"Fusion Vector: {fusion_vector}")
+        # HDS: Fusion + Memory Signature
+        with stage("batch_fusion"):
+            fusion_vector = np.column_stack([trend_score, corr_score, var_score]).reshape(count, 3)
 
-        # STEP 10 — HDS: Memory Signature (pattern fingerprint)
-        signature = self.memory.generate_signature(fusion_vector)
-        self.log.info(f"Memory Signature: {signature}")
+        with stage("batch_memory_signature"):
+            signature = fusion_vector.mean(axis=1) * 0.7 + fusion_vector.var(axis=1) * 0.3
+            fingerprint = self.memory.fingerprint(fusion_vector, context_vec, emotion_score)
+
+        if remember and Settings.SIGNATURE_STORE_ENABLED and count:
+            signature_store.add_many(fingerprint, [
+                {"goal": g, "rows": float(r), "cols": float(c)} for g, (r, c) in zip(goals, shapes.tolist())
+            ])
 
-        # RETURN FULL INFORMATION
         return {
+            "count": count,
+            "goal": goals,
             "intent_vector": intent_vec,
             "context_vector": context_vec,
             "meaning_vector": meaning_vec,
@@ -125,11 +430,61 @@ class SifraCore:
                 "trend_score": trend_score,
                 "correlation_score": corr_score,
                 "variation_score": var_score,
-                "fusion_vector": fusion_vector.tolist(),
+                "fusion_vector": fusion_vector,
                 "memory_signature": signature,
+                "fingerprint": fingerprint,
             },
 
-            "message": f"Task '{goal}' executed successfully."
+            "message": f"Batch of {count} datasets executed successfully."
         }
 
-# --- IGNORE ---
\ No newline at end of file
+    def _stack_many(self, datasets, offsets=None):
+        """
+        Cleans and concatenates the series.
+        Returns (values, row_offsets, series_rows, shapes):
+          values       flat float array, series after series, row-major
+          row_offsets  element offsets of every row
+          series_rows  row offsets of every series
+          shapes       (series, 2) array of cleaned (rows, cols)
+        """
+        if offsets is not None:
+            series_rows = segment_ops.as_offsets(offsets)
+            stacked = np.asarray(datasets)
+            if stacked.ndim != 2 or series_rows[-1] != len(stacked):
+                raise ValueError("offsets must index the rows of a 2D array")
+            if self._is_clean(stacked):
+                rows = segment_ops.lengths(series_rows)
+                shapes = np.column_stack([rows, np.where(rows > 0, stacked.shape[1], 0)])
+                row_offsets = np.arange(len(stacked) + 1, dtype=np.int64) * stacked.shape[1]
+                return stacked.astype(float).ravel(), row_offsets, series_rows, shapes
+            datasets = [stacked[start:end] for start, end in zip(series_rows[:-1], series_rows[1:])]
+
+        elif isinstance(datasets, np.ndarray) and datasets.ndim == 3 and self._is_clean(datasets):
+            count, rows, cols = datasets.shape
+            shapes = np.tile([rows, cols], (count, 1))
+            row_offsets = np.arange(count * rows + 1, dtype=np.int64) * cols
+            series_rows = np.arange(count + 1, dtype=np.int64) * rows
+            return datasets.astype(float).ravel(), row_offsets, series_rows, shapes
+
+        cleaned = []
+        for data in datasets:
+            if not isinstance(data, np.ndarray) and not hasattr(data, "dropna"):
+                data = np.asarray(data)
+            if isinstance(data, np.ndarray) and data.ndim <= 2 and self._is_clean(data):
+                matrix = data.astype(float).reshape(len(data), -1)
+                cleaned.append(matrix if len(matrix) else matrix.reshape(0, 0))
+            else:
+                cleaned.append(self.preprocessor.clean(data))
+
+        shapes = np.array([c.shape for c in cleaned], dtype=np.int64).reshape(len(cleaned), 2)
+        row_lengths = np.repeat(shapes[:, 1], shapes[:, 0])
+        row_offsets = np.concatenate(([0], np.cumsum(row_lengths))).astype(np.int64)
+        series_rows = np.concatenate(([0], np.cumsum(shapes[:, 0]))).astype(np.int64)
+        values = np.concatenate([c.ravel() for c in cleaned]) if cleaned else np.empty(0)
+        return values, row_offsets, series_rows, shapes
+
+    def _is_clean(self, data):
+        """
+        Numeric arrays without NaN need no preprocessing.
+        """
+        return data.dtype.kind in "biuf" and not np.isnan(data).any()
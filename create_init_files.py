@@ -9,7 +9,8 @@ folders = [
     "data",
     "api",
     "ui",
-    "config"
+    "config",
+    "benchmarks"
 ]
 
 for f in folders:
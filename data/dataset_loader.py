@@ -1,36 +1,121 @@
 # data/dataset_loader.py
 
+import io
+
 import pandas as pd
 import numpy as np
 
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
 class DatasetLoader:
     """
     Loads datasets from multiple formats for SIFRA AI.
-    Supports CSV, Excel, JSON, and raw lists.
+    Supports CSV, Excel, JSON, raw lists, columnar dicts,
+    NPY and Arrow IPC buffers.
     """
 
     def __init__(self):
-        print("[DATA] Dataset Loader Ready")
+        logger.debug("Dataset loader ready")
 
     def load_csv(self, path):
-        print(f"[DATA] Loading CSV: {path}")
+        logger.debug("Loading CSV: %s", path)
         return pd.read_csv(path).values
 
     def load_excel(self, path):
-        print(f"[DATA] Loading Excel: {path}")
+        logger.debug("Loading Excel: %s", path)
         return pd.read_excel(path).values
 
     def load_json(self, path):
-        print(f"[DATA] Loading JSON: {path}")
+        logger.debug("Loading JSON: %s", path)
         df = pd.read_json(path)
         return df.values
 
     def load_raw(self, data):
         """
         Accepts raw Python lists or NumPy arrays.
+        Homogeneous numeric rows become a float array in one pass;
+        mixed rows keep per-column types in a DataFrame instead of
+        collapsing everything into one string/object array.
+        """
+        logger.debug("Loading raw dataset")
+
+        if isinstance(data, (np.ndarray, pd.DataFrame)):
+            return data
+
+        if isinstance(data, dict):
+            return self.load_columns(data)
+
+        try:
+            return np.asarray(data, dtype=float)
+        except (ValueError, TypeError):
+            return pd.DataFrame(data)
+
+    def load_columns(self, columns):
+        """
+        Columnar JSON: {"col": [...], ...}.
+        Each column is converted on its own (float when possible).
+        """
+        logger.debug("Loading columnar dataset")
+
+        lengths = {len(values) for values in columns.values()}
+        if len(lengths) > 1:
+            raise ValueError("All columns must have the same length.")
+
+        typed = {}
+        for name, values in columns.items():
+            try:
+                typed[name] = np.asarray(values, dtype=float)
+            except (ValueError, TypeError):
+                typed[name] = np.asarray(values, dtype=object)
+
+        return pd.DataFrame(typed)
+
+    def load_npy(self, payload):
+        logger.debug("Loading NPY buffer")
+        return np.load(io.BytesIO(payload), allow_pickle=False)
+
+    def load_arrow(self, payload):
+        """
+        Arrow IPC stream → typed DataFrame (requires pyarrow).
+        """
+        logger.debug("Loading Arrow IPC stream")
+        import pyarrow as pa
+
+        return pa.ipc.open_stream(payload).read_all().to_pandas()
+
+    def load_csv_bytes(self, payload):
+        logger.debug("Loading CSV body")
+        return pd.read_csv(io.BytesIO(payload))
+
+    # ------------------------------------------------------------
+    # Content-type based dispatch (shared by every dataset route)
+    # ------------------------------------------------------------
+    BODY_FORMATS = {
+        "text/csv": "load_csv_bytes",
+        "application/csv": "load_csv_bytes",
+        "application/x-npy": "load_npy",
+        "application/octet-stream": "load_npy",
+        "application/vnd.apache.arrow.stream": "load_arrow",
+    }
+
+    def load_json_dataset(self, dataset):
+        """
+        JSON "dataset" field: row lists or columnar dict.
+        """
+        if isinstance(dataset, dict):
+            return self.load_columns(dataset)
+        return self.load_raw(dataset)
+
+    def load_body(self, payload, content_type):
+        """
+        Parses a binary/text request body according to its content type.
         """
-        print("[DATA] Loading Raw Dataset")
-        return np.array(data)
+        method = self.BODY_FORMATS.get(content_type)
+        if method is None:
+            raise ValueError(f"Unsupported content type: {content_type}")
+        return getattr(self, method)(payload)
 # Example usage:
 # loader = DatasetLoader()
 # dataset = loader.load_csv('data.csv') or loader.load_raw([[1,2,3],[4,5,6]])
\ No newline at end of file
@@ -0,0 +1,296 @@
+# data/dataset_store.py
+
+import json
+import os
+import re
+import shutil
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from config.settings import Settings
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+_ID_PATTERN = re.compile(r"^[0-9a-f]{16}$")
+
+
+class DatasetNotFound(KeyError):
+    """
+    Raised for unknown or malformed dataset IDs (routes answer 404).
+    """
+
+
+class DatasetStore:
+    """
+    Server-side dataset store for SIFRA AI.
+    A dataset is uploaded once, kept as a typed (columnar) DataFrame and
+    referenced by ID from any route. Derived artifacts — the cleaned
+    array, EDA summary, SifraCore results — are cached next to it and
+    invalidated together when the dataset changes.
+
+    Memory:
+      - in-process LRU bounded by DATASET_STORE_MEMORY_MB
+      - inline datasets are written to DATA_DIR/datasets/<id>/frame.pkl
+        when stored, evicted artifacts spill next to them (pickle)
+      - meta.json on disk, so every worker sharing the disk resolves IDs
+        and sees new versions (in-memory copies are checked against it)
+    """
+
+    def __init__(self, root=None, memory_limit_mb=None):
+        self.root = root or os.path.join(Settings.DATA_DIR, "datasets")
+        os.makedirs(self.root, exist_ok=True)
+
+        limit = memory_limit_mb or Settings.DATASET_STORE_MEMORY_MB
+        self.memory_limit = int(limit * 1024 * 1024)
+
+        self._meta = {}
+        self._entries = OrderedDict()  # id → {"frame", "artifacts", "nbytes"}
+        self._lock = threading.RLock()
+        logger.debug("Dataset store ready")
+
+    # ------------------------------------------------------------
+    # Paths / IDs
+    # ------------------------------------------------------------
+    def new_id(self):
+        return uuid.uuid4().hex[:16]
+
+    def dataset_dir(self, dataset_id):
+        if not isinstance(dataset_id, str) or not _ID_PATTERN.match(dataset_id):
+            raise DatasetNotFound(f"Invalid dataset id: {dataset_id!r}")
+        return os.path.join(self.root, dataset_id)
+
+    def file_path(self, dataset_id, filename="data.csv"):
+        path = self.dataset_dir(dataset_id)
+        os.makedirs(path, exist_ok=True)
+        return os.path.join(path, filename)
+
+    # ------------------------------------------------------------
+    # Registration / lookup
+    # ------------------------------------------------------------
+    def _write_meta(self, dataset_id, meta):
+        path = self.file_path(dataset_id, "meta.json")
+        with open(f"{path}.tmp", "w", encoding="utf-8") as fh:
+            json.dump(meta, fh)
+        os.replace(f"{path}.tmp", path)
+        self._meta[dataset_id] = meta
+        return meta
+
+    def _read_meta(self, dataset_id):
+        """
+        meta.json as on disk (another worker may have replaced it).
+        """
+        meta_path = os.path.join(self.dataset_dir(dataset_id), "meta.json")
+        if not os.path.exists(meta_path):
+            self._meta.pop(dataset_id, None)
+            raise DatasetNotFound(f"Unknown dataset id: {dataset_id}")
+
+        with open(meta_path, "r", encoding="utf-8") as fh:
+            meta = json.load(fh)
+
+        self._meta[dataset_id] = meta
+        return meta
+
+    def register_file(self, dataset_id, path, profile):
+        """
+        Registers an uploaded file (loaded lazily on first use).
+        """
+        return self._write_meta(dataset_id, {
+            "dataset_id": dataset_id,
+            "source": "upload",
+            "path": path,
+            "created": time.time(),
+            "version": 1,
+            "rows": profile.get("rows"),
+            "columns": profile.get("columns"),
+            "dtypes": profile.get("dtypes"),
+        })
+
+    def put(self, dataset, dataset_id=None):
+        """
+        Stores an inline dataset (array / DataFrame). Replacing an
+        existing ID invalidates all of its derived artifacts.
+        """
+        frame = dataset if isinstance(dataset, pd.DataFrame) else pd.DataFrame(dataset)
+        frame.columns = frame.columns.astype(str)
+
+        with self._lock:
+            if dataset_id is None:
+                dataset_id = self.new_id()
+                version = 1
+            else:
+                version = self._read_meta(dataset_id).get("version", 1) + 1
+                self.invalidate(dataset_id)
+
+            # Data before meta: a worker that sees the new version finds its frame
+            frame_path = self.file_path(dataset_id, "frame.pkl")
+            frame.to_pickle(f"{frame_path}.tmp")
+            os.replace(f"{frame_path}.tmp", frame_path)
+
+            meta = self._write_meta(dataset_id, {
+                "dataset_id": dataset_id,
+                "source": "inline",
+                "path": None,
+                "created": time.time(),
+                "version": version,
+                "rows": int(frame.shape[0]),
+                "columns": frame.columns.tolist(),
+                "dtypes": {col: str(dtype) for col, dtype in frame.dtypes.items()},
+            })
+
+            self._remember(dataset_id, {"frame": frame, "artifacts": {}, "version": version})
+
+        return meta
+
+    def meta(self, dataset_id):
+        if dataset_id in self._meta:
+            return self._meta[dataset_id]
+
+        return self._read_meta(dataset_id)
+
+    def path(self, dataset_id):
+        """
+        Path of a file on disk for streaming engines (AutoBigData).
+        Inline datasets are exported to CSV on first request.
+        """
+        meta = self._read_meta(dataset_id)
+        if meta.get("path"):
+            return meta["path"]
+
+        path = self.file_path(dataset_id)
+        self.load(dataset_id).to_csv(path, index=False)
+        meta["path"] = path
+        self._write_meta(dataset_id, meta)
+        return path
+
+    # ------------------------------------------------------------
+    # In-memory LRU with on-disk spill
+    # ------------------------------------------------------------
+    def _entry_size(self, entry):
+        size = int(entry["frame"].memory_usage(deep=True).sum())
+        for value in entry["artifacts"].values():
+            if isinstance(value, np.ndarray):
+                size += value.nbytes
+        return size
+
+    def _remember(self, dataset_id, entry):
+        entry["nbytes"] = self._entry_size(entry)
+        self._entries[dataset_id] = entry
+        self._entries.move_to_end(dataset_id)
+        self._evict()
+
+    def _evict(self):
+        total = sum(e["nbytes"] for e in self._entries.values())
+        while total > self.memory_limit and len(self._entries) > 1:
+            dataset_id, entry = self._entries.popitem(last=False)
+            self._spill(dataset_id, entry)
+            total -= entry["nbytes"]
+            logger.info("Spilled %s to disk", dataset_id)
+
+    def _spill(self, dataset_id, entry):
+        frame_path = self.file_path(dataset_id, "frame.pkl")
+        if not os.path.exists(frame_path):
+            entry["frame"].to_pickle(frame_path)
+        pd.to_pickle(
+            {"version": entry["version"], "artifacts": entry["artifacts"]},
+            self.file_path(dataset_id, "artifacts.pkl")
+        )
+
+    def _entry(self, dataset_id):
+        with self._lock:
+            meta = self._read_meta(dataset_id)
+            version = meta.get("version", 1)
+
+            entry = self._entries.get(dataset_id)
+            if entry is not None:
+                if entry["version"] == version:
+                    self._entries.move_to_end(dataset_id)
+                    return entry
+                logger.info("Dataset %s changed to version %s, reloading", dataset_id, version)
+                self._entries.pop(dataset_id)
+
+            frame_path = self.file_path(dataset_id, "frame.pkl")
+            artifacts_path = self.file_path(dataset_id, "artifacts.pkl")
+
+            if os.path.exists(frame_path):
+                frame = pd.read_pickle(frame_path)
+            elif meta.get("path"):
+                frame = pd.read_csv(meta["path"])
+            else:
+                raise DatasetNotFound(f"Dataset {dataset_id} has no stored data")
+
+            artifacts = {}
+            if os.path.exists(artifacts_path):
+                spilled = pd.read_pickle(artifacts_path)
+                if spilled.get("version") == version:
+                    artifacts = spilled["artifacts"]
+
+            entry = {"frame": frame, "artifacts": artifacts, "version": version}
+            self._remember(dataset_id, entry)
+            return entry
+
+    # ------------------------------------------------------------
+    # Data + derived artifacts
+    # ------------------------------------------------------------
+    def load(self, dataset_id):
+        """
+        Typed DataFrame for the dataset (memory, spill file or CSV).
+        """
+        return self._entry(dataset_id)["frame"]
+
+    def artifact(self, dataset_id, key, compute):
+        """
+        Returns a cached derived artifact, computing it on first use.
+        """
+        entry = self._entry(dataset_id)
+        if key in entry["artifacts"]:
+            return entry["artifacts"][key]
+
+        value = compute()
+
+        with self._lock:
+            entry["artifacts"][key] = value
+            if dataset_id in self._entries:
+                entry["nbytes"] = self._entry_size(entry)
+                self._evict()
+
+        return value
+
+    def clean(self, dataset_id, preprocessor):
+        """
+        Cleaned numeric array — computed once per dataset version.
+        """
+        return self.artifact(dataset_id, "clean", lambda: preprocessor.clean(self.load(dataset_id)))
+
+    def invalidate(self, dataset_id):
+        """
+        Drops every derived artifact of a dataset (memory + disk).
+        """
+        with self._lock:
+            entry = self._entries.get(dataset_id)
+            if entry is not None:
+                entry["artifacts"] = {}
+                entry["nbytes"] = self._entry_size(entry)
+
+            artifacts_path = os.path.join(self.dataset_dir(dataset_id), "artifacts.pkl")
+            if os.path.exists(artifacts_path):
+                os.remove(artifacts_path)
+
+    def delete(self, dataset_id):
+        self.meta(dataset_id)
+        self.delete_files(dataset_id)
+
+    def delete_files(self, dataset_id):
+        with self._lock:
+            self._meta.pop(dataset_id, None)
+            self._entries.pop(dataset_id, None)
+            shutil.rmtree(self.dataset_dir(dataset_id), ignore_errors=True)
+
+
+# Singleton instance
+dataset_store = DatasetStore()
@@ -0,0 +1,199 @@
+# data/feature_pipeline.py
+
+import hashlib
+import json
+
+import numpy as np
+import pandas as pd
+
+
+def schema_hash(columns, types):
+    """
+    Stable hash of a feature schema: column names plus their logical
+    types (numeric / datetime / categorical). Per-batch pandas dtypes are
+    left out on purpose — an all-integer slice or a column with NaNs must
+    map to the same compiled pipeline.
+    """
+    parts = [f"{col}:{types[col]}" for col in columns]
+    return hashlib.sha1("|".join(parts).encode("utf-8")).hexdigest()[:16]
+
+
+def spec_hash(spec):
+    """
+    Hash of a fitted pipeline spec (everything but its id).
+    """
+    body = json.dumps({k: v for k, v in spec.items() if k != "pipeline_id"}, sort_keys=True)
+    return hashlib.sha1(body.encode("utf-8")).hexdigest()[:16]
+
+
+class FeaturePipeline:
+    """
+    Compiled feature pipeline for SIFRA AI.
+    Holds everything learned by AutoFeatureEngineering.fit():
+      - column types
+      - category vocabularies
+      - scaler min / max
+      - selected output features (polynomial terms included)
+    transform() replays it with vectorized NumPy only — no inference,
+    no refitting — so every batch gets the same columns and scaling.
+    """
+
+    VERSION = 1
+
+    def __init__(self, spec):
+        self.spec = spec
+        self.pipeline_id = spec["pipeline_id"]
+        self._compile()
+
+    # ------------------------------------------------------------
+    # Build index arrays used by the fast transform path
+    # ------------------------------------------------------------
+    def _compile(self):
+        spec = self.spec
+
+        self.columns = spec["columns"]
+        self.numeric_sources = spec["numeric_sources"]
+        self.categorical = [c["name"] for c in self.columns if c["type"] == "categorical"]
+        self.datetimes = [c["name"] for c in self.columns if c["type"] == "datetime"]
+
+        self.scale_min = np.array(spec["scaler"]["min"], dtype=float)
+        scale_range = np.array(spec["scaler"]["max"], dtype=float) - self.scale_min
+        scale_range[scale_range == 0] = 1.0
+        self.scale_range = scale_range
+
+        vocab_index = {
+            col: {value: i for i, value in enumerate(values)}
+            for col, values in spec["categories"].items()
+        }
+        cat_position = {col: i for i, col in enumerate(self.categorical)}
+        date_position = {col: i for i, col in enumerate(self.datetimes)}
+
+        groups = {"scaled": ([], []), "epoch": ([], []), "dummy": ([], [], []), "poly": ([], [], [])}
+
+        for pos, feature in enumerate(spec["features"]):
+            kind = feature["kind"]
+            if kind == "scaled":
+                groups["scaled"][0].append(pos)
+                groups["scaled"][1].append(feature["index"])
+            elif kind == "epoch":
+                groups["epoch"][0].append(pos)
+                groups["epoch"][1].append(date_position[feature["column"]])
+            elif kind == "dummy":
+                groups["dummy"][0].append(pos)
+                groups["dummy"][1].append(cat_position[feature["column"]])
+                groups["dummy"][2].append(vocab_index[feature["column"]][feature["value"]])
+            elif kind == "poly":
+                groups["poly"][0].append(pos)
+                groups["poly"][1].append(feature["terms"][0])
+                groups["poly"][2].append(feature["terms"][1])
+
+        self._index = {
+            kind: tuple(np.array(part, dtype=np.intp) for part in parts)
+            for kind, parts in groups.items()
+        }
+        self.feature_names = [f["name"] for f in spec["features"]]
+
+    # ------------------------------------------------------------
+    # Typed column conversion (types already known)
+    # ------------------------------------------------------------
+    def _frame(self, dataset):
+        df = dataset if isinstance(dataset, pd.DataFrame) else pd.DataFrame(dataset)
+        df.columns = df.columns.astype(str)
+
+        missing = [c["name"] for c in self.columns if c["name"] not in df.columns]
+        if missing:
+            raise ValueError(f"Dataset is missing pipeline columns: {missing}")
+
+        typed = {}
+        for col in self.columns:
+            series = df[col["name"]]
+            if col["type"] == "numeric":
+                typed[col["name"]] = pd.to_numeric(series, errors="coerce")
+            elif col["type"] == "datetime":
+                typed[col["name"]] = pd.to_datetime(series, format=col.get("format"), errors="coerce")
+            else:
+                typed[col["name"]] = series
+
+        # Same NaN policy as fit: forward then backward fill
+        return pd.DataFrame(typed).ffill().bfill()
+
+    # ------------------------------------------------------------
+    # Fast transform path
+    # ------------------------------------------------------------
+    def transform(self, dataset):
+        """
+        Applies the compiled pipeline.
+        Returns a float matrix with len(feature_names) columns.
+        """
+        df = self._frame(dataset)
+        n = len(df)
+
+        # Numeric block (raw numeric columns + date parts) → min/max scaled
+        blocks = []
+        for source in self.numeric_sources:
+            if source["part"] is None:
+                blocks.append(df[source["column"]].to_numpy(dtype=float, na_value=np.nan))
+            else:
+                dates = df[source["column"]].dt
+                blocks.append(getattr(dates, source["part"]).to_numpy(dtype=float, na_value=np.nan))
+
+        if blocks:
+            scaled = (np.column_stack(blocks) - self.scale_min) / self.scale_range
+        else:
+            scaled = np.empty((n, 0))
+
+        out = np.empty((n, len(self.feature_names)), dtype=float)
+
+        pos, idx = self._index["scaled"]
+        if len(pos):
+            out[:, pos] = scaled[:, idx]
+
+        pos, left, right = self._index["poly"]
+        if len(pos):
+            out[:, pos] = scaled[:, left] * scaled[:, right]
+
+        pos, idx = self._index["epoch"]
+        if len(pos):
+            epochs = np.column_stack([
+                df[col].to_numpy(dtype="datetime64[ns]").astype("int64") // 10**9
+                for col in self.datetimes
+            ]).astype(float)
+            epochs[np.column_stack([df[col].isna().to_numpy() for col in self.datetimes])] = np.nan
+            out[:, pos] = epochs[:, idx]
+
+        pos, idx, codes = self._index["dummy"]
+        if len(pos):
+            cat_codes = np.column_stack([
+                pd.Categorical(
+                    df[col].astype(str).where(df[col].notna()),
+                    categories=self.spec["categories"][col]
+                ).codes
+                for col in self.categorical
+            ])
+            out[:, pos] = cat_codes[:, idx] == codes
+
+        return np.nan_to_num(out, nan=0.0)
+
+    # ------------------------------------------------------------
+    # Serialization
+    # ------------------------------------------------------------
+    def to_dict(self):
+        return self.spec
+
+    @classmethod
+    def from_dict(cls, spec):
+        if spec.get("version") != cls.VERSION:
+            raise ValueError(f"Unsupported feature pipeline version: {spec.get('version')}")
+        return cls(spec)
+
+    def save(self, path):
+        with open(path, "w", encoding="utf-8") as fh:
+            json.dump(self.spec, fh)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "r", encoding="utf-8") as fh:
+            return cls.from_dict(json.load(fh))
+# Example usage:
+# pipeline = AutoFeatureEngineering().fit(train_rows)
+# features = pipeline.transform(new_rows)
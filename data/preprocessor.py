@@ -3,6 +3,11 @@
 import numpy as np
 import pandas as pd
 
+from data.type_inference import TypeInferencer
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
 class Preprocessor:
     """
     Cleans and converts mixed datasets (text, dates, NaN) into
@@ -10,7 +15,8 @@ class Preprocessor:
     """
 
     def __init__(self):
-        print("[DATA] Preprocessor Ready")
+        self.inferencer = TypeInferencer()
+        logger.debug("Preprocessor ready")
 
     def clean(self, data):
         """
@@ -25,23 +31,24 @@ class Preprocessor:
         else:
             df = data
 
-        print("[PREPROCESSOR] Initial shape:", df.shape)
+        logger.debug("Initial shape: %s", df.shape)
 
         # 1. Remove completely empty rows
         df = df.dropna(how='all')
-        print("[PREPROCESSOR] Removed empty rows. New shape:", df.shape)
+        logger.debug("Removed empty rows. New shape: %s", df.shape)
 
         # 2. Remove columns that are entirely NaN or empty
         df = df.dropna(how='all', axis=1)
-        print("[PREPROCESSOR] Removed empty columns. New shape:", df.shape)
+        logger.debug("Removed empty columns. New shape: %s", df.shape)
 
-        # 3. Convert dates to numeric timestamps
-        df = df.apply(self._convert_dates)
-        print("[PREPROCESSOR] Converted dates.")
+        # 3. Infer column types from a sample (shared with feature engineering)
+        df, _ = self.inferencer.infer_frame(df)
+        logger.debug("Inferred column types")
 
-        # 4. Convert text columns to numeric category codes
+        # 4. Convert dates to timestamps and text to category codes
+        df = df.apply(self._convert_dates)
         df = df.apply(self._text_to_numeric)
-        print("[PREPROCESSOR] Converted text to numeric.")
+        logger.debug("Converted dates and text to numeric")
 
         # 5. Replace remaining NaN with 0
         df = df.fillna(0)
@@ -49,30 +56,39 @@ class Preprocessor:
         # 6. Final numeric conversion
         numeric_data = df.values.astype(float)
 
-        print("[PREPROCESSOR] Final cleaned shape:", numeric_data.shape)
+        logger.debug("Final cleaned shape: %s", numeric_data.shape)
 
         return numeric_data
 
+    def column_names(self, data, count):
+        """
+        Names of the columns kept by clean() (positions when unknown).
+        """
+        columns = getattr(data, "columns", None)
+        if columns is not None:
+            kept = [str(col) for col in columns if data[col].notna().any()]
+            if len(kept) == count:
+                return kept
+        return [str(i) for i in range(count)]
+
     def _convert_dates(self, col):
         """
         Converts datetime values into numeric timestamp integers.
         """
         if pd.api.types.is_datetime64_any_dtype(col):
-            return col.astype("int64") // 10**9  # convert to seconds
+            seconds = col.to_numpy(dtype="datetime64[s]").astype("int64")  # convert to seconds
+            return pd.Series(seconds, index=col.index).where(col.notna())
         return col
 
     def _text_to_numeric(self, col):
         """
         Converts any text column to numeric category IDs.
+        Numeric text was already converted during type inference.
         Example: Kolhapur → 1, Pune → 2, Sangali → 3
         """
-        if col.dtype == object:
-            try:
-                return col.astype(float)  # if numeric text, convert directly
-            except:
-                # Convert strings to category codes
-                return col.astype("category").cat.codes
-        return col
+        if pd.api.types.is_numeric_dtype(col):
+            return col
+        return col.astype("category").cat.codes
 # Example usage:
 # preprocessor = Preprocessor()
 # clean_data = preprocessor.clean(your_dataset)
\ No newline at end of file
@@ -0,0 +1,199 @@
+# data/type_inference.py
+
+import re
+import threading
+from collections import OrderedDict
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from config.settings import Settings
+
+# Candidate date formats, most common first
+DATE_FORMATS = (
+    "%Y-%m-%d",
+    "%Y-%m-%d %H:%M:%S",
+    "%Y-%m-%dT%H:%M:%S",
+    "%Y-%m-%d %H:%M",
+    "%Y/%m/%d",
+    "%d-%m-%Y",
+    "%d/%m/%Y",
+    "%m/%d/%Y",
+    "%d.%m.%Y",
+    "%d-%b-%Y",
+    "%d %b %Y",
+    "%b %d %Y",
+    "%d/%m/%Y %H:%M",
+    "%m/%d/%Y %H:%M",
+)
+
+_DIGITS = re.compile(r"\d")
+
+
+def _parses(value, fmt):
+    try:
+        datetime.strptime(value, fmt)
+    except ValueError:
+        return False
+    return True
+
+
+class TypeInferencer:
+    """
+    Sample-based column type inference shared by the Preprocessor and
+    AutoFeatureEngineering.
+    Looks at a small, evenly spaced sample of each text column, detects
+    numeric / datetime (with an explicit format) / categorical, then
+    converts the full column in one vectorized call.
+    """
+
+    # value shape ("9999-99-99") → format last detected for it; only a
+    # hint, every column sample is still checked against it
+    _format_cache = OrderedDict()
+    _cache_lock = threading.Lock()
+
+    def __init__(self, sample_size=None):
+        self.sample_size = sample_size or Settings.TYPE_INFERENCE_SAMPLE_SIZE
+
+    # ------------------------------------------------------------
+    # Sampling
+    # ------------------------------------------------------------
+    def _sample(self, series):
+        values = series.dropna().to_numpy()
+        if len(values) <= self.sample_size:
+            return values
+        idx = np.linspace(0, len(values) - 1, self.sample_size).astype(int)
+        return values[idx]
+
+    # ------------------------------------------------------------
+    # Date format detection (cached formats are hints per value shape)
+    # ------------------------------------------------------------
+    def _hints(self, shapes):
+        cache = TypeInferencer._format_cache
+        with TypeInferencer._cache_lock:
+            hints = []
+            for shape in shapes:
+                fmt = cache.get(shape)
+                if fmt is not None:
+                    cache.move_to_end(shape)
+                    hints.append(fmt)
+            return hints
+
+    def _remember(self, shapes, fmt):
+        cache = TypeInferencer._format_cache
+        with TypeInferencer._cache_lock:
+            for shape in shapes:
+                cache[shape] = fmt
+                cache.move_to_end(shape)
+            while len(cache) > Settings.DATE_FORMAT_CACHE_SIZE:
+                cache.popitem(last=False)
+
+    def _date_format(self, sample):
+        """
+        The first format (cached hints first, then DATE_FORMATS order)
+        that parses every sampled value; "mixed" when the values are
+        dates but no single format fits them all.
+        """
+        values = set()
+        for value in sample:
+            # No digit → can never be a date
+            if not isinstance(value, str) or not _DIGITS.search(value):
+                return None
+            values.add(value.strip())
+
+        if not values:
+            return None
+
+        shapes = {_DIGITS.sub("9", value.lower()) for value in values}
+        for fmt in dict.fromkeys(self._hints(shapes) + list(DATE_FORMATS)):
+            if all(_parses(value, fmt) for value in values):
+                self._remember(shapes, fmt)
+                return fmt
+
+        if all(any(_parses(value, fmt) for fmt in DATE_FORMATS) for value in values):
+            return "mixed"
+        return None
+
+    # ------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------
+    def infer(self, series):
+        """
+        Returns (type, format) where type is numeric / datetime / categorical.
+        """
+        if pd.api.types.is_numeric_dtype(series):
+            return "numeric", None
+        if pd.api.types.is_datetime64_any_dtype(series):
+            return "datetime", None
+
+        sample = self._sample(series)
+        if len(sample) == 0:
+            return "categorical", None
+
+        if pd.to_numeric(pd.Series(sample), errors="coerce").notna().all():
+            return "numeric", None
+
+        fmt = self._date_format(sample)
+        if fmt is not None:
+            return "datetime", fmt
+
+        return "categorical", None
+
+    def convert(self, series, kind, fmt=None):
+        """
+        Single vectorized conversion using the inferred type.
+        Returns None when a value outside the sample does not fit.
+        """
+        if kind == "numeric":
+            converted = pd.to_numeric(series, errors="coerce")
+        elif kind == "datetime":
+            converted = pd.to_datetime(series, format=fmt, errors="coerce")
+        else:
+            return series
+
+        if converted.isna().sum() != series.isna().sum():
+            return None
+        return converted
+
+    def infer_frame(self, df):
+        """
+        Infers and converts every column.
+        Returns (converted DataFrame, {column: {"type", "format"}}).
+        """
+        types = {}
+        for col in df.columns:
+            kind, fmt = self.infer(df[col])
+
+            # Already typed columns need no conversion pass
+            if pd.api.types.is_numeric_dtype(df[col]) or pd.api.types.is_datetime64_any_dtype(df[col]):
+                types[col] = {"type": kind, "format": None}
+                continue
+
+            converted = self.convert(df[col], kind, fmt)
+
+            if converted is None:
+                kind, fmt = "categorical", None
+            else:
+                df[col] = converted
+
+            types[col] = {"type": kind, "format": fmt}
+
+        return df, types
+
+
+# Startup snapshot hooks (api/snapshot.py)
+def snapshot_state():
+    with TypeInferencer._cache_lock:
+        return dict(TypeInferencer._format_cache)
+
+
+def restore_state(formats):
+    with TypeInferencer._cache_lock:
+        for shape, fmt in formats.items():
+            if fmt is not None:
+                TypeInferencer._format_cache.setdefault(shape, fmt)
+
+
+# Example usage:
+# frame, types = TypeInferencer().infer_frame(pd.DataFrame(rows))
@@ -19,6 +19,7 @@ from tasks.auto_evaluate import AutoEvaluate
 from tasks.auto_bigdata import AutoBigData
 
 from ui.dashboard import Dashboard
+from utils.serialization import json_default
 from core.engine_router import EngineRouter
 
 
@@ -99,7 +100,7 @@ def main():
                 dataset = loader.load_raw(safe_eval(data))
                 result = predictor.run(dataset)
                 print("\n===== PREDICTION RESULT =====")
-                print(json.dumps(result, indent=2))
+                print(json.dumps(result, indent=2, default=json_default))
             except Exception as e:
                 print("[ERROR] Invalid dataset:", e)
 
@@ -113,7 +114,7 @@ def main():
                 steps = int(steps) if steps else 5
                 result = forecaster.run(dataset, steps)
                 print("\n===== FORECAST RESULT =====")
-                print(json.dumps(result, indent=2))
+                print(json.dumps(result, indent=2, default=json_default))
             except Exception as e:
                 print("[ERROR] Forecast error:", e)
 
@@ -125,7 +126,7 @@ def main():
                 dataset = loader.load_raw(safe_eval(data))
                 result = anomaly_detector.run(dataset)
                 print("\n===== ANOMALY REPORT =====")
-                print(json.dumps(result, indent=2))
+                print(json.dumps(result, indent=2, default=json_default))
             except Exception as e:
                 print("[ERROR] Invalid dataset:", e)
 
@@ -161,7 +162,7 @@ def main():
                 dataset = loader.load_raw(safe_eval(data))
                 result = visualizer.run(dataset)
                 print("\n===== VISUALIZATION SPECS =====")
-                print(json.dumps(result, indent=2))
+                print(json.dumps(result, indent=2, default=json_default))
             except Exception as e:
                 print("[ERROR] Visualization error:", e)
 
@@ -173,7 +174,7 @@ def main():
                 dataset = loader.load_raw(safe_eval(data))
                 result = eda_engine.run(dataset)
                 print("\n===== EDA REPORT =====")
-                print(json.dumps(result, indent=2))
+                print(json.dumps(result, indent=2, default=json_default))
             except Exception as e:
                 print("[ERROR] EDA error:", e)
 
@@ -185,7 +186,7 @@ def main():
                 dataset = loader.load_raw(safe_eval(data))
                 result = feature_engineer.run(dataset)
                 print("\n===== FEATURE ENGINEERING RESULT =====")
-                print(json.dumps(result, indent=2))
+                print(json.dumps(result, indent=2, default=json_default))
             except Exception as e:
                 print("[ERROR] Feature engineering error:", e)
 
@@ -198,7 +199,7 @@ def main():
             try:
                 result = model_engine.run(X, y)
                 print("\n===== MODEL RESULT =====")
-                print(json.dumps(result, indent=2))
+                print(json.dumps(result, indent=2, default=json_default))
             except Exception as e:
                 print("[ERROR] Model building error:", e)
 
@@ -212,7 +213,7 @@ def main():
             try:
                 result = evaluator.run(y_true, y_pred)
                 print("\n===== EVALUATION RESULT =====")
-                print(json.dumps(result, indent=2))
+                print(json.dumps(result, indent=2, default=json_default))
             except Exception as e:
                 print("[ERROR] Evaluation error:", e)
 
@@ -224,7 +225,7 @@ def main():
             try:
                 result = bigdata_engine.run(path)
                 print("\n===== BIGDATA RESULT =====")
-                print(json.dumps(result, indent=2))
+                print(json.dumps(result, indent=2, default=json_default))
             except Exception as e:
                 print("[ERROR] BigData processing error:", e)
 
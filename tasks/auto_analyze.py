@@ -2,6 +2,9 @@
 
 from core.sifra_core import SifraCore
 from data.preprocessor import Preprocessor
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
 
 class AutoAnalyze:
     """
@@ -11,10 +14,10 @@ class AutoAnalyze:
     def __init__(self):
         self.core = SifraCore()
         self.preprocessor = Preprocessor()
-        print("[TASK] Auto Analyze Module Ready")
+        logger.debug("Auto analyze module ready")
 
     def run(self, dataset):
-        print("\n[AUTO ANALYZE] Running Autonomous Analysis...")
+        logger.debug("Running autonomous analysis")
 
         # Clean dataset first
         clean_data = self.preprocessor.clean(dataset)
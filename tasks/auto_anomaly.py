@@ -3,6 +3,9 @@
 import numpy as np
 from core.sifra_core import SifraCore
 from data.preprocessor import Preprocessor
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
 
 class AutoAnomaly:
     """
@@ -12,10 +15,10 @@ class AutoAnomaly:
     def __init__(self):
         self.core = SifraCore()
         self.preprocessor = Preprocessor()
-        print("[TASK] Auto Anomaly Detector Ready")
+        logger.debug("Auto anomaly detector ready")
 
     def run(self, dataset):
-        print("\n[AUTO ANOMALY] Detecting anomalies...")
+        logger.debug("Detecting anomalies")
 
         clean_data = self.preprocessor.clean(dataset)
 
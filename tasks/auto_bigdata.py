@@ -4,6 +4,10 @@ import numpy as np
 import pandas as pd
 import os
 
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
 class AutoBigData:
     """
     Lightweight Big Data Engine for SIFRA AI.
@@ -11,7 +15,7 @@ class AutoBigData:
     """
 
     def __init__(self):
-        print("[TASK] Auto BigData Engine Ready")
+        logger.debug("Auto BigData engine ready")
 
     # ------------------------------------------------------------
     # 0️⃣ Clean file path (Fix for Windows quotes "D:\file.csv")
@@ -24,27 +28,44 @@ class AutoBigData:
     # ------------------------------------------------------------
     # 1️⃣ Stream a large CSV file safely (chunk by chunk)
     # ------------------------------------------------------------
-    def stream_csv(self, file_path, chunk_size=50000):
+    def stream_csv(self, file_path, chunk_size=50000, progress=None, columns=None):
         """
         Reads large CSV files in chunks to avoid memory overflow.
+        progress(fraction) is called after each chunk with the share
+        of the file consumed so far (by bytes read).
+        columns limits parsing to those columns.
+        A file that stops parsing part-way raises ValueError with the
+        number of rows read, so no caller reports a truncated result.
         """
         file_path = self.clean_path(file_path)
 
         if not os.path.exists(file_path):
-            print(f"[BIGDATA ERROR] File not found: {file_path}")
+            logger.error("File not found: %s", file_path)
             return
 
-        try:
-            for chunk in pd.read_csv(file_path, chunksize=chunk_size, low_memory=False):
+        total_bytes = os.path.getsize(file_path) or 1
+        rows = 0
+
+        with open(file_path, "rb") as fh:
+            reader = pd.read_csv(fh, chunksize=chunk_size, low_memory=False, usecols=columns)
+            while True:
+                try:
+                    chunk = next(reader)
+                except StopIteration:
+                    return
+                except Exception as e:
+                    logger.error("CSV streaming failed after %d rows: %s", rows, e)
+                    raise ValueError(f"CSV parse error after row {rows}: {e}") from e
+
+                rows += len(chunk)
                 yield chunk
-        except Exception as e:
-            print(f"[BIGDATA ERROR] {str(e)}")
-            return
+                if progress is not None:
+                    progress(min(1.0, fh.tell() / total_bytes))
 
     # ------------------------------------------------------------
     # 2️⃣ Incremental statistics for massive files
     # ------------------------------------------------------------
-    def incremental_stats(self, file_path, chunk_size=50000):
+    def incremental_stats(self, file_path, chunk_size=50000, progress=None):
         """
         Calculate mean, min, max, and count using incremental computation.
         """
@@ -55,7 +76,7 @@ class AutoBigData:
         total_max = None
         total_count = 0
 
-        for chunk in self.stream_csv(file_path, chunk_size=chunk_size):
+        for chunk in self.stream_csv(file_path, chunk_size=chunk_size, progress=progress):
             if chunk is None:
                 continue
             
@@ -98,7 +119,7 @@ class AutoBigData:
     # ------------------------------------------------------------
     # 3️⃣ Detect anomalies in massive files
     # ------------------------------------------------------------
-    def big_anomaly(self, file_path, chunk_size=50000, std_threshold=3):
+    def big_anomaly(self, file_path, chunk_size=50000, std_threshold=3, progress=None):
         """
         Detect anomalies on huge datasets without loading all data in memory.
         """
@@ -106,7 +127,7 @@ class AutoBigData:
 
         anomalies_found = 0
 
-        for chunk in self.stream_csv(file_path, chunk_size):
+        for chunk in self.stream_csv(file_path, chunk_size, progress=progress):
             if chunk is None:
                 continue
 
@@ -134,17 +155,68 @@ class AutoBigData:
         }
 
     # ------------------------------------------------------------
-    # 4️⃣ Combined Big Data Summary Workflow
+    # 4️⃣ Profile a file in one chunked pass (rows, schema, preview)
+    # ------------------------------------------------------------
+    def profile_csv(self, file_path, chunk_size=50000, preview_rows=5):
+        """
+        Row count, column dtypes and a small preview without
+        holding more than one chunk in memory.
+        """
+        file_path = self.clean_path(file_path)
+
+        rows = 0
+        dtypes = None
+        preview = None
+
+        try:
+            for chunk in self.stream_csv(file_path, chunk_size=chunk_size):
+                rows += len(chunk)
+
+                if preview is None:
+                    preview = chunk.head(preview_rows)
+
+                chunk_types = chunk.dtypes
+                if dtypes is None:
+                    dtypes = chunk_types.to_dict()
+                else:
+                    for col, dtype in chunk_types.items():
+                        if dtypes.get(col) != dtype:
+                            dtypes[col] = np.result_type(dtypes[col], dtype) \
+                                if dtypes[col].kind in "biuf" and dtype.kind in "biuf" else np.dtype(object)
+        except ValueError as e:
+            return {"error": str(e), "rows_read": int(rows)}
+
+        if dtypes is None:
+            return {"error": "File could not be read as CSV"}
+
+        return {
+            "rows": int(rows),
+            "columns": list(dtypes.keys()),
+            "dtypes": {col: str(dtype) for col, dtype in dtypes.items()},
+            "preview": preview.to_dict(orient="records")
+        }
+
+    # ------------------------------------------------------------
+    # 5️⃣ Combined Big Data Summary Workflow
     # ------------------------------------------------------------
-    def run(self, file_path):
+    def run(self, file_path, progress=None):
         """
         Entry point for Big Data module.
+        progress(fraction) spans both passes (stats, then anomalies).
         """
         file_path = self.clean_path(file_path)
-        print(f"[BIGDATA] Processing huge dataset: {file_path}")
+        logger.info("Processing huge dataset: %s", file_path)
 
-        stats = self.incremental_stats(file_path)
-        anomalies = self.big_anomaly(file_path)
+        stats_progress = anomaly_progress = None
+        if progress is not None:
+            stats_progress = lambda f: progress(0.5 * f)
+            anomaly_progress = lambda f: progress(0.5 + 0.5 * f)
+
+        try:
+            stats = self.incremental_stats(file_path, progress=stats_progress)
+            anomalies = self.big_anomaly(file_path, progress=anomaly_progress)
+        except ValueError as e:
+            return {"error": str(e)}
 
         return {
             "statistics": stats,
@@ -3,6 +3,11 @@
 import numpy as np
 import pandas as pd
 
+from tasks import column_profile
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
 class AutoEDA:
     """
     Automated Exploratory Data Analysis Engine for SIFRA AI.
@@ -10,7 +15,7 @@ class AutoEDA:
     """
 
     def __init__(self):
-        print("[TASK] Auto EDA Engine Ready")
+        logger.debug("Auto EDA engine ready")
 
     # -----------------------------------------
     # Detect outliers using IQR
@@ -36,47 +41,52 @@ class AutoEDA:
     def run(self, dataset):
         """
         Accepts Python list or NumPy array and performs full EDA.
+        Statistics come from the shared column profile
+        (tasks/column_profile.py), computed once for all columns.
         """
 
         df = pd.DataFrame(dataset)
+        profile = column_profile.profile(df)
+        columns = profile["columns"]
 
         results = {}
         summary = {}
 
-        # Convert all columns to numeric when possible
-        for col in df.columns:
-            df[col] = pd.to_numeric(df[col], errors="coerce")
-
-        # Basic info
+        # Basic info (every column is read as numeric when possible)
         summary["shape"] = df.shape
         summary["columns"] = df.columns.tolist()
-        summary["missing_values"] = df.isna().sum().to_dict()
-        summary["missing_ratio"] = (df.isna().mean()).round(4).to_dict()
+        summary["missing_values"] = {col: int(n) for col, n in zip(columns, profile["missing"])}
+        summary["missing_ratio"] = {
+            col: round(float(n) / len(df), 4) if len(df) else np.nan
+            for col, n in zip(columns, profile["missing"])
+        }
 
         # Stats for each column
         numeric_stats = {}
-        for col in df.columns:
-            series = df[col].dropna()
-
-            if series.empty:
+        for j, col in enumerate(columns):
+            if profile["count"][j] == 0:
                 continue
 
+            positions, values = profile["outliers"].get(col, ((), ()))
             numeric_stats[col] = {
-                "mean": float(series.mean()),
-                "std": float(series.std()),
-                "min": float(series.min()),
-                "max": float(series.max()),
-                "median": float(series.median()),
-                "skewness": float(series.skew()),
-                "kurtosis": float(series.kurtosis()),
-                "outliers": self.detect_outliers(series.values)
+                "mean": float(profile["mean"][j]),
+                "std": float(profile["std"][j]),
+                "min": float(profile["min"][j]),
+                "max": float(profile["max"][j]),
+                "median": float(profile["median"][j]),
+                "skewness": float(profile["skewness"][j]),
+                "kurtosis": float(profile["kurtosis"][j]),
+                "outliers": [{"index": int(i), "value": float(v)} for i, v in zip(positions, values)]
             }
 
         summary["column_statistics"] = numeric_stats
 
         # Correlation matrix (if >1 column)
         if df.shape[1] > 1:
-            summary["correlation_matrix"] = df.corr().round(4).fillna(0).to_dict()
+            corr = np.nan_to_num(np.round(profile["correlation"], 4))
+            summary["correlation_matrix"] = {
+                col: dict(zip(columns, corr[:, j].tolist())) for j, col in enumerate(columns)
+            }
         else:
             summary["correlation_matrix"] = "Not enough columns for correlation"
 
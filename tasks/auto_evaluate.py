@@ -1,16 +1,14 @@
 # tasks/auto_evaluate.py
 
 import numpy as np
-from sklearn.metrics import (
-    r2_score,
-    mean_squared_error,
-    mean_absolute_error,
-    accuracy_score,
-    f1_score,
-    precision_score,
-    recall_score,
-    silhouette_score
-)
+
+from tasks import evaluation_metrics
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# y_true with at most this many distinct values is scored as classification
+CLASSIFICATION_MAX_LABELS = 5
 
 class AutoEvaluate:
     """
@@ -19,7 +17,7 @@ class AutoEvaluate:
     """
 
     def __init__(self):
-        print("[TASK] Auto Evaluation Engine Ready")
+        logger.debug("Auto evaluation engine ready")
 
     # --------------------------------------------------------------
     # Detect task type based on y_true
@@ -29,7 +27,7 @@ class AutoEvaluate:
         unique_vals = len(np.unique(y_true))
 
         # Classification if few unique categories
-        if unique_vals <= 5:
+        if unique_vals <= CLASSIFICATION_MAX_LABELS:
             return "classification"
 
         # Regression if numeric continuous
@@ -42,76 +40,135 @@ class AutoEvaluate:
     # --------------------------------------------------------------
     # Main evaluation
     # --------------------------------------------------------------
-    def run(self, y_true, y_pred):
+    def run(self, y_true, y_pred, segments=None, task_type=None):
         """
         y_true: list / array of actual values
         y_pred: list / array of predicted values OR cluster labels
+        segments: optional group key per sample → per-segment metrics
+        task_type: overrides detect_type()
         """
 
         y_true = np.array(y_true)
         y_pred = np.array(y_pred)
 
-        task_type = self.detect_type(y_true)
-
-        # -----------------------------
-        # 1️⃣ REGRESSION EVALUATION
-        # -----------------------------
-        if task_type == "regression":
-            try:
-                return {
-                    "status": "success",
-                    "task_type": "regression",
-                    "r2_score": float(r2_score(y_true, y_pred)),
-                    "mse": float(mean_squared_error(y_true, y_pred)),
-                    "mae": float(mean_absolute_error(y_true, y_pred)),
-                }
-            except Exception as e:
-                return {"error": f"Regression evaluation failed: {str(e)}"}
+        task_type = task_type or self.detect_type(y_true)
 
         # -----------------------------
-        # 2️⃣ CLASSIFICATION EVALUATION
+        # 1️⃣ REGRESSION / 2️⃣ CLASSIFICATION
+        # One confusion matrix / residual-moment pass (tasks/evaluation_metrics.py)
         # -----------------------------
-        elif task_type == "classification":
+        if task_type in evaluation_metrics.ACCUMULATORS:
             try:
-                # Prevent undefined precision/recall warnings
-                precision = precision_score(
-                    y_true, y_pred, average="weighted", zero_division=0
-                )
-                recall = recall_score(
-                    y_true, y_pred, average="weighted", zero_division=0
-                )
-                f1 = f1_score(
-                    y_true, y_pred, average="weighted", zero_division=0
-                )
-
-                return {
-                    "status": "success",
-                    "task_type": "classification",
-                    "accuracy": float(accuracy_score(y_true, y_pred)),
-                    "precision": float(precision),
-                    "recall": float(recall),
-                    "f1_score": float(f1),
-                }
+                return evaluation_metrics.accumulator(task_type).update(y_true, y_pred, segments).result()
             except Exception as e:
-                return {"error": f"Classification evaluation failed: {str(e)}"}
+                return {"error": f"{task_type.capitalize()} evaluation failed: {str(e)}"}
 
         # -----------------------------
         # 3️⃣ CLUSTERING EVALUATION
         # -----------------------------
-        else:
+        elif task_type == "clustering":
+            from tasks.silhouette import silhouette
+
             try:
                 # Clustering silhouette requires X and labels
                 # Here y_true acts as "features" only when clustering
-                score = silhouette_score(y_true.reshape(-1, 1), y_pred)
+                score = silhouette(y_true, y_pred)
                 return {
                     "status": "success",
                     "task_type": "clustering",
-                    "silhouette_score": float(score),
+                    "silhouette_score": score["score"],
+                    "silhouette_method": score["method"],
+                    "silhouette_interval": [score["lower"], score["upper"]],
                 }
             except Exception:
                 return {
                     "status": "partial",
                     "task_type": "clustering",
                     "message": "Silhouette score not computable — returning labels.",
-                    "labels": y_pred.tolist(),
+                    "labels": y_pred,
                 }
+
+        return {"error": f"Unknown task type: {task_type}"}
+
+    # --------------------------------------------------------------
+    # Streaming evaluation
+    # --------------------------------------------------------------
+    def evaluate_chunks(self, chunks, task_type=None):
+        """
+        chunks: iterable of (y_true, y_pred) or (y_true, y_pred, segments).
+        Only the accumulator state is kept between chunks.
+
+        Without task_type, the type is detect_type() over all of y_true,
+        not just the first chunk: while y_true has shown at most
+        CLASSIFICATION_MAX_LABELS distinct values, both a classification
+        and a regression accumulator are fed, and the one the data rules
+        out is dropped (more labels → regression, non-numeric → not
+        regression).
+        """
+        if task_type is not None and task_type not in evaluation_metrics.ACCUMULATORS:
+            return {"error": f"{task_type.capitalize()} evaluation needs all samples at once; use run()"}
+
+        candidates = None
+        labels = set()
+        for chunk in chunks:
+            y_true, y_pred = np.asarray(chunk[0]), chunk[1]
+            segments = chunk[2] if len(chunk) > 2 else None
+
+            if candidates is None:
+                names = [task_type] if task_type else list(evaluation_metrics.ACCUMULATORS)
+                candidates = {name: evaluation_metrics.accumulator(name) for name in names}
+
+            if not task_type and "classification" in candidates:
+                try:
+                    labels.update(np.unique(y_true).tolist())
+                except TypeError:   # mixed label types
+                    labels.update(np.unique(y_true.astype(str)).tolist())
+                if not np.issubdtype(y_true.dtype, np.number):
+                    candidates.pop("regression", None)
+                if len(labels) > CLASSIFICATION_MAX_LABELS:
+                    if "regression" not in candidates:
+                        return {"error": "Clustering evaluation needs all samples at once; use run()"}
+                    candidates.pop("classification")
+            elif not task_type and not np.issubdtype(y_true.dtype, np.number):
+                # Regression picked (many numeric labels): non-numeric now → clustering
+                return {"error": "Clustering evaluation needs all samples at once; use run()"}
+
+            for acc in candidates.values():
+                acc.update(y_true, y_pred, segments)
+
+        if candidates is None:
+            return {"error": "No samples to evaluate"}
+        # Still undecided: few labels throughout → classification (as detect_type)
+        return candidates.get("classification", next(iter(candidates.values()))).result()
+
+    def evaluate_file(self, file_path, true_column, pred_column, segment_column=None,
+                      task_type=None, chunk_size=50000, progress=None):
+        """
+        Evaluates prediction columns of a CSV file of any size, one chunk
+        at a time. Rows missing y_true or y_pred are skipped.
+        """
+        from tasks.auto_bigdata import AutoBigData
+
+        columns = [true_column, pred_column] + ([segment_column] if segment_column else [])
+        rows = {"read": 0}
+
+        def chunks():
+            for chunk in AutoBigData().stream_csv(file_path, chunk_size, progress=progress, columns=columns):
+                rows["read"] += len(chunk)
+                chunk = chunk.dropna(subset=[true_column, pred_column])
+                yield (
+                    chunk[true_column].to_numpy(),
+                    chunk[pred_column].to_numpy(),
+                    chunk[segment_column].astype(str).to_numpy() if segment_column else None,
+                )
+
+        try:
+            result = self.evaluate_chunks(chunks(), task_type)
+        except Exception as e:
+            return {"error": f"File evaluation failed: {str(e)}"}
+
+        if "error" not in result:
+            result["rows_read"] = rows["read"]
+        elif not rows["read"]:
+            result = {"error": f"No rows read (columns: {', '.join(columns)})"}
+        return result
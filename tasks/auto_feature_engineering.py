@@ -1,8 +1,16 @@
 # tasks/auto_feature_engineering.py
 
+from collections import OrderedDict
+
 import numpy as np
 import pandas as pd
-from sklearn.preprocessing import MinMaxScaler, PolynomialFeatures
+
+from config.settings import Settings
+from data.feature_pipeline import FeaturePipeline, schema_hash, spec_hash
+from data.type_inference import TypeInferencer
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
 
 
 class AutoFeatureEngineering:
@@ -11,8 +19,12 @@ class AutoFeatureEngineering:
     Enhances dataset structure for better ML performance.
     """
 
+    DATE_PARTS = ("year", "month", "day", "weekday")
+    LOGICAL_TYPES = ("numeric", "datetime", "categorical")
+
     def __init__(self):
-        print("[TASK] Auto Feature Engineering Engine Ready")
+        self.inferencer = TypeInferencer()
+        logger.debug("Auto feature engineering engine ready")
 
     # ------------------------------------------------------------
     # Detect dtype
@@ -26,97 +38,251 @@ class AutoFeatureEngineering:
             return "categorical"
 
     # ------------------------------------------------------------
-    # Extract polynomial features
+    # Type inference (sample-based, shared with Preprocessor)
     # ------------------------------------------------------------
-    def generate_polynomials(self, df):
-        numeric_df = df.select_dtypes(include=[np.number])
+    def infer_types(self, df):
+        """
+        Returns (converted df, {column: {"type", "format"}}).
+        """
+        return self.inferencer.infer_frame(df)
 
-        if numeric_df.shape[1] < 1:
-            return df  # nothing to expand
+    def declared_types(self, df, types):
+        """
+        Validates caller-declared {column: logical type} overrides.
+        """
+        if types is not None and not isinstance(types, dict):
+            raise ValueError("'types' must be an object of {column: type}")
+        types = dict(types or {})
+        for col, kind in types.items():
+            if col not in df.columns:
+                raise ValueError(f"Unknown column in 'types': {col}")
+            if kind not in self.LOGICAL_TYPES:
+                raise ValueError(f"'types' values must be one of: {', '.join(self.LOGICAL_TYPES)}")
+        return types
 
-        poly = PolynomialFeatures(degree=2, include_bias=False)
-        poly_features = poly.fit_transform(numeric_df)
+    def logical_types(self, raw, types=None):
+        """
+        Returns (converted df, inferred formats, {column: logical type}),
+        declared types overriding the inferred ones.
+        """
+        declared = self.declared_types(raw, types)
 
-        poly_df = pd.DataFrame(
-            poly_features,
-            columns=poly.get_feature_names_out(numeric_df.columns)
-        )
+        # infer_frame converts in place; overrides below read the raw input
+        df, inferred = self.infer_types(raw.copy())
+        col_types = {col: self.detect_type(df[col]) for col in df.columns}
 
-        poly_df = poly_df.reset_index(drop=True)
-        df = df.reset_index(drop=True)
+        for col, kind in declared.items():
+            if kind == "numeric":
+                df[col] = pd.to_numeric(raw[col], errors="coerce")
+            elif kind == "datetime":
+                df[col] = pd.to_datetime(raw[col], format=inferred[col]["format"], errors="coerce")
+            else:
+                df[col] = raw[col]
+            col_types[col] = kind
 
-        return pd.concat([df, poly_df], axis=1)
+        return df, inferred, col_types
 
     # ------------------------------------------------------------
-    # Extract date features
+    # FIT — learn a compiled FeaturePipeline
     # ------------------------------------------------------------
-    def extract_date_features(self, df):
+    def fit_transform(self, dataset, types=None):
+        """
+        Learns types, vocabularies, scaler min/max and the surviving
+        output features, then returns (pipeline, transformed matrix).
+        types: optional {column: "numeric" | "datetime" | "categorical"}
+        overriding the inferred logical types.
+        """
+        raw = self._to_frame(dataset)
+        df, inferred, col_types = self.logical_types(raw, types)
+
+        # Keyed on names + logical types, not batch dtypes
+        pipeline_id = schema_hash(df.columns, col_types)
+
+        # Fill NaNs properly (no warnings)
+        df = df.ffill().bfill()
+
+        numeric_cols = [c for c, t in col_types.items() if t == "numeric"]
+        date_cols = [c for c, t in col_types.items() if t == "datetime"]
+        cat_cols = [c for c, t in col_types.items() if t == "categorical"]
+
+        # Numeric sources = raw numeric columns + extracted date parts
+        numeric_sources = [{"column": c, "part": None, "name": c} for c in numeric_cols]
+        for col in date_cols:
+            for part in self.DATE_PARTS:
+                numeric_sources.append({"column": col, "part": part, "name": f"{col}_{part}"})
+
+        # Scaler statistics (NaN-aware, like MinMaxScaler)
+        mins, maxs = [], []
+        for source in numeric_sources:
+            values = df[source["column"]]
+            if source["part"] is not None:
+                values = getattr(values.dt, source["part"])
+            values = values.to_numpy(dtype=float, na_value=np.nan)
+            finite = values[~np.isnan(values)]
+            mins.append(float(finite.min()) if finite.size else 0.0)
+            maxs.append(float(finite.max()) if finite.size else 0.0)
+
+        # Category vocabularies (sorted, like get_dummies)
+        categories = {}
+        for col in cat_cols:
+            values = pd.unique(df[col].dropna().astype(str))
+            categories[col] = sorted(values.tolist())
+
+        # Output layout mirrors: base columns → date parts → dummies → polynomials
+        source_index = {s["name"]: i for i, s in enumerate(numeric_sources)}
+        features = []
         for col in df.columns:
-            if pd.api.types.is_datetime64_any_dtype(df[col]):
-                df[f"{col}_year"] = df[col].dt.year
-                df[f"{col}_month"] = df[col].dt.month
-                df[f"{col}_day"] = df[col].dt.day
-                df[f"{col}_weekday"] = df[col].dt.weekday
+            if col_types[col] == "numeric":
+                features.append({"kind": "scaled", "index": source_index[col], "name": col})
+            elif col_types[col] == "datetime":
+                features.append({"kind": "epoch", "column": col, "name": col})
+
+        for source in numeric_sources[len(numeric_cols):]:
+            features.append({"kind": "scaled", "index": source_index[source["name"]], "name": source["name"]})
+
+        for col in cat_cols:
+            for value in categories[col]:
+                features.append({"kind": "dummy", "column": col, "value": value, "name": f"{col}_{value}"})
+
+        # Degree-2 polynomial expansion of the scaled numeric block
+        names = [s["name"] for s in numeric_sources]
+        for i, name in enumerate(names):
+            features.append({"kind": "scaled", "index": i, "name": name})
+        for i in range(len(names)):
+            for j in range(i, len(names)):
+                label = f"{names[i]}^2" if i == j else f"{names[i]} {names[j]}"
+                features.append({"kind": "poly", "terms": [i, j], "name": label})
+
+        spec = {
+            "version": FeaturePipeline.VERSION,
+            "pipeline_id": pipeline_id,
+            "columns": [
+                {"name": col, "type": col_types[col], "format": inferred[col]["format"]}
+                for col in df.columns
+            ],
+            "numeric_sources": numeric_sources,
+            "categories": categories,
+            "scaler": {"min": mins, "max": maxs},
+            "features": features,
+        }
+
+        data = FeaturePipeline(spec).transform(df)
+
+        # Remove constant columns — decided once, at fit time
+        keep = data.max(axis=0) > data.min(axis=0) if len(data) else np.zeros(data.shape[1], dtype=bool)
+        spec["features"] = [f for f, k in zip(features, keep) if k]
+
+        # Positional frames are never matched by schema: each fit gets
+        # its own id, so reusing it explicitly gets this exact fit
+        if self._positional(df.columns):
+            spec["pipeline_id"] = spec_hash(spec)
+
+        pipeline = FeaturePipeline(spec)
+        _cache_pipeline(pipeline)
+
+        return pipeline, data[:, keep]
+
+    def fit(self, dataset, types=None):
+        """
+        Fits and returns a FeaturePipeline (cached by schema hash).
+        """
+        pipeline, _ = self.fit_transform(dataset, types)
+        return pipeline
+
+    # ------------------------------------------------------------
+    # Cached pipeline lookup
+    # ------------------------------------------------------------
+    def get_pipeline(self, pipeline_id):
+        pipeline = _PIPELINE_CACHE.get(pipeline_id)
+        if pipeline is not None:
+            _PIPELINE_CACHE.move_to_end(pipeline_id)
+        return pipeline
+
+    def find_pipeline(self, df, types=None):
+        """
+        Cached pipeline for the same column names and logical types
+        (declared, else inferred). Frames with positional names ("0",
+        "1", ...) are never matched — unrelated data would get another
+        fit's scaling; reuse those pipelines by id instead.
+        """
+        if self._positional(df.columns):
+            return None
+        _, _, col_types = self.logical_types(df, types)
+        return self.get_pipeline(schema_hash(df.columns, col_types))
+
+    @staticmethod
+    def _positional(columns):
+        return all(col == str(i) for i, col in enumerate(columns))
+
+    def _to_frame(self, dataset):
+        df = dataset.copy() if isinstance(dataset, pd.DataFrame) else pd.DataFrame(dataset)
+
+        # 🎯 FIX: Convert all column names to strings
+        df.columns = df.columns.astype(str)
         return df
 
     # ------------------------------------------------------------
     # MAIN ENGINE
     # ------------------------------------------------------------
-    def run(self, dataset):
+    def run(self, dataset, refit=False, pipeline=None, types=None):
         """
         Accepts list/array → returns enhanced dataset + metadata.
+        Reuses the compiled pipeline for this schema unless refit=True,
+        or applies an explicitly supplied pipeline (cached id or
+        serialized spec).
         """
 
-        # Convert dataset to DataFrame
-        df = pd.DataFrame(dataset)
+        df = self._to_frame(dataset)
 
-        # 🎯 FIX: Convert all column names to strings
-        df.columns = df.columns.astype(str)
+        if isinstance(pipeline, str):
+            pipeline_id, pipeline = pipeline, self.get_pipeline(pipeline)
+            if pipeline is None:
+                raise ValueError(f"Unknown feature pipeline: {pipeline_id}")
+        elif pipeline is not None and not isinstance(pipeline, FeaturePipeline):
+            pipeline = FeaturePipeline.from_dict(pipeline)
 
-        # Try numeric or datetime conversion
-        for col in df.columns:
-            # Attempt numeric conversion
-            df[col] = pd.to_numeric(df[col], errors="ignore")
+        if pipeline is None and not refit:
+            pipeline = self.find_pipeline(df, types)
 
-            # Attempt datetime conversion
-            if df[col].dtype == object:
-                try:
-                    df[col] = pd.to_datetime(df[col], errors="raise")
-                except:
-                    pass
+        if pipeline is None:
+            pipeline, data = self.fit_transform(df, types)
+        else:
+            data = pipeline.transform(df)
 
-        # Detect types
-        col_types = {col: self.detect_type(df[col]) for col in df.columns}
+        # Final safe output
+        return {
+            "status": "success",
+            "pipeline_id": pipeline.pipeline_id,
+            "original_columns": [c["name"] for c in pipeline.columns],
+            "column_types": {c["name"]: c["type"] for c in pipeline.columns},
+            "feature_names": pipeline.feature_names,
+            "final_shape": data.shape,
+            "transformed_data": data
+        }
 
-        # Fill NaNs properly (no warnings)
-        df = df.ffill().bfill()
 
-        # Extract date-based features
-        df = self.extract_date_features(df)
+# ------------------------------------------------------------
+# Process-wide pipeline cache (keyed by schema hash)
+# ------------------------------------------------------------
+_PIPELINE_CACHE = OrderedDict()
 
-        # One-hot encode categorical safely
-        df = pd.get_dummies(df, drop_first=False)
 
-        # Scale numeric values
-        numeric_cols = df.select_dtypes(include=[np.number]).columns
-        if len(numeric_cols) > 0:
-            scaler = MinMaxScaler()
-            df[numeric_cols] = scaler.fit_transform(df[numeric_cols])
+def _cache_pipeline(pipeline):
+    _PIPELINE_CACHE[pipeline.pipeline_id] = pipeline
+    _PIPELINE_CACHE.move_to_end(pipeline.pipeline_id)
+    while len(_PIPELINE_CACHE) > Settings.FEATURE_PIPELINE_CACHE_SIZE:
+        _PIPELINE_CACHE.popitem(last=False)
 
-        # Add polynomial features
-        df = self.generate_polynomials(df)
 
-        # Remove constant columns
-        df = df.loc[:, df.apply(pd.Series.nunique) > 1]
+# Startup snapshot hooks (api/snapshot.py)
+def snapshot_state():
+    return [pipeline.to_dict() for pipeline in _PIPELINE_CACHE.values()]
 
-        # Final safe output
-        return {
-            "status": "success",
-            "original_columns": list(col_types.keys()),
-            "column_types": col_types,
-            "final_shape": df.shape,
-            "transformed_data": df.fillna(0).values.tolist()
-        }
+
+def restore_state(specs):
+    for spec in specs:
+        if spec["pipeline_id"] not in _PIPELINE_CACHE:
+            _cache_pipeline(FeaturePipeline.from_dict(spec))
 # -----------------------------------------------------------
 # END OF FILE
 # -----------------------------------------------------------
\ No newline at end of file
@@ -2,42 +2,84 @@
 
 from core.sifra_core import SifraCore
 from data.preprocessor import Preprocessor
+from tasks import forecast_models
+from tasks.forecast_state import forecast_state
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
 
 class AutoForecast:
     """
-    Forecasts multiple future points using trend continuation.
+    Forecasts every numeric column (one series per column, rows = time).
+    Each series gets the model with the lowest backtest error among
+    naive, linear trend, exponential smoothing (SES / Holt), and —
+    when a season is given or detected — seasonal naive and
+    Holt-Winters. All series are fitted together (tasks/forecast_models.py).
     """
 
     def __init__(self):
         self.core = SifraCore()
         self.preprocessor = Preprocessor()
-        print("[TASK] Auto Forecast Module Ready")
+        logger.debug("Auto forecast module ready")
 
-    def run(self, dataset, steps=5):
-        print("\n[AUTO FORECAST] Running Forecast...")
+    def run(self, dataset, steps=5, season=None, level=0.95):
+        logger.debug("Running forecast")
 
         clean_data = self.preprocessor.clean(dataset)
 
-        # Brain pipeline
-        result = self.core.run("forecast", clean_data)
-
+        # Brain pipeline: only the trend channel is read (cached per dataset)
+        result = self.core.run("forecast", clean_data, stages=("trend",))
         trend = result["analysis_result"]["trend_score"]
-        last_value = clean_data.mean(axis=1).mean()
 
-        future = []
-        curr = last_value
+        if clean_data.size == 0:
+            return {
+                "task": "auto_forecast",
+                "intent": result["intent_vector"],
+                "trend": trend,
+                "forecast_steps": steps,
+                "forecast_values": [],
+                "series": None,
+            }
 
-        for i in range(steps):
-            curr += trend
-            future.append(curr)
+        period = season or forecast_models.detect_period(clean_data)
+        fc = forecast_models.forecast(clean_data, steps, period, level)
+        logger.debug("Forecast %d series (season %s)", clean_data.shape[1], period)
 
         return {
             "task": "auto_forecast",
             "intent": result["intent_vector"],
             "trend": trend,
             "forecast_steps": steps,
-            "forecast_values": future
+            # mean of the per-series forecasts
+            "forecast_values": fc["forecast"].mean(axis=0).tolist(),
+            "series": {
+                "columns": self.preprocessor.column_names(dataset, clean_data.shape[1]),
+                "model": fc["models"],
+                "forecast": fc["forecast"],
+                "lower": fc["lower"],
+                "upper": fc["upper"],
+                "backtest_mae": fc["backtest_mae"],
+                "season": fc["period"],
+                "interval_level": fc["level"],
+            },
         }
+
+    # ------------------------------------------------------
+    #  LIVE FEEDS (per-series state, tasks/forecast_state.py)
+    # ------------------------------------------------------
+    def update_series(self, observations, steps=5, season=None, level=0.95):
+        """
+        observations: {series_id: [new values...]}. Known series are
+        updated from their state in O(new points); unknown series are
+        fitted from the given points. Returns forecasts for all of them.
+        """
+        return forecast_state.update(observations, steps, season, level)
+
+    def forecast_series(self, series_id, steps=5, level=0.95):
+        result = forecast_state.describe(series_id)
+        result.update(forecast_state.forecast([series_id], steps, level)[series_id])
+        return result
+
 if __name__ == "__main__":
     auto_forecast = AutoForecast()
     sample_data = {
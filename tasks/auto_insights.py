@@ -3,6 +3,9 @@
 import numpy as np
 from core.sifra_core import SifraCore
 from data.preprocessor import Preprocessor
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
 
 class AutoInsights:
     """
@@ -12,10 +15,10 @@ class AutoInsights:
     def __init__(self):
         self.core = SifraCore()
         self.preprocessor = Preprocessor()
-        print("[TASK] Auto Insights Module Ready")
+        logger.debug("Auto insights module ready")
 
     def run(self, dataset):
-        print("\n[AUTO INSIGHTS] Extracting insights...")
+        logger.debug("Extracting insights")
 
         clean_data = self.preprocessor.clean(dataset)
 
@@ -1,18 +1,13 @@
 # tasks/auto_modeler.py
 
 import numpy as np
-import pandas as pd
 
-from sklearn.model_selection import train_test_split
-from sklearn.linear_model import LinearRegression, LogisticRegression
-from sklearn.ensemble import RandomForestRegressor, RandomForestClassifier
-from sklearn.cluster import KMeans
-from sklearn.metrics import (
-    r2_score,
-    mean_squared_error,
-    accuracy_score,
-    silhouette_score
-)
+# sklearn (and pandas) are imported inside the branches that use them,
+# so importing this module stays cheap on cold starts.
+
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
 
 
 class AutoModeler:
@@ -25,7 +20,7 @@ class AutoModeler:
     """
 
     def __init__(self):
-        print("[TASK] Auto Modeler Engine Ready")
+        logger.debug("Auto modeler engine ready")
 
     # --------------------------------------------------------------
     # Detect problem type automatically
@@ -64,6 +59,8 @@ class AutoModeler:
 
         # Case 2: run(dataset)
         elif len(args) == 1:
+            import pandas as pd
+
             dataset = args[0]
             df = pd.DataFrame(dataset)
 
@@ -80,7 +77,10 @@ class AutoModeler:
     # --------------------------------------------------------------
     # MAIN TRAINING ENGINE
     # --------------------------------------------------------------
-    def run(self, *args):
+    def run(self, *args, progress=None):
+        """
+        progress(fraction) is called after each candidate model is fitted.
+        """
         try:
             X, y = self.parse_input(*args)
         except Exception as e:
@@ -92,6 +92,11 @@ class AutoModeler:
         # 1️⃣ REGRESSION
         # ---------------------------
         if task == "regression":
+            from sklearn.model_selection import train_test_split
+            from sklearn.linear_model import LinearRegression
+            from sklearn.ensemble import RandomForestRegressor
+            from sklearn.metrics import r2_score
+
             try:
                 X_train, X_test, y_train, y_test = train_test_split(
                     X, y, test_size=0.25, random_state=42
@@ -106,8 +111,10 @@ class AutoModeler:
                 best_score = -999
                 results = {}
 
-                for name, model in models.items():
+                for i, (name, model) in enumerate(models.items(), start=1):
                     model.fit(X_train, y_train)
+                    if progress is not None:
+                        progress(i / len(models))
                     preds = model.predict(X_test)
                     score = r2_score(y_test, preds)
                     results[name] = float(score)
@@ -131,6 +138,11 @@ class AutoModeler:
         # 2️⃣ CLASSIFICATION
         # ---------------------------
         elif task == "classification":
+            from sklearn.model_selection import train_test_split
+            from sklearn.linear_model import LogisticRegression
+            from sklearn.ensemble import RandomForestClassifier
+            from sklearn.metrics import accuracy_score
+
             try:
                 X_train, X_test, y_train, y_test = train_test_split(
                     X, y, test_size=0.25, random_state=42
@@ -145,8 +157,10 @@ class AutoModeler:
                 best_score = -999
                 results = {}
 
-                for name, model in models.items():
+                for i, (name, model) in enumerate(models.items(), start=1):
                     model.fit(X_train, y_train)
+                    if progress is not None:
+                        progress(i / len(models))
                     preds = model.predict(X_test)
                     score = accuracy_score(y_test, preds)
                     results[name] = float(score)
@@ -170,19 +184,26 @@ class AutoModeler:
         # 3️⃣ CLUSTERING
         # ---------------------------
         else:
+            from sklearn.cluster import KMeans
+            from tasks.silhouette import silhouette
+
             try:
                 k = 3
                 model = KMeans(n_clusters=k, random_state=42)
                 model.fit(X)
+                if progress is not None:
+                    progress(1.0)
                 labels = model.labels_
-                score = silhouette_score(X, labels)
+                score = silhouette(X, labels)
 
                 return {
                     "status": "success",
                     "task_type": "clustering",
                     "clusters": int(k),
-                    "silhouette": float(score),
-                    "labels": labels.tolist()
+                    "silhouette": score["score"],
+                    "silhouette_method": score["method"],
+                    "silhouette_interval": [score["lower"], score["upper"]],
+                    "labels": labels
                 }
 
             except Exception as e:
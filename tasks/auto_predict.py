@@ -1,37 +1,124 @@
 # tasks/auto_predict.py
 
+from statistics import NormalDist
+
+import numpy as np
+
+from core import segment_ops
 from core.sifra_core import SifraCore
 from data.preprocessor import Preprocessor
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def regress(values, offsets, level=0.95):
+    """
+    Next-value prediction for every segment of a ragged array
+    (positions t = 0..n-1, prediction at t = n) from closed-form
+    least-squares sufficient statistics, all segments at once.
+    """
+    n, mean_t, mean_y, ctt, cty, cyy = segment_ops.segment_moments(values, offsets)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        slope = np.where(ctt > 0, cty / ctt, 0.0)
+        intercept = mean_y - slope * mean_t
+        prediction = intercept + slope * n
+
+        sse = np.maximum(cyy - slope * cty, 0.0)
+        residual_std = np.where(n > 2, np.sqrt(sse / np.maximum(n - 2, 1)), 0.0)
+        r2 = np.where(cyy > 0, 1.0 - sse / cyy, 1.0)
+
+        # standard error of a new observation at t = n
+        leverage = np.where(ctt > 0, (n - mean_t) ** 2 / ctt, 0.0)
+        se = residual_std * np.sqrt(1.0 + 1.0 / n + leverage)
+
+    z = NormalDist().inv_cdf(0.5 + level / 2)
+    return {
+        "observations": n.astype(int),
+        "prediction": prediction,
+        "lower": prediction - z * se,
+        "upper": prediction + z * se,
+        "slope": slope,
+        "intercept": intercept,
+        "residual_std": residual_std,
+        "r2": r2,
+    }
+
 
 class AutoPredict:
     """
-    Predicts the next value based on trend + variation + correlation.
+    Predicts the next value of every series with a least-squares line:
+    per column (rows = time, default) or per row (axis="row").
     """
 
     def __init__(self):
         self.core = SifraCore()
         self.preprocessor = Preprocessor()
-        print("[TASK] Auto Predict Module Ready")
+        logger.debug("Auto predict module ready")
 
-    def run(self, dataset):
-        print("\n[AUTO PREDICT] Running Prediction...")
+    def run(self, dataset, axis="column", level=0.95):
+        logger.debug("Running prediction")
 
-        clean_data = self.preprocessor.clean(dataset)
+        if axis not in ("column", "row"):
+            raise ValueError("axis must be 'column' or 'row'")
 
-        # Run full brain pipeline (intent = predict)
-        result = self.core.run("predict", clean_data)
+        clean_data = self.preprocessor.clean(dataset)
 
-        # Prediction logic: last_value + trend
-        last_val = clean_data.mean(axis=1).mean()
+        # Brain pipeline: only the trend channel is read (cached per dataset)
+        result = self.core.run("predict", clean_data, stages=("trend",))
         trend = result["analysis_result"]["trend_score"]
 
-        prediction = last_val + trend
+        series = clean_data.T if axis == "column" else clean_data
+        count, length = series.shape if series.ndim == 2 else (0, 0)
+        fit = regress(series.ravel(), np.arange(count + 1) * length, level)
+
+        if axis == "column":
+            names = self.preprocessor.column_names(dataset, count)
+        else:
+            names = [str(i) for i in range(count)]
 
         return {
             "task": "auto_predict",
             "intent": result["intent_vector"],
             "trend": trend,
-            "prediction": prediction
+            # mean of the per-series next values
+            "prediction": float(fit["prediction"].mean()) if count else None,
+            "axis": axis,
+            "series": dict(fit, names=names, interval_level=level),
+        }
+
+    def run_many(self, series, offsets=None, level=0.95):
+        """
+        Next-value predictions for many series of any length at once:
+          - {series_id: [values...]}
+          - a list of value lists
+          - flat values with CSR `offsets` (len = series + 1)
+        Results are columnar (one entry per series).
+        """
+        if offsets is not None:
+            values = np.asarray(series, dtype=float).ravel()
+            offsets = segment_ops.as_offsets(offsets)
+            if offsets[-1] != len(values):
+                raise ValueError("offsets must end at the number of values")
+            ids = [str(i) for i in range(len(offsets) - 1)]
+        else:
+            if isinstance(series, dict):
+                ids, items = [str(k) for k in series], list(series.values())
+            else:
+                ids, items = [str(i) for i in range(len(series))], list(series)
+            arrays = [np.asarray(item, dtype=float).ravel() for item in items]
+            values = np.concatenate(arrays) if arrays else np.empty(0)
+            offsets = np.concatenate(([0], np.cumsum([len(a) for a in arrays]))).astype(np.int64)
+
+        if np.isnan(values).any():
+            raise ValueError("series must not contain missing values")
+
+        logger.debug("Predicting %d series", len(ids))
+        return {
+            "task": "auto_predict_batch",
+            "count": len(ids),
+            "series": dict(regress(values, offsets, level), ids=ids, interval_level=level),
         }
 if __name__ == "__main__":
     auto_predict = AutoPredict()
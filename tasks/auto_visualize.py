@@ -1,7 +1,17 @@
 # tasks/auto_visualize.py
 
+import os
+
 import numpy as np
 
+from config.settings import Settings
+from tasks import column_profile, downsample
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+CHARTS = ("line", "scatter", "bar", "histogram")
+
 class AutoVisualize:
     """
     Lightweight Auto Visualization engine for SIFRA AI.
@@ -10,7 +20,7 @@ class AutoVisualize:
     """
 
     def __init__(self):
-        print("[TASK] Auto Visualization Module Ready")
+        logger.debug("Auto visualization module ready")
 
     def detect_chart_type(self, arr):
         """
@@ -32,16 +42,27 @@ class AutoVisualize:
         # fallback
         return "bar"
 
-    def create_visual_plan(self, dataset):
+    def create_visual_plan(self, dataset, budget=None, chart=None):
         """
         Create a visualization plan:
         - chart type
         - x-values
         - y-values
+        Series longer than `budget` points are downsampled server-side
+        (tasks/downsample.py); plan["downsampled"] says how.
         """
         arr = np.array(dataset)
+        budget = budget or Settings.VISUALIZE_POINT_BUDGET
 
-        chart_type = self.detect_chart_type(arr)
+        # A mixed table is an object array: type the plotted column on its own
+        y = arr if len(arr.shape) == 1 else arr[:, 0]
+        if y.dtype == object:
+            try:
+                y = y.astype(float)
+            except (TypeError, ValueError):
+                pass
+
+        chart_type = chart or self.detect_chart_type(arr if arr.ndim == 2 and arr.shape[1] == 2 else y)
 
         plan = {
             "chart_type": chart_type,
@@ -49,30 +70,263 @@ class AutoVisualize:
         }
 
         # scatter plots
-        if chart_type == "scatter" and arr.shape[1] == 2:
-            plan["x"] = arr[:, 0].tolist()
-            plan["y"] = arr[:, 1].tolist()
-            return plan
+        if chart_type == "scatter" and arr.ndim == 2 and arr.shape[1] == 2:
+            x, y = arr[:, 0], arr[:, 1]
+            if len(x) <= budget:
+                plan["x"] = x
+                plan["y"] = y
+                return plan
+            return self._scatter_plan(plan, budget, lambda progress=None: [(x, y)])
 
         # line / bar chart
-        if len(arr.shape) == 1:
-            plan["x"] = list(range(len(arr)))
-            plan["y"] = arr.tolist()
-        else:
-            plan["x"] = list(range(arr.shape[0]))
-            plan["y"] = arr[:, 0].tolist()
+        if chart_type == "histogram":
+            return self._histogram_plan(plan, lambda progress=None: [(y,)])
+
+        if len(y) <= budget:
+            plan["x"] = np.arange(len(y))
+            plan["y"] = y
+            return plan
+
+        if chart_type == "bar":
+            return self._bar_plan(plan, [(y,)])
+
+        # Line: LTTB keeps the visual shape, the envelope keeps every extreme
+        y = y.astype(float)
+        x = np.flatnonzero(np.isfinite(y))
+        keep = downsample.lttb(x, y[x], budget)
+        plan["x"] = x[keep]
+        plan["y"] = y[x[keep]]
+        plan["envelope"] = downsample.Envelope(budget // 2).update(y).result()
+        plan["downsampled"] = {"method": "lttb", "points": len(y), "returned": len(keep)}
+        return plan
+
+    # --------------------------------------------------------------
+    # Aggregated plans (chunks() yields column arrays, so the same
+    # code serves in-memory arrays and streamed files)
+    # --------------------------------------------------------------
+    def _scatter_plan(self, plan, budget, chunks, progress=None):
+        """
+        Two passes: value ranges, then a 2D density plus a uniform
+        sample of `budget` points.
+        """
+        first, second = self._split_progress(progress)
+
+        ranges = downsample.Range(2)
+        for x, y in chunks(first):
+            ranges.update(x, y)
+        density = downsample.Density(Settings.VISUALIZE_DENSITY_BINS, ranges.ranges())
+        sample = downsample.Sample(budget)
+        for x, y in chunks(second):
+            density.update(x, y)
+            sample.update(x, y)
 
+        plan["x"], plan["y"] = sample.result() or (np.empty(0), np.empty(0))
+        plan["density"] = density.result()
+        plan["downsampled"] = {"method": "density", "points": int(density.counts.sum()), "returned": len(plan["x"])}
         return plan
 
-    def run(self, dataset):
+    def _histogram_plan(self, plan, chunks, progress=None):
+        first, second = self._split_progress(progress)
+
+        ranges = downsample.Range(1)
+        for (values,) in chunks(first):
+            ranges.update(values)
+        histogram = downsample.Histogram(Settings.VISUALIZE_HISTOGRAM_BINS, ranges.ranges()[0])
+        for (values,) in chunks(second):
+            histogram.update(values)
+
+        result = histogram.result()
+        plan["x"] = (result["edges"][:-1] + result["edges"][1:]) / 2
+        plan["y"] = result["counts"]
+        plan["edges"] = result["edges"]
+        return plan
+
+    def _bar_plan(self, plan, chunks):
+        categories = downsample.Categories(Settings.VISUALIZE_TOP_CATEGORIES)
+        points = 0
+        for (values,) in chunks:
+            categories.update(values)
+            points += len(values)
+
+        result = categories.result()
+        plan["x"] = result["categories"]
+        plan["y"] = result["counts"]
+        plan["other"] = result["other"]
+        plan["downsampled"] = {"method": "category_counts", "points": points, "returned": len(plan["x"])}
+        return plan
+
+    def _split_progress(self, progress):
+        if progress is None:
+            return None, None
+        return (lambda f: progress(0.5 * f)), (lambda f: progress(0.5 + 0.5 * f))
+
+    # --------------------------------------------------------------
+    # Streaming plans for big files
+    # --------------------------------------------------------------
+    def visualize_file(self, file_path, columns=None, chart=None, budget=None,
+                       chunk_size=50000, progress=None):
+        """
+        Chart plan of a CSV file of any size, one chunk at a time.
+        columns: one column (line / bar / histogram) or two (scatter);
+        by default the first column, or both columns of a
+        two-column numeric file, as create_visual_plan does.
+        """
+        import pandas as pd
+        from tasks.auto_bigdata import AutoBigData
+
+        budget = budget or Settings.VISUALIZE_POINT_BUDGET
+        bigdata = AutoBigData()
+        file_path = bigdata.clean_path(file_path)
+        if not os.path.exists(file_path):
+            raise ValueError(f"File not found: {file_path}")
+
+        head = pd.read_csv(file_path, nrows=1000)
+        numeric = [c for c in head.columns if pd.api.types.is_numeric_dtype(head[c])]
+        if not columns:
+            columns = list(head.columns) if len(head.columns) == 2 and len(numeric) == 2 else list(head.columns[:1])
+        missing = [c for c in columns if c not in head.columns]
+        if missing or not 1 <= len(columns) <= 2:
+            raise ValueError(f"Columns must be one or two of: {', '.join(map(str, head.columns))}")
+
+        if chart is None:
+            if len(columns) == 2:
+                chart = "scatter"
+            else:
+                chart = "line" if columns[0] in numeric else "bar"
+        if (chart == "scatter") != (len(columns) == 2):
+            raise ValueError("Scatter charts need two columns, other charts one")
+
+        def chunks(part_progress=None):
+            for chunk in bigdata.stream_csv(file_path, chunk_size, progress=part_progress, columns=columns):
+                if chart == "bar":
+                    yield tuple(chunk[c].to_numpy() for c in columns)
+                else:
+                    yield tuple(pd.to_numeric(chunk[c], errors="coerce").to_numpy(dtype=float) for c in columns)
+
+        plan = {
+            "chart_type": chart,
+            "description": f"Recommended chart: {chart}",
+            "columns": columns,
+        }
+
+        if chart == "scatter":
+            return self._scatter_plan(plan, budget, chunks, progress)
+        if chart == "histogram":
+            return self._histogram_plan(plan, chunks, progress)
+
+        if chart == "bar":
+            return self._bar_plan(plan, chunks(progress))
+
+        envelope = downsample.Envelope(budget // 2)
+        for (column,) in chunks(progress):
+            envelope.update(column)
+        plan["x"], plan["y"] = envelope.points()
+        plan["envelope"] = envelope.result()
+        plan["downsampled"] = {"method": "minmax", "points": envelope.rows, "returned": len(plan["x"])}
+        return plan
+
+    # --------------------------------------------------------------
+    # Dashboard: charts for every column
+    # --------------------------------------------------------------
+    def dashboard_plan(self, dataset, budget=None):
+        """
+        Complete plan across all columns from the shared column profile
+        (tasks/column_profile.py, also behind AutoEDA):
+        - a histogram per numeric column
+        - a correlation heatmap of the numeric columns
+        - top-k category bars per categorical column
+        - a downsampled time-series line per numeric column over the
+          first datetime column
+        At most VISUALIZE_DASHBOARD_CHARTS charts of each kind.
+        """
+        import pandas as pd
+
+        budget = budget or Settings.VISUALIZE_POINT_BUDGET
+        limit = Settings.VISUALIZE_DASHBOARD_CHARTS
+        df = dataset if isinstance(dataset, pd.DataFrame) else pd.DataFrame(dataset)
+        profile = column_profile.profile(df)
+        columns, types = profile["columns"], profile["types"]
+
+        numeric = [j for j, col in enumerate(columns) if types[col] == "numeric" and profile["count"][j] > 0]
+        categorical = [col for col in columns if types[col] == "categorical"]
+        dates = [col for col in columns if types[col] == "datetime"]
+
+        summary = {}
+        for j, col in enumerate(columns):
+            summary[col] = {"type": types[col], "missing": int(profile["nulls"][j])}
+            if j in numeric:
+                summary[col].update(min=profile["min"][j], max=profile["max"][j], mean=profile["mean"][j])
+            elif col in categorical:
+                summary[col]["distinct"] = profile["categories"][col]["distinct"]
+
+        charts = []
+        counts, edges = profile["histograms"]["counts"], profile["histograms"]["edges"]
+        for j in numeric[:limit]:
+            charts.append({
+                "chart_type": "histogram",
+                "columns": [columns[j]],
+                "x": (edges[j, :-1] + edges[j, 1:]) / 2,
+                "y": counts[j],
+                "edges": edges[j],
+            })
+
+        if len(numeric) > 1:
+            shown = numeric[:limit]
+            charts.append({
+                "chart_type": "heatmap",
+                "columns": [columns[j] for j in shown],
+                "matrix": np.round(profile["correlation"][np.ix_(shown, shown)], 4),
+            })
+
+        for col in categorical[:limit]:
+            bars = profile["categories"][col]
+            charts.append({
+                "chart_type": "bar",
+                "columns": [col],
+                "x": bars["categories"],
+                "y": bars["counts"],
+                "other": bars["other"],
+            })
+
+        if dates and numeric:
+            charts.extend(self._time_lines(df, dates[0], profile["formats"][dates[0]],
+                                           [columns[j] for j in numeric[:limit]], budget))
+
+        return {"columns": summary, "charts": charts}
+
+    def _time_lines(self, df, time_col, fmt, value_cols, budget):
+        import pandas as pd
+
+        times = pd.to_datetime(df[time_col], format=fmt, errors="coerce").to_numpy(dtype="datetime64[ns]")
+        order = np.argsort(times, kind="stable")
+        order = order[~np.isnat(times[order])]
+        t = times[order]
+
+        lines = []
+        for col in value_cols:
+            y = pd.to_numeric(df[col], errors="coerce").to_numpy(dtype=float, na_value=np.nan)[order]
+            ok = np.flatnonzero(np.isfinite(y))
+            keep = ok[downsample.lttb(t[ok].astype(np.int64).astype(float), y[ok], budget)]
+            lines.append({
+                "chart_type": "line",
+                "columns": [time_col, col],
+                "x": np.datetime_as_string(t[keep], unit="s"),
+                "y": y[keep],
+                "downsampled": {"method": "lttb", "points": len(ok), "returned": len(keep)},
+            })
+        return lines
+
+    def run(self, dataset, budget=None, chart=None):
         """
-        Main entry for visualization engine.
+        Main entry for visualization engine: the recommended chart
+        (visual_plan) plus the dashboard of every column.
         """
         try:
-            plan = self.create_visual_plan(dataset)
+            plan = self.create_visual_plan(dataset, budget, chart)
             return {
                 "status": "success",
-                "visual_plan": plan
+                "visual_plan": plan,
+                "dashboard": self.dashboard_plan(dataset, budget)
             }
         except Exception as e:
             return {
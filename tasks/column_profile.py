@@ -0,0 +1,238 @@
+# tasks/column_profile.py
+"""
+Per-column statistics of a dataset, computed in one vectorized pass
+and shared by AutoEDA (summary statistics, outliers, correlation) and
+AutoVisualize (dashboard charts).
+
+Every column is coerced to numeric (as AutoEDA always did), stacked
+into one float matrix, and reduced column-wise:
+  - count / mean / std / min / max / quartiles / skewness / kurtosis,
+    using one column sort for all quantiles and pandas' bias-corrected
+    moment formulas
+  - IQR outliers
+  - pairwise-complete Pearson correlation, from three matrix products
+    over the missing-value mask (what DataFrame.corr computes pair by pair)
+  - histograms with VISUALIZE_HISTOGRAM_BINS bins, from one bincount
+Columns are typed with TypeInferencer. Categorical columns get top-k
+counts, and datetime columns keep their format for time-series charts.
+
+Profiles are cached by content hash (PROFILE_CACHE_SIZE), so /eda and
+/visualize on the same data compute them once.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from config.settings import Settings
+from data.type_inference import TypeInferencer
+from tasks import downsample
+
+_PROFILES = OrderedDict()
+_LOCK = threading.Lock()
+
+
+def frame_key(df):
+    """
+    Content hash of a DataFrame (column names + row hashes).
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(repr([str(c) for c in df.columns]).encode())
+    digest.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+# ------------------------------------------------------------
+# Column-wise reductions over a float matrix (NaN = missing)
+# ------------------------------------------------------------
+def _quantiles(X, count, qs):
+    """
+    Linear-interpolated quantiles (np.percentile's default) per column
+    from one sort; NaN sorts last, so only the first `count` rows count.
+    """
+    S = np.sort(X, axis=0)
+    cols = np.arange(X.shape[1])
+    out = np.full((len(qs), X.shape[1]), np.nan)
+    ok = count > 0
+    for i, q in enumerate(qs):
+        pos = (count[ok] - 1) * q
+        lo = np.floor(pos).astype(np.int64)
+        hi = np.ceil(pos).astype(np.int64)
+        low = S[lo, cols[ok]]
+        out[i, ok] = low + (S[hi, cols[ok]] - low) * (pos - lo)
+    return out
+
+
+def _moments(X, mask, count):
+    """
+    mean, std (ddof=1), skewness and excess kurtosis as pandas computes them.
+    """
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = np.where(mask, X, 0.0).sum(axis=0) / count
+        d = np.where(mask, X - mean, 0.0)
+        d2 = d * d
+        m2 = d2.sum(axis=0) / count
+        m3 = (d2 * d).sum(axis=0) / count
+        m4 = (d2 * d2).sum(axis=0) / count
+
+        std = np.sqrt(m2 * count / (count - 1))
+        skew = np.sqrt(count * (count - 1)) / (count - 2) * m3 / m2 ** 1.5
+        kurt = (count - 1) / ((count - 2) * (count - 3)) * ((count + 1) * m4 / (m2 * m2) - 3 * (count - 1))
+
+    constant = m2 <= 1e-14 * np.maximum(mean * mean, 1.0)
+    std[count < 2] = np.nan
+    skew = np.where(constant, 0.0, skew)
+    kurt = np.where(constant, 0.0, kurt)
+    skew[count < 3] = np.nan
+    kurt[count < 4] = np.nan
+    return mean, std, skew, kurt
+
+
+def correlation(X, mask):
+    """
+    Pairwise-complete Pearson correlation (DataFrame.corr()).
+    """
+    M = mask.astype(float)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        center = np.where(mask, X, 0.0).sum(axis=0) / M.sum(axis=0)
+        Z = np.where(mask, X - np.nan_to_num(center), 0.0)
+
+        n = M.T @ M
+        sx = Z.T @ M          # sx[i, j]: sum of column i over rows where j is present
+        sxy = Z.T @ Z
+        sxx = (Z * Z).T @ M
+
+        cov = n * sxy - sx * sx.T
+        var = (n * sxx - sx * sx) * (n * sxx - sx * sx).T
+        corr = cov / np.sqrt(var)
+
+    corr[n < 2] = np.nan
+    return np.clip(corr, -1.0, 1.0)
+
+
+def histograms(X, mask, lo, hi, bins):
+    """
+    (columns, bins) counts over [lo, hi] per column, plus the edges.
+    """
+    width = np.where(hi > lo, hi - lo, 1.0)
+    base = np.where(np.isfinite(lo), lo, 0.0)
+    idx = np.floor((np.where(mask, X, base) - base) / width * bins).astype(np.int64)
+    np.clip(idx, 0, bins - 1, out=idx)
+
+    cols = np.broadcast_to(np.arange(X.shape[1]), X.shape)
+    counts = np.bincount((cols * bins + idx)[mask], minlength=X.shape[1] * bins)
+    edges = base[:, None] + width[:, None] * np.linspace(0, 1, bins + 1)[None, :]
+    return counts.reshape(X.shape[1], bins), edges
+
+
+# ------------------------------------------------------------
+# Profile
+# ------------------------------------------------------------
+def _numeric(series, kind):
+    """
+    Column coerced to float (NaN where not numeric). Text columns are
+    coerced once per distinct value; a value in one of the date formats
+    is never numeric.
+    """
+    if pd.api.types.is_numeric_dtype(series):
+        return series.to_numpy(dtype=float, na_value=np.nan)
+    if kind == "datetime":
+        return np.nan
+
+    codes, uniques = pd.factorize(series)
+    values = pd.to_numeric(pd.Series(uniques, dtype=object), errors="coerce").to_numpy(dtype=float, na_value=np.nan)
+    return np.where(codes >= 0, values[codes] if len(values) else np.nan, np.nan)
+
+
+def compute(df):
+    """
+    Uncached profile of a DataFrame (see module docstring).
+    """
+    inferencer = TypeInferencer()
+    columns = list(df.columns)
+    types = {}
+    formats = {}
+    categories = {}
+
+    for col in columns:
+        kind, fmt = inferencer.infer(df[col])
+        if kind == "datetime":
+            converted = inferencer.convert(df[col], kind, fmt) if fmt != "mixed" else None
+            if converted is None or not pd.api.types.is_datetime64_any_dtype(converted):
+                kind = "categorical"
+            else:
+                formats[col] = fmt
+        if kind == "categorical":
+            categories[col] = downsample.Categories(Settings.VISUALIZE_TOP_CATEGORIES).update(df[col].dropna()).result()
+        types[col] = kind
+
+    X = np.full((len(df), len(columns)), np.nan)
+    for j, col in enumerate(columns):
+        X[:, j] = _numeric(df[col], types[col])
+    mask = np.isfinite(X)
+    count = mask.sum(axis=0)
+
+    mean, std, skew, kurt = _moments(X, mask, count)
+    q1, median, q3 = _quantiles(X, count, (0.25, 0.5, 0.75))
+    lo = np.where(count > 0, np.where(mask, X, np.inf).min(axis=0, initial=np.inf), np.nan)
+    hi = np.where(count > 0, np.where(mask, X, -np.inf).max(axis=0, initial=-np.inf), np.nan)
+
+    # IQR outliers: position among each column's non-missing values (as AutoEDA reports them)
+    iqr = q3 - q1
+    with np.errstate(invalid="ignore"):
+        flagged = mask & ((X < q1 - 1.5 * iqr) | (X > q3 + 1.5 * iqr))
+    position = np.cumsum(mask, axis=0) - 1
+    outliers = {}
+    for j in np.flatnonzero(flagged.any(axis=0)):
+        rows = np.flatnonzero(flagged[:, j])
+        outliers[columns[j]] = (position[rows, j], X[rows, j])
+
+    counts, edges = histograms(X, mask, lo, hi, Settings.VISUALIZE_HISTOGRAM_BINS)
+
+    return {
+        "rows": len(df),
+        "columns": columns,
+        "types": types,
+        "missing": len(df) - count,   # values that are not numbers
+        "nulls": df.isna().sum().to_numpy(),
+        "count": count,
+        "mean": mean,
+        "std": std,
+        "min": lo,
+        "max": hi,
+        "q1": q1,
+        "median": median,
+        "q3": q3,
+        "skewness": skew,
+        "kurtosis": kurt,
+        "outliers": outliers,
+        "correlation": correlation(X, mask),
+        "histograms": {"counts": counts, "edges": edges},
+        "categories": categories,
+        "formats": formats,
+    }
+
+
+def profile(dataset):
+    """
+    Cached profile of a dataset (anything pd.DataFrame accepts).
+    """
+    df = dataset if isinstance(dataset, pd.DataFrame) else pd.DataFrame(dataset)
+    key = frame_key(df)
+
+    with _LOCK:
+        found = _PROFILES.get(key)
+        if found is not None:
+            _PROFILES.move_to_end(key)
+            return found
+
+    result = compute(df)
+    if Settings.PROFILE_CACHE_SIZE > 0:
+        with _LOCK:
+            _PROFILES[key] = result
+            while len(_PROFILES) > Settings.PROFILE_CACHE_SIZE:
+                _PROFILES.popitem(last=False)
+    return result
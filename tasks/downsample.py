@@ -0,0 +1,261 @@
+# tasks/downsample.py
+"""
+Render-ready reductions that keep AutoVisualize charts within a point
+budget (Settings.VISUALIZE_POINT_BUDGET):
+
+  - lttb: Largest-Triangle-Three-Buckets selection for line charts
+  - Envelope: per-bucket min / max band of a line
+  - Density: 2D binned counts for scatter charts
+  - Histogram / Categories: bin counts and category counts for bars
+  - Sample: uniform sample of points (smallest random keys)
+
+The accumulator classes take data chunk by chunk through update(), so
+a chart of a file of any size is built while streaming it. Envelope,
+Categories and Sample need one pass. Density and Histogram need the
+value ranges first.
+"""
+
+import numpy as np
+
+
+def lttb(x, y, threshold):
+    """
+    Indices of the `threshold` points LTTB keeps. The first and last
+    points are always kept. Each bucket keeps the point that forms the
+    largest triangle with the point kept before it and the mean of the
+    next bucket.
+    """
+    n = len(y)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+
+    # threshold - 2 buckets over points 1 .. n-2
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+    counts = np.diff(edges)
+    mean_x = np.add.reduceat(x, edges[:-1]) / counts
+    mean_y = np.add.reduceat(y, edges[:-1]) / counts
+    next_x = np.append(mean_x[1:], x[-1])
+    next_y = np.append(mean_y[1:], y[-1])
+
+    keep = np.empty(threshold, dtype=np.int64)
+    keep[0], keep[-1] = 0, n - 1
+    a = 0
+    for i in range(threshold - 2):
+        lo, hi = edges[i], edges[i + 1]
+        ax, ay = x[a], y[a]
+        area = np.abs((ax - next_x[i]) * (y[lo:hi] - ay) - (ax - x[lo:hi]) * (next_y[i] - ay))
+        a = lo + int(np.argmax(area))
+        keep[i + 1] = a
+    return keep
+
+
+def _runs(ids):
+    return np.flatnonzero(np.r_[True, ids[1:] != ids[:-1]])
+
+
+def _first_where(mask, at, starts):
+    """
+    First `at` per run where mask holds.
+    """
+    return np.minimum.reduceat(np.where(mask, at, np.iinfo(np.int64).max), starts)
+
+
+class Envelope:
+    """
+    Min / max band of a line over consecutive row buckets, with the row
+    of each extreme. The bucket width doubles whenever there are more
+    than `buckets` buckets, so memory stays bounded while streaming.
+    Non-finite values are ignored.
+    """
+
+    def __init__(self, buckets):
+        self.buckets = max(int(buckets), 1)
+        self.width = 1
+        self.rows = 0
+        self.ids = np.empty(0, dtype=np.int64)
+        self.lo = self.hi = np.empty(0)
+        self.lo_at = self.hi_at = np.empty(0, dtype=np.int64)
+
+    def _reduce(self, ids, lo, hi, lo_at, hi_at):
+        starts = _runs(ids)
+        counts = np.diff(np.append(starts, len(ids)))
+        new_lo = np.minimum.reduceat(lo, starts)
+        new_hi = np.maximum.reduceat(hi, starts)
+        self.lo_at = _first_where(lo == np.repeat(new_lo, counts), lo_at, starts)
+        self.hi_at = _first_where(hi == np.repeat(new_hi, counts), hi_at, starts)
+        self.ids, self.lo, self.hi = ids[starts], new_lo, new_hi
+
+    def update(self, values):
+        values = np.asarray(values, dtype=float)
+        rows = np.arange(self.rows, self.rows + len(values))
+        self.rows += len(values)
+
+        ok = np.isfinite(values)
+        values, rows = values[ok], rows[ok]
+        if len(values):
+            self._reduce(
+                np.concatenate([self.ids, rows // self.width]),
+                np.concatenate([self.lo, values]), np.concatenate([self.hi, values]),
+                np.concatenate([self.lo_at, rows]), np.concatenate([self.hi_at, rows]),
+            )
+        while len(self.ids) > self.buckets:
+            self.width *= 2
+            self._reduce(self.ids // 2, self.lo, self.hi, self.lo_at, self.hi_at)
+        return self
+
+    def points(self):
+        """
+        The extremes in row order: a line through them keeps every
+        peak and trough (at most 2 points per bucket).
+        """
+        at = np.concatenate([self.lo_at, self.hi_at])
+        values = np.concatenate([self.lo, self.hi])
+        at, first = np.unique(at, return_index=True)
+        return at, values[first]
+
+    def result(self):
+        return {
+            "x": self.ids * self.width,
+            "min": self.lo,
+            "max": self.hi,
+            "bucket_rows": self.width,
+        }
+
+
+class Range:
+    """
+    Running finite min / max per column (first pass for binned charts).
+    """
+
+    def __init__(self, columns):
+        self.lo = np.full(columns, np.inf)
+        self.hi = np.full(columns, -np.inf)
+
+    def update(self, *columns):
+        for i, values in enumerate(columns):
+            values = np.asarray(values, dtype=float)
+            values = values[np.isfinite(values)]
+            if len(values):
+                self.lo[i] = min(self.lo[i], values.min())
+                self.hi[i] = max(self.hi[i], values.max())
+        return self
+
+    def ranges(self):
+        """
+        [(lo, hi)] per column, widened when a column is constant.
+        """
+        out = []
+        for lo, hi in zip(self.lo, self.hi):
+            if not np.isfinite(lo):
+                lo, hi = 0.0, 1.0
+            elif lo == hi:
+                lo, hi = lo - 0.5, hi + 0.5
+            out.append((float(lo), float(hi)))
+        return out
+
+
+class Density:
+    """
+    2D histogram of (x, y) over fixed ranges.
+    """
+
+    def __init__(self, bins, ranges):
+        self.bins = bins
+        self.ranges = ranges
+        self.counts = np.zeros((bins, bins), dtype=np.int64)
+        self.x_edges = np.linspace(*ranges[0], bins + 1)
+        self.y_edges = np.linspace(*ranges[1], bins + 1)
+
+    def update(self, x, y):
+        x = np.asarray(x, dtype=float)
+        y = np.asarray(y, dtype=float)
+        ok = np.isfinite(x) & np.isfinite(y)
+        counts, _, _ = np.histogram2d(x[ok], y[ok], bins=self.bins, range=self.ranges)
+        self.counts += counts.astype(np.int64)
+        return self
+
+    def result(self):
+        return {"x_edges": self.x_edges, "y_edges": self.y_edges, "counts": self.counts}
+
+
+class Histogram:
+    """
+    Bin counts of one numeric column over a fixed range.
+    """
+
+    def __init__(self, bins, value_range):
+        self.range = value_range
+        self.edges = np.linspace(*value_range, bins + 1)
+        self.counts = np.zeros(bins, dtype=np.int64)
+
+    def update(self, values):
+        values = np.asarray(values, dtype=float)
+        counts, _ = np.histogram(values[np.isfinite(values)], bins=self.edges)
+        self.counts += counts
+        return self
+
+    def result(self):
+        return {"edges": self.edges, "counts": self.counts}
+
+
+class Categories:
+    """
+    Counts per category; result() keeps the `top` most frequent and
+    folds the rest into "other".
+    """
+
+    def __init__(self, top):
+        self.top = top
+        self.keys = np.empty(0, dtype=str)
+        self.counts = np.empty(0, dtype=np.int64)
+
+    def update(self, values):
+        keys, counts = np.unique(np.asarray(values).astype(str), return_counts=True)
+        if len(self.keys):
+            keys, inverse = np.unique(np.concatenate([self.keys, keys]), return_inverse=True)
+            counts = np.bincount(inverse.ravel(), np.concatenate([self.counts, counts])).astype(np.int64)
+        self.keys, self.counts = keys, counts
+        return self
+
+    def result(self):
+        ranked = np.lexsort((self.keys, -self.counts))   # most frequent first, ties by name
+        shown = ranked[:self.top]
+        return {
+            "categories": self.keys[shown].tolist(),
+            "counts": self.counts[shown],
+            "other": int(self.counts[ranked[self.top:]].sum()),
+            "distinct": len(self.keys),
+        }
+
+
+class Sample:
+    """
+    Uniform sample of `size` rows: every row gets a random key and the
+    smallest keys are kept, so chunks (or samples) merge exactly.
+    """
+
+    def __init__(self, size, seed=0):
+        self.size = size
+        self.rng = np.random.default_rng(seed)
+        self.keys = np.empty(0)
+        self.columns = None
+
+    def update(self, *columns):
+        columns = [np.asarray(c) for c in columns]
+        keys = np.concatenate([self.keys, self.rng.random(len(columns[0]))])
+        if self.columns is not None:
+            columns = [np.concatenate([old, new]) for old, new in zip(self.columns, columns)]
+
+        if len(keys) > self.size:
+            keep = np.argpartition(keys, self.size - 1)[:self.size]
+            keep.sort()
+            keys, columns = keys[keep], [c[keep] for c in columns]
+
+        self.keys, self.columns = keys, columns
+        return self
+
+    def result(self):
+        return self.columns or []
@@ -0,0 +1,312 @@
+# tasks/evaluation_metrics.py
+"""
+Mergeable metric accumulators for AutoEvaluate.
+
+Each accumulator keeps sufficient statistics per segment (one segment
+when no segment keys are given), and every metric is derived from them:
+  - ClassificationAccumulator: a confusion matrix per segment
+  - RegressionAccumulator: target and residual moments per segment
+
+update() folds in a chunk of (y_true, y_pred[, segments]); merge()
+combines accumulators built elsewhere (other chunks, files, workers).
+Both are exact, so a file of any size is evaluated one chunk at a time
+with the same result as evaluating it in memory.
+"""
+
+import numpy as np
+
+
+class _Vocabulary:
+    """
+    Stable dense codes for the labels / segment keys seen so far.
+    """
+
+    def __init__(self):
+        self.values = []
+        self.index = {}
+
+    def __len__(self):
+        return len(self.values)
+
+    def _codes(self, values):
+        codes = np.empty(len(values), dtype=np.int64)
+        for i, value in enumerate(values):
+            code = self.index.get(value)
+            if code is None:
+                code = self.index[value] = len(self.values)
+                self.values.append(value)
+            codes[i] = code
+        return codes
+
+    def code(self, value):
+        return int(self._codes([value])[0])
+
+    def encode(self, array):
+        try:
+            uniq, inverse = np.unique(array, return_inverse=True)
+        except TypeError:   # mixed label types (e.g. 1 and "a")
+            uniq, inverse = np.unique(array.astype(str), return_inverse=True)
+        return self._codes(uniq.tolist())[inverse.ravel()]
+
+    def remap(self, other):
+        """
+        Codes in this vocabulary of every value of `other`.
+        """
+        return self._codes(other.values)
+
+    def order(self):
+        try:
+            return sorted(range(len(self.values)), key=self.values.__getitem__)
+        except TypeError:
+            return sorted(range(len(self.values)), key=lambda i: str(self.values[i]))
+
+
+def _ratio(num, den):
+    """
+    num / den with 0.0 where den == 0 (sklearn's zero_division=0).
+    """
+    num = np.asarray(num, dtype=float)
+    den = np.asarray(den, dtype=float)
+    return np.divide(num, den, out=np.zeros(np.broadcast(num, den).shape), where=den > 0)
+
+
+class _Accumulator:
+
+    task_type = None
+
+    def __init__(self):
+        self.segments = _Vocabulary()
+        self.segmented = False
+
+    def _inputs(self, y_true, y_pred, segments):
+        y_true = np.asarray(y_true).ravel()
+        y_pred = np.asarray(y_pred).ravel()
+        if len(y_true) != len(y_pred):
+            raise ValueError("y_true and y_pred must have the same length")
+
+        if segments is None:
+            codes = np.full(len(y_true), self.segments.code(None), dtype=np.int64)
+        else:
+            segments = np.asarray(segments).ravel()
+            if len(segments) != len(y_true):
+                raise ValueError("segments must have the same length as y_true")
+            self.segmented = True
+            codes = self.segments.encode(segments)
+        return y_true, y_pred, codes
+
+    def result(self):
+        metrics = self._metrics(*self._totals())
+        if not metrics["samples"]:
+            return {"error": "No samples to evaluate"}
+
+        result = {"status": "success", "task_type": self.task_type}
+        result.update(metrics)
+        if self.segmented:
+            order = self.segments.order()
+            per_segment = self._metrics(*self._per_segment(order))
+            result["segments"] = dict(keys=[self.segments.values[i] for i in order], **per_segment)
+        return result
+
+
+# ------------------------------------------------------------
+# Classification: confusion matrices
+# ------------------------------------------------------------
+class ClassificationAccumulator(_Accumulator):
+    """
+    matrix[s, t, p] counts samples of segment s with true label t
+    predicted as p. Labels from y_true and y_pred share one vocabulary.
+    """
+
+    task_type = "classification"
+
+    def __init__(self):
+        super().__init__()
+        self.labels = _Vocabulary()
+        self.matrix = np.zeros((0, 0, 0), dtype=np.int64)
+
+    def _grow(self):
+        shape = (len(self.segments), len(self.labels), len(self.labels))
+        if self.matrix.shape != shape:
+            grown = np.zeros(shape, dtype=np.int64)
+            s, k, _ = self.matrix.shape
+            grown[:s, :k, :k] = self.matrix
+            self.matrix = grown
+
+    def update(self, y_true, y_pred, segments=None):
+        y_true, y_pred, seg = self._inputs(y_true, y_pred, segments)
+        codes = self.labels.encode(np.concatenate([y_true, y_pred]))
+        t, p = codes[:len(y_true)], codes[len(y_true):]
+
+        self._grow()
+        k = len(self.labels)
+        counts = np.bincount((seg * k + t) * k + p, minlength=self.matrix.size)
+        self.matrix += counts.reshape(self.matrix.shape)
+        return self
+
+    def merge(self, other):
+        labels = self.labels.remap(other.labels)
+        segments = self.segments.remap(other.segments)
+        self.segmented |= other.segmented
+        self._grow()
+        self.matrix[np.ix_(segments, labels, labels)] += other.matrix
+        return self
+
+    def _totals(self):
+        order = self.labels.order()
+        return self.matrix.sum(axis=0)[np.ix_(order, order)], True
+
+    def _per_segment(self, segment_order):
+        order = self.labels.order()
+        return self.matrix[np.ix_(segment_order, order, order)], False
+
+    def _metrics(self, matrix, overall):
+        """
+        Weighted precision / recall / F1 as sklearn (average="weighted",
+        zero_division=0); matrix may carry a leading segment axis.
+        """
+        tp = np.diagonal(matrix, axis1=-2, axis2=-1)
+        support = matrix.sum(axis=-1)
+        predicted = matrix.sum(axis=-2)
+        samples = support.sum(axis=-1)
+
+        precision = _ratio(tp, predicted)
+        recall = _ratio(tp, support)
+        f1 = _ratio(2 * tp, support + predicted)
+        present = (support + predicted) > 0   # macro average over labels seen in the segment
+
+        metrics = {
+            "samples": samples,
+            "accuracy": _ratio(tp.sum(axis=-1), samples),
+            "precision": _ratio((precision * support).sum(axis=-1), samples),
+            "recall": _ratio((recall * support).sum(axis=-1), samples),
+            "f1_score": _ratio((f1 * support).sum(axis=-1), samples),
+            "macro_f1": _ratio((f1 * present).sum(axis=-1), present.sum(axis=-1)),
+        }
+        if not overall:
+            return metrics
+
+        metrics = {key: value.item() for key, value in metrics.items()}
+        metrics.update({
+            "classes": [self.labels.values[i] for i in self.labels.order()],
+            "confusion_matrix": matrix,
+            "per_class": {"precision": precision, "recall": recall, "f1_score": f1, "support": support},
+        })
+        return metrics
+
+
+# ------------------------------------------------------------
+# Regression: target and residual moments
+# ------------------------------------------------------------
+class RegressionAccumulator(_Accumulator):
+    """
+    Per segment: count, mean and centered sum of squares of y_true
+    (merged with Chan's parallel update), and sums of squared, absolute
+    and signed residuals (y_pred - y_true). Pairs with a non-finite
+    value are skipped and counted.
+    """
+
+    task_type = "regression"
+    FIELDS = ("n", "mean", "m2", "sse", "sae", "residual")
+
+    def __init__(self):
+        super().__init__()
+        self.state = {field: np.zeros(0) for field in self.FIELDS}
+        self.skipped = 0
+
+    def _grow(self):
+        size = len(self.segments)
+        for field, values in self.state.items():
+            if len(values) < size:
+                self.state[field] = np.concatenate([values, np.zeros(size - len(values))])
+
+    def _fold(self, index, n, mean, m2, sse, sae, residual):
+        state = self.state
+        n_a = state["n"][index]
+        total = n_a + n
+        weight = _ratio(n, total)
+        delta = mean - state["mean"][index]
+
+        state["mean"][index] += delta * weight
+        state["m2"][index] += m2 + delta * delta * n_a * weight
+        state["n"][index] = total
+        state["sse"][index] += sse
+        state["sae"][index] += sae
+        state["residual"][index] += residual
+
+    def update(self, y_true, y_pred, segments=None):
+        y_true, y_pred, seg = self._inputs(y_true, y_pred, segments)
+        y_true = y_true.astype(float)
+        y_pred = y_pred.astype(float)
+
+        ok = np.isfinite(y_true) & np.isfinite(y_pred)
+        if not ok.all():
+            self.skipped += int((~ok).sum())
+            y_true, y_pred, seg = y_true[ok], y_pred[ok], seg[ok]
+
+        self._grow()
+        size = len(self.segments)
+        n = np.bincount(seg, minlength=size).astype(float)
+        mean = _ratio(np.bincount(seg, y_true, size), n)
+        dev = y_true - mean[seg]
+        res = y_pred - y_true
+
+        self._fold(
+            np.arange(size), n, mean,
+            np.bincount(seg, dev * dev, size),
+            np.bincount(seg, res * res, size),
+            np.bincount(seg, np.abs(res), size),
+            np.bincount(seg, res, size),
+        )
+        return self
+
+    def merge(self, other):
+        segments = self.segments.remap(other.segments)
+        self.segmented |= other.segmented
+        self.skipped += other.skipped
+        self._grow()
+        self._fold(segments, *(other.state[field] for field in self.FIELDS))
+        return self
+
+    def _totals(self):
+        n, mean, m2, sse, sae, residual = (self.state[field] for field in self.FIELDS)
+        total = n.sum()
+        grand = _ratio((n * mean).sum(), total)
+        m2 = m2.sum() + (n * (mean - grand) ** 2).sum()
+        return total, m2, sse.sum(), sae.sum(), residual.sum(), True
+
+    def _per_segment(self, order):
+        n, _, m2, sse, sae, residual = (self.state[field][order] for field in self.FIELDS)
+        return n, m2, sse, sae, residual, False
+
+    def _metrics(self, n, m2, sse, sae, residual, overall):
+        """
+        r2_score / mean_squared_error / mean_absolute_error as sklearn
+        (r2 is 1.0 for a perfect fit of a constant target, else 0.0).
+        """
+        mse = _ratio(sse, n)
+        r2 = np.where(m2 > 0, 1.0 - _ratio(sse, m2), np.where(sse == 0, 1.0, 0.0))
+
+        metrics = {
+            "samples": int(n) if overall else n.astype(np.int64),
+            "r2_score": r2,
+            "mse": mse,
+            "rmse": np.sqrt(mse),
+            "mae": _ratio(sae, n),
+            "bias": _ratio(residual, n),
+        }
+        if overall:
+            metrics = {key: value if key == "samples" else float(value) for key, value in metrics.items()}
+            metrics["skipped"] = self.skipped
+        return metrics
+
+
+ACCUMULATORS = {
+    "classification": ClassificationAccumulator,
+    "regression": RegressionAccumulator,
+}
+
+
+def accumulator(task_type):
+    if task_type not in ACCUMULATORS:
+        raise ValueError(f"No streaming metrics for task type: {task_type}")
+    return ACCUMULATORS[task_type]()
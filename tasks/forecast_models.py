@@ -0,0 +1,393 @@
+# tasks/forecast_models.py
+"""
+Vectorized forecasting models for AutoForecast.
+
+Every model is a small state machine over many series at once:
+    fit_<model>(Y, period)       Y (time, series) → state
+    update_<model>(state, Y)     appends observations, O(new points)
+    predict_<model>(state, steps) → forecast (steps, series)
+A state is a dict of arrays whose leading axis is the series, so states
+can be sliced per series (select_state) and stacked again (stack_states).
+Loops run over time steps, never over series.
+
+Smoothing parameters are picked per series from a small grid by
+one-step-ahead squared error, evaluated for the whole grid in one pass.
+"""
+
+from statistics import NormalDist
+
+import numpy as np
+
+ALPHAS = (0.1, 0.3, 0.5, 0.8)
+BETAS = (0.05, 0.2)
+GAMMAS = (0.1, 0.3)
+
+# Candidate season lengths for detect_period
+PERIODS = (4, 7, 12, 24, 52)
+
+# A season length is used when at least MIN_SEASONAL_SHARE of the series
+# reach MIN_SEASONAL_ACF at that lag
+MIN_SEASONAL_ACF = 0.3
+MIN_SEASONAL_SHARE = 0.05
+
+# Shortest training window the backtest will fit on
+MIN_TRAIN = 4
+
+
+def _horizon(steps):
+    return np.arange(1, steps + 1, dtype=float)[:, None]
+
+
+def _pick(values, sse):
+    """
+    values[g, series] of the grid row g with the lowest sse per series.
+    """
+    best = np.argmin(sse, axis=0)
+    return np.take_along_axis(values, best[None, :], axis=0)[0], best
+
+
+# ------------------------------------------------------------
+# Naive (last value)
+# ------------------------------------------------------------
+def fit_naive(Y, period=None):
+    return {"last": Y[-1].copy()}
+
+
+def update_naive(state, Y):
+    if len(Y):
+        state["last"] = Y[-1].copy()
+
+
+def predict_naive(state, steps):
+    return np.repeat(state["last"][None, :], steps, axis=0)
+
+
+# ------------------------------------------------------------
+# Linear trend (least squares, running sufficient statistics)
+# ------------------------------------------------------------
+def fit_linear(Y, period=None):
+    count = Y.shape[1]
+    state = {name: np.zeros(count) for name in ("n", "mean_t", "mean_y", "ctt", "cty")}
+    update_linear(state, Y)
+    return state
+
+
+def update_linear(state, Y):
+    """
+    Merges the new points' moments into the running ones (pairwise
+    update, numerically stable for long histories).
+    """
+    k = len(Y)
+    if k == 0:
+        return
+
+    n = state["n"]
+    j = np.arange(k, dtype=float) - (k - 1) / 2.0
+    batch_mean_y = Y.mean(axis=0)
+    batch_cty = j @ (Y - batch_mean_y)
+    batch_ctt = k * (k * k - 1) / 12.0
+
+    total = n + k
+    delta_t = (n + (k - 1) / 2.0) - state["mean_t"]
+    delta_y = batch_mean_y - state["mean_y"]
+
+    state["ctt"] = state["ctt"] + batch_ctt + delta_t * delta_t * n * k / total
+    state["cty"] = state["cty"] + batch_cty + delta_t * delta_y * n * k / total
+    state["mean_t"] = state["mean_t"] + delta_t * k / total
+    state["mean_y"] = state["mean_y"] + delta_y * k / total
+    state["n"] = total
+
+
+def predict_linear(state, steps):
+    slope = np.where(state["ctt"] > 0, state["cty"] / np.maximum(state["ctt"], 1e-12), 0.0)
+    t = state["n"] - 1 + _horizon(steps)
+    return state["mean_y"] + slope * (t - state["mean_t"])
+
+
+# ------------------------------------------------------------
+# Simple exponential smoothing
+# ------------------------------------------------------------
+def fit_ses(Y, period=None):
+    alphas = np.array(ALPHAS)[:, None]
+    level = np.repeat(Y[:1], len(ALPHAS), axis=0)
+    sse = np.zeros_like(level)
+
+    for y in Y[1:]:
+        err = y - level
+        sse += err * err
+        level = level + alphas * err
+
+    level, best = _pick(level, sse)
+    return {"alpha": np.array(ALPHAS)[best], "level": level}
+
+
+def update_ses(state, Y):
+    alpha, level = state["alpha"], state["level"]
+    for y in Y:
+        level = level + alpha * (y - level)
+    state["level"] = level
+
+
+def predict_ses(state, steps):
+    return np.repeat(state["level"][None, :], steps, axis=0)
+
+
+# ------------------------------------------------------------
+# Holt (additive trend)
+# ------------------------------------------------------------
+def _holt_step(alpha, beta, level, trend, y):
+    new_level = alpha * y + (1 - alpha) * (level + trend)
+    trend = beta * (new_level - level) + (1 - beta) * trend
+    return new_level, trend
+
+
+def fit_holt(Y, period=None):
+    grid = np.array([(a, b) for a in ALPHAS for b in BETAS])
+    alphas, betas = grid[:, :1], grid[:, 1:]
+
+    level = np.repeat(Y[:1], len(grid), axis=0)
+    trend = np.repeat(Y[1:2] - Y[:1], len(grid), axis=0)
+    sse = np.zeros_like(level)
+
+    for y in Y[1:]:
+        err = y - (level + trend)
+        sse += err * err
+        level, trend = _holt_step(alphas, betas, level, trend, y)
+
+    level, best = _pick(level, sse)
+    trend = np.take_along_axis(trend, best[None, :], axis=0)[0]
+    return {"alpha": grid[best, 0], "beta": grid[best, 1], "level": level, "trend": trend}
+
+
+def update_holt(state, Y):
+    level, trend = state["level"], state["trend"]
+    for y in Y:
+        level, trend = _holt_step(state["alpha"], state["beta"], level, trend, y)
+    state["level"], state["trend"] = level, trend
+
+
+def predict_holt(state, steps):
+    return state["level"] + _horizon(steps) * state["trend"]
+
+
+# ------------------------------------------------------------
+# Seasonal naive (repeat the last season)
+# ------------------------------------------------------------
+def fit_seasonal_naive(Y, period):
+    return {"window": Y[-period:].T.copy()}   # (series, period), oldest first
+
+
+def update_seasonal_naive(state, Y):
+    period = state["window"].shape[1]
+    state["window"] = np.concatenate([state["window"], Y.T], axis=1)[:, -period:]
+
+
+def predict_seasonal_naive(state, steps):
+    period = state["window"].shape[1]
+    return state["window"][:, np.arange(steps) % period].T
+
+
+# ------------------------------------------------------------
+# Holt-Winters (additive level + trend + season)
+# ------------------------------------------------------------
+def fit_holt_winters(Y, period):
+    grid = np.array([(a, b, g) for a in ALPHAS[1:3] for b in BETAS for g in GAMMAS])
+    alphas, betas, gammas = grid[:, :1], grid[:, 1:2], grid[:, 2:]
+
+    first, second = Y[:period].mean(axis=0), Y[period:2 * period].mean(axis=0)
+    level = np.repeat(first[None, :], len(grid), axis=0)
+    trend = np.repeat(((second - first) / period)[None, :], len(grid), axis=0)
+    season = np.repeat((Y[:period] - first)[:, None, :], len(grid), axis=1)   # (period, grid, series)
+    sse = np.zeros_like(level)
+
+    for t in range(period, len(Y)):
+        y, s = Y[t], season[t % period]
+        err = y - (level + trend + s)
+        sse += err * err
+        new_level = alphas * (y - s) + (1 - alphas) * (level + trend)
+        trend = betas * (new_level - level) + (1 - betas) * trend
+        season[t % period] = gammas * (y - new_level) + (1 - gammas) * s
+        level = new_level
+
+    level, best = _pick(level, sse)
+    return {
+        "alpha": grid[best, 0], "beta": grid[best, 1], "gamma": grid[best, 2],
+        "level": level,
+        "trend": np.take_along_axis(trend, best[None, :], axis=0)[0],
+        "season": np.take_along_axis(season, best[None, None, :], axis=1)[:, 0, :].T.copy(),   # (series, period)
+        "t": np.full(Y.shape[1], float(len(Y))),
+    }
+
+
+def update_holt_winters(state, Y):
+    rows = np.arange(len(state["level"]))
+    period = state["season"].shape[1]
+    alpha, beta, gamma = state["alpha"], state["beta"], state["gamma"]
+    level, trend, season, t = state["level"], state["trend"], state["season"], state["t"]
+
+    for y in Y:
+        idx = t.astype(np.int64) % period
+        s = season[rows, idx]
+        new_level = alpha * (y - s) + (1 - alpha) * (level + trend)
+        trend = beta * (new_level - level) + (1 - beta) * trend
+        season[rows, idx] = gamma * (y - new_level) + (1 - gamma) * s
+        level, t = new_level, t + 1
+
+    state["level"], state["trend"], state["t"] = level, trend, t
+
+
+def predict_holt_winters(state, steps):
+    period = state["season"].shape[1]
+    idx = (state["t"].astype(np.int64)[None, :] + np.arange(steps)[:, None]) % period
+    season = np.take_along_axis(state["season"].T, idx, axis=0)
+    return state["level"] + _horizon(steps) * state["trend"] + season
+
+
+MODELS = {
+    "naive": (fit_naive, update_naive, predict_naive),
+    "linear": (fit_linear, update_linear, predict_linear),
+    "ses": (fit_ses, update_ses, predict_ses),
+    "holt": (fit_holt, update_holt, predict_holt),
+    "seasonal_naive": (fit_seasonal_naive, update_seasonal_naive, predict_seasonal_naive),
+    "holt_winters": (fit_holt_winters, update_holt_winters, predict_holt_winters),
+}
+
+SEASONAL = ("seasonal_naive", "holt_winters")
+
+
+def fit_state(name, Y, period=None):
+    return MODELS[name][0](Y, period)
+
+
+def update_state(name, state, Y):
+    MODELS[name][1](state, Y)
+
+
+def predict_state(name, state, steps):
+    return MODELS[name][2](state, steps)
+
+
+def select_state(state, index):
+    """
+    State of a subset of series (index: int array or boolean mask).
+    """
+    return {key: value[index].copy() for key, value in state.items()}
+
+
+def stack_states(states):
+    return {key: np.stack([state[key] for state in states]) for key in states[0]}
+
+
+# ------------------------------------------------------------
+# Season detection / model selection
+# ------------------------------------------------------------
+def detect_period(Y, candidates=PERIODS):
+    """
+    Season length shared by the most series. A series is seasonal at a
+    candidate lag when the autocorrelation of its first differences
+    (trend removed) reaches MIN_SEASONAL_ACF and beats the half-period
+    lag, so smooth seasons are not mistaken for short ones.
+    None when fewer than MIN_SEASONAL_SHARE of the series are seasonal
+    at any candidate. Model selection still decides per series whether
+    the seasonal models are used.
+    """
+    diffs = np.diff(Y, axis=0)
+    dev = diffs - diffs.mean(axis=0)
+    denom = (dev * dev).sum(axis=0)
+    varying = denom > 0
+    if not varying.any():
+        return None
+    dev, denom = dev[:, varying], denom[varying]
+
+    def acf(lag):
+        return (dev[lag:] * dev[:-lag]).sum(axis=0) / denom
+
+    best, best_votes = None, max(1, int(np.ceil(MIN_SEASONAL_SHARE * len(denom)))) - 1
+    for period in candidates:
+        if len(dev) < 2 * period + 1:
+            continue
+        score = acf(period)
+        votes = int(((score >= MIN_SEASONAL_ACF) & (score > acf(period // 2))).sum())
+        if votes > best_votes:
+            best, best_votes = period, votes
+    return best
+
+
+def available(length, period):
+    names = ["naive", "linear", "ses", "holt"]
+    if period and length >= 2 * period:
+        names += list(SEASONAL)
+    return names
+
+
+def interval(values, sigma, level):
+    """
+    (lower, upper) for forecasts (steps, series): one-step sigma per
+    series widened with sqrt(horizon).
+    """
+    z = NormalDist().inv_cdf(0.5 + level / 2)
+    width = z * sigma[None, :] * np.sqrt(_horizon(len(values)))
+    return values - width, values + width
+
+
+def forecast(Y, steps, period=None, level=0.95):
+    """
+    Per-series model choice by backtest, then forecasts with intervals.
+
+    The last `holdout` points (up to `steps`) are held out, every model
+    is fitted on the rest and scored by MAE per series; each series is
+    then forecast with its best model refitted on the full history.
+    The one-step sigma is the backtest RMSE rescaled from the mean
+    holdout horizon. "states" maps each chosen model to (series
+    positions, fitted state) — kept by tasks/forecast_state.py.
+    """
+    if steps < 1:
+        raise ValueError("'steps' must be positive")
+
+    Y = np.asarray(Y, dtype=float)
+    if Y.ndim == 1:
+        Y = Y[:, None]
+    length, count = Y.shape
+
+    holdout = min(steps, max(1, length // 5))
+    if length - holdout < MIN_TRAIN:
+        # Too short to backtest: last value, sigma from step changes
+        names = ["naive"]
+        choice = np.zeros(count, dtype=int)
+        diffs = np.diff(Y, axis=0)
+        sigma = np.sqrt((diffs * diffs).mean(axis=0)) if len(diffs) else np.zeros(count)
+        mae = np.full(count, np.nan)
+    else:
+        train, test = Y[:-holdout], Y[-holdout:]
+        names = available(len(train), period)
+        errors = np.stack([
+            predict_state(name, fit_state(name, train, period), holdout) - test for name in names
+        ])   # (model, h, series)
+        mae_all = np.abs(errors).mean(axis=1)
+        choice = np.argmin(mae_all, axis=0)
+        mae = mae_all[choice, np.arange(count)]
+        rmse = np.sqrt((errors * errors).mean(axis=1))[choice, np.arange(count)]
+        sigma = rmse / np.sqrt((holdout + 1) / 2.0)
+
+    values = np.empty((steps, count))
+    states = {}
+    for i, name in enumerate(names):
+        chosen = choice == i
+        if chosen.any():
+            state = fit_state(name, Y[:, chosen], period)
+            values[:, chosen] = predict_state(name, state, steps)
+            states[name] = (np.flatnonzero(chosen), state)
+
+    lower, upper = interval(values, sigma, level)
+
+    return {
+        "models": [names[i] for i in choice],
+        "forecast": values.T,
+        "lower": lower.T,
+        "upper": upper.T,
+        "backtest_mae": mae,
+        "sigma": sigma,
+        "states": states,
+        "period": period,
+        "level": level,
+    }
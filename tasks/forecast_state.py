@@ -0,0 +1,289 @@
+# tasks/forecast_state.py
+
+import hashlib
+import os
+import pickle
+import threading
+import time
+from contextlib import contextmanager
+
+import numpy as np
+
+from config.settings import Settings
+from tasks import forecast_models
+from utils.file_lock import file_lock
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Weight of each new one-step error in the running sigma estimate
+SIGMA_DECAY = 0.05
+
+
+class ForecastStateStore:
+    """
+    Per-series forecast state for live feeds, keyed by series ID.
+
+    A series is fitted once from its history (model chosen by backtest,
+    tasks/forecast_models.py); afterwards only its model state is kept —
+    smoothing level / trend / season, or the running regression moments
+    of the linear model. Appending k observations costs O(k), and
+    forecasts are served from state without the history.
+
+    Series that share a model are updated and forecast together.
+    Each series is one file under DATA_DIR/forecast_state/series/, so an
+    update rewrites only the series it touches. Files are replaced
+    atomically and reloaded whenever another process has replaced them;
+    read-modify-write cycles hold an exclusive lock on
+    DATA_DIR/forecast_state/.lock, so workers sharing the disk can feed
+    the same or different series without losing updates.
+    """
+
+    def __init__(self, root=None):
+        self.root = root or os.path.join(Settings.DATA_DIR, "forecast_state")
+        self.series = {}     # id → {"model", "period", "state", "sigma", "n", "updated"}
+        self._versions = {}  # id → version of the series file it was loaded from / saved as
+        self._lock = threading.RLock()
+
+    # ------------------------------------------------------------
+    # Per-series files
+    # ------------------------------------------------------------
+    def _path(self, series_id):
+        name = hashlib.sha1(repr(series_id).encode("utf-8")).hexdigest()
+        return os.path.join(self.root, "series", f"{name}.pkl")
+
+    def _disk_version(self, path):
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_ino   # replaced (new inode) on every save
+
+    def _entries(self, ids):
+        """
+        {id: state} of the known series among ids, reloading any file
+        another process has replaced since it was read.
+        """
+        found = {}
+        for series_id in ids:
+            path = self._path(series_id)
+            version = self._disk_version(path)
+            if version is None:
+                self.series.pop(series_id, None)
+                self._versions.pop(series_id, None)
+                continue
+
+            if self._versions.get(series_id) != version:
+                try:
+                    with open(path, "rb") as fh:
+                        self.series[series_id] = pickle.load(fh)
+                except Exception as e:
+                    logger.warning("Ignoring unreadable forecast state %s: %s", path, e)
+                    continue
+                self._versions[series_id] = version
+
+            found[series_id] = self.series[series_id]
+        return found
+
+    def _save(self, entries):
+        os.makedirs(os.path.join(self.root, "series"), exist_ok=True)
+        for series_id, entry in entries.items():
+            path = self._path(series_id)
+            with open(f"{path}.tmp", "wb") as fh:
+                pickle.dump(entry, fh, pickle.HIGHEST_PROTOCOL)
+            os.replace(f"{path}.tmp", path)
+
+            self.series[series_id] = entry
+            self._versions[series_id] = self._disk_version(path)
+        logger.debug("Forecast state saved (%d series)", len(entries))
+
+    @contextmanager
+    def _write_lock(self):
+        """
+        Exclusive across threads and processes for one read-modify-write.
+        """
+        with self._lock, file_lock(os.path.join(self.root, ".lock")):
+            yield
+
+    # ------------------------------------------------------------
+    # Input validation
+    # ------------------------------------------------------------
+    def _observations(self, observations):
+        """
+        {id: 1D float array}; raises ValueError for values that are not
+        finite numbers, before any state is touched.
+        """
+        checked = {}
+        for series_id, values in observations.items():
+            try:
+                values = np.asarray(values, dtype=float).ravel()
+            except (TypeError, ValueError):
+                raise ValueError(f"Series {series_id!r} must contain numbers")
+            if not np.isfinite(values).all():
+                raise ValueError(f"Series {series_id!r} contains NaN or infinite values")
+            checked[series_id] = values
+        return checked
+
+    # ------------------------------------------------------------
+    # Fit / update / forecast
+    # ------------------------------------------------------------
+    def fit(self, histories, season=None):
+        """
+        Fits new series from their full histories ({id: [values...]}).
+        Series of equal length are fitted together.
+        """
+        histories = self._observations(histories)
+        with self._write_lock():
+            return self._fit(histories, season)
+
+    def _fit(self, histories, season):
+        by_length = {}
+        for series_id, values in histories.items():
+            by_length.setdefault(len(values), []).append(series_id)
+
+        entries = {}
+        for length, ids in by_length.items():
+            if length < 2:
+                raise ValueError(f"Series {ids[0]!r} needs at least 2 observations to be fitted")
+
+            Y = np.array([histories[series_id] for series_id in ids], dtype=float).T
+            period = season or forecast_models.detect_period(Y)
+            fc = forecast_models.forecast(Y, Settings.FORECAST_STEPS, period)
+
+            for name, (positions, state) in fc["states"].items():
+                for row, position in enumerate(positions):
+                    entries[ids[position]] = {
+                        "model": name,
+                        "period": period if name in forecast_models.SEASONAL else None,
+                        "state": forecast_models.select_state(state, row),
+                        "sigma": float(fc["sigma"][position]),
+                        "n": length,
+                        "updated": time.time(),
+                    }
+
+        self._save(entries)
+        return list(histories)
+
+    def append(self, observations):
+        """
+        Adds new observations ({id: [values...]}) to known series.
+        Each point first scores the current one-step forecast, which
+        keeps the interval sigma up to date.
+        """
+        observations = self._observations(observations)
+        with self._write_lock():
+            return self._append(observations)
+
+    def _append(self, observations):
+        entries = self._entries(observations)
+        unknown = [series_id for series_id in observations if series_id not in entries]
+        if unknown:
+            raise KeyError(unknown[0])
+
+        groups = {}
+        for series_id, values in observations.items():
+            if len(values):
+                key = (entries[series_id]["model"], entries[series_id]["period"], len(values))
+                groups.setdefault(key, []).append(series_id)
+
+        changed = {}
+        for (name, _, count), ids in groups.items():
+            state = forecast_models.stack_states([entries[series_id]["state"] for series_id in ids])
+            Y = np.array([observations[series_id] for series_id in ids], dtype=float).T
+            var = np.array([entries[series_id]["sigma"] for series_id in ids]) ** 2
+
+            for y in Y:
+                err = y - forecast_models.predict_state(name, state, 1)[0]
+                var = (1 - SIGMA_DECAY) * var + SIGMA_DECAY * err * err
+                forecast_models.update_state(name, state, y[None, :])
+
+            now = time.time()
+            for row, series_id in enumerate(ids):
+                entry = dict(entries[series_id])
+                entry["state"] = forecast_models.select_state(state, row)
+                entry["sigma"] = float(np.sqrt(var[row]))
+                entry["n"] += count
+                entry["updated"] = now
+                changed[series_id] = entry
+
+        self._save(changed)
+        return list(observations)
+
+    def forecast(self, ids, steps, level=0.95):
+        """
+        Forecasts with intervals from state: {id: {...}}.
+        """
+        with self._lock:
+            entries = self._entries(ids)
+            unknown = [series_id for series_id in ids if series_id not in entries]
+            if unknown:
+                raise KeyError(unknown[0])
+
+            groups = {}
+            for series_id in ids:
+                groups.setdefault((entries[series_id]["model"], entries[series_id]["period"]), []).append(series_id)
+
+            result = {}
+            for (name, period), group in groups.items():
+                state = forecast_models.stack_states([entries[series_id]["state"] for series_id in group])
+                values = forecast_models.predict_state(name, state, steps)
+                sigma = np.array([entries[series_id]["sigma"] for series_id in group])
+                lower, upper = forecast_models.interval(values, sigma, level)
+
+                for col, series_id in enumerate(group):
+                    result[series_id] = {
+                        "model": name,
+                        "season": period,
+                        "observations": entries[series_id]["n"],
+                        "forecast": values[:, col],
+                        "lower": lower[:, col],
+                        "upper": upper[:, col],
+                    }
+            return result
+
+    def update(self, observations, steps=5, season=None, level=0.95):
+        """
+        Live-feed entry point: appends to known series, fits unknown
+        ones from the given points, then forecasts all of them.
+        """
+        observations = self._observations(observations)
+        with self._write_lock():
+            entries = self._entries(observations)
+            new = {k: v for k, v in observations.items() if k not in entries}
+            known = {k: v for k, v in observations.items() if k in entries}
+            if new:
+                self._fit(new, season)
+            if known:
+                self._append(known)
+            return {
+                "fitted": list(new),
+                "appended": list(known),
+                "series": self.forecast(list(observations), steps, level),
+            }
+
+    def delete(self, series_id):
+        with self._write_lock():
+            if series_id not in self._entries([series_id]):
+                raise KeyError(series_id)
+            os.remove(self._path(series_id))
+            self.series.pop(series_id, None)
+            self._versions.pop(series_id, None)
+
+    def describe(self, series_id):
+        with self._lock:
+            entries = self._entries([series_id])
+            if series_id not in entries:
+                raise KeyError(series_id)
+            entry = entries[series_id]
+            return {
+                "series_id": series_id,
+                "model": entry["model"],
+                "season": entry["period"],
+                "observations": entry["n"],
+                "sigma": entry["sigma"],
+                "updated": entry["updated"],
+            }
+
+
+# Singleton instance (state is loaded on first use)
+forecast_state = ForecastStateStore()
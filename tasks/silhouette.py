@@ -0,0 +1,178 @@
+# tasks/silhouette.py
+"""
+Scalable silhouette score (Euclidean), shared by AutoEvaluate and
+AutoModeler.
+
+- exact: every point against every point, but the distance matrix is
+  never materialized. Points are sorted by cluster, and row blocks are
+  compared with column tiles of SILHOUETTE_TILE_ROWS x SILHOUETTE_TILE_COLS
+  distances. Each tile is reduced straight into per-cluster distance
+  sums (np.add.reduceat over the cluster runs). Row blocks are spread
+  over a process pool above SILHOUETTE_PARALLEL_MIN points.
+- sampled: the exact silhouette of a uniform sample of points (each
+  still compared with all points), with a normal confidence interval
+  for the mean (finite-population corrected).
+
+silhouette() picks exact up to SILHOUETTE_EXACT_MAX points, else sampled.
+"""
+
+from statistics import NormalDist
+
+import numpy as np
+
+from config.settings import Settings
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+_SHARED = {}   # per worker process: the sorted points (set by _init_worker)
+
+
+# ------------------------------------------------------------
+# Blocked kernel
+# ------------------------------------------------------------
+def cluster_sums(X, codes, norms, rows, tile_rows, tile_cols):
+    """
+    (len(rows), clusters) sums of distances from each X[rows] to all
+    points of every cluster. X must be sorted by codes.
+    """
+    n = len(X)
+    k = int(codes[-1]) + 1
+    out = np.zeros((len(rows), k))
+
+    for r0 in range(0, len(rows), tile_rows):
+        idx = rows[r0:r0 + tile_rows]
+        A, a_norms = X[idx], norms[idx]
+        block = out[r0:r0 + len(idx)]
+
+        for c0 in range(0, n, tile_cols):
+            c1 = min(c0 + tile_cols, n)
+            D = a_norms[:, None] - 2.0 * (A @ X[c0:c1].T) + norms[None, c0:c1]
+            np.maximum(D, 0.0, out=D)
+            np.sqrt(D, out=D)
+
+            inside = (idx >= c0) & (idx < c1)   # exact zero self-distance
+            D[np.flatnonzero(inside), idx[inside] - c0] = 0.0
+
+            tile_codes = codes[c0:c1]
+            starts = np.flatnonzero(np.r_[True, tile_codes[1:] != tile_codes[:-1]])
+            block[:, tile_codes[starts]] += np.add.reduceat(D, starts, axis=1)
+
+    return out
+
+
+def _init_worker(X, codes):
+    _SHARED.update(X=X, codes=codes, norms=(X * X).sum(axis=1))
+
+
+def _worker_sums(rows):
+    return cluster_sums(
+        _SHARED["X"], _SHARED["codes"], _SHARED["norms"], rows,
+        Settings.SILHOUETTE_TILE_ROWS, Settings.SILHOUETTE_TILE_COLS
+    )
+
+
+def _sums(X, codes, rows, workers):
+    """
+    Serial below SILHOUETTE_PARALLEL_MIN points (or with one worker),
+    otherwise row blocks on a process pool.
+    """
+    workers = workers or Settings.SILHOUETTE_WORKERS
+    if workers > 1 and len(X) >= Settings.SILHOUETTE_PARALLEL_MIN and len(rows) > Settings.SILHOUETTE_TILE_ROWS:
+        from concurrent.futures import ProcessPoolExecutor
+
+        parts = np.array_split(rows, min(4 * workers, -(-len(rows) // Settings.SILHOUETTE_TILE_ROWS)))
+        try:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(X, codes)) as pool:
+                return np.vstack(list(pool.map(_worker_sums, parts)))
+        except Exception as e:   # e.g. no multiprocessing on the platform
+            logger.warning("Parallel silhouette failed, running serially: %s", e)
+
+    return cluster_sums(
+        X, codes, (X * X).sum(axis=1), rows,
+        Settings.SILHOUETTE_TILE_ROWS, Settings.SILHOUETTE_TILE_COLS
+    )
+
+
+# ------------------------------------------------------------
+# Public API
+# ------------------------------------------------------------
+def _prepare(X, labels):
+    X = np.asarray(X, dtype=float)
+    if X.ndim == 1:
+        X = X.reshape(-1, 1)
+    _, codes = np.unique(np.asarray(labels), return_inverse=True)
+    codes = codes.ravel()
+
+    if len(codes) != len(X):
+        raise ValueError("X and labels must have the same length")
+    k = int(codes.max()) + 1 if len(codes) else 0
+    if not 2 <= k <= len(X) - 1:
+        raise ValueError(f"Number of labels is {k}. Valid values are 2 to n_samples - 1 (inclusive)")
+
+    order = np.argsort(codes, kind="stable")
+    return X[order], codes[order], order
+
+
+def silhouette_samples(X, labels, rows=None, workers=None):
+    """
+    Exact silhouette value of each point (or of X[rows] only).
+    Points alone in their cluster score 0, as in sklearn.
+    """
+    X, codes, order = _prepare(X, labels)
+    counts = np.bincount(codes)
+
+    if rows is None:
+        position = np.arange(len(X))
+    else:
+        position = np.empty(len(X), dtype=np.int64)
+        position[order] = np.arange(len(X))
+        position = position[np.asarray(rows)]
+
+    sums = _sums(X, codes, position, workers)
+    own = codes[position]
+    hit = np.arange(len(position))
+
+    a = sums[hit, own] / np.maximum(counts[own] - 1, 1)
+    sums[hit, own] = np.inf
+    b = (sums / counts).min(axis=1)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        values = np.nan_to_num((b - a) / np.maximum(a, b))
+    values[counts[own] == 1] = 0.0
+
+    if rows is not None:
+        return values
+    out = np.empty(len(X))
+    out[order] = values
+    return out
+
+
+def silhouette(X, labels, method="auto", sample_size=None, level=0.95, seed=0, workers=None):
+    """
+    Mean silhouette: {"score", "method", "points", "evaluated",
+    "lower", "upper", "level"}. Exact scores have lower == upper.
+    """
+    if method not in ("auto", "exact", "sampled"):
+        raise ValueError(f"Unknown silhouette method: {method}")
+
+    n = len(X)
+    sample_size = sample_size or Settings.SILHOUETTE_SAMPLE_SIZE
+    if method == "auto":
+        method = "exact" if n <= Settings.SILHOUETTE_EXACT_MAX else "sampled"
+    if method == "sampled" and sample_size >= n:
+        method = "exact"
+
+    if method == "exact":
+        score = float(silhouette_samples(X, labels, workers=workers).mean())
+        return {"score": score, "method": "exact", "points": n, "evaluated": n,
+                "lower": score, "upper": score, "level": level}
+
+    rows = np.random.default_rng(seed).choice(n, size=sample_size, replace=False)
+    values = silhouette_samples(X, labels, rows=rows, workers=workers)
+
+    score = float(values.mean())
+    z = NormalDist().inv_cdf(0.5 + level / 2)
+    half = z * values.std(ddof=1) / np.sqrt(sample_size) * np.sqrt(1 - sample_size / n)
+    return {"score": score, "method": "sampled", "points": n, "evaluated": int(sample_size),
+            "lower": float(max(-1.0, score - half)), "upper": float(min(1.0, score + half)), "level": level}
@@ -0,0 +1,26 @@
+# utils/file_lock.py
+
+import os
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # not on Windows: callers are only serialized per process
+    fcntl = None
+
+
+@contextmanager
+def file_lock(path):
+    """
+    Exclusive lock across processes sharing the disk (flock on `path`,
+    created if missing). Not re-entrant; pair it with a thread lock.
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "ab") as fh:
+        if fcntl is not None:
+            fcntl.flock(fh, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(fh, fcntl.LOCK_UN)
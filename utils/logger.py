@@ -1,51 +1,195 @@
 # utils/logger.py
 
+import atexit
+import contextvars
+import json
 import logging
+import logging.handlers
 import os
+import queue
+import uuid
 
-class SifraLogger:
+from config.settings import Settings
+
+# Request ID of the request being served (set per request by the API)
+request_id_var = contextvars.ContextVar("sifra_request_id", default="-")
+
+_listener = None
+
+# LogRecord attributes that are not user-supplied `extra` fields
+_RESERVED = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime", "request_id"}
+
+
+# ------------------------------------------------------------
+# Request IDs
+# ------------------------------------------------------------
+def new_request_id():
+    return uuid.uuid4().hex[:16]
+
+
+def set_request_id(request_id=None):
     """
-    Central logging utility for SIFRA AI.
-    Logs to console + file: logs/sifra.log
+    Binds a request ID to the current context; returns the token
+    for request_id_var.reset().
     """
+    return request_id_var.set(request_id or new_request_id())
 
-    def __init__(self, name="SIFRA_AI"):
-        # Ensure logs folder exists
-        os.makedirs("logs", exist_ok=True)
 
-        log_file = "logs/sifra.log"
+def get_request_id():
+    return request_id_var.get()
+
+
+class RequestIdFilter(logging.Filter):
+    """
+    Stamps every record with the current request ID.
+    Runs in the calling thread, before the record is queued.
+    """
+
+    def filter(self, record):
+        record.request_id = request_id_var.get()
+        return True
+
+
+# ------------------------------------------------------------
+# Formatters
+# ------------------------------------------------------------
+class JsonFormatter(logging.Formatter):
+    """
+    One JSON object per line: ts, level, logger, request_id, message
+    plus any `extra={...}` fields.
+    """
+
+    def format(self, record):
+        entry = {
+            "ts": round(record.created, 3),
+            "level": record.levelname,
+            "logger": record.name,
+            "request_id": getattr(record, "request_id", "-"),
+            "message": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RESERVED:
+                entry[key] = value
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+TEXT_FORMAT = "%(asctime)s | %(name)s | %(levelname)s | %(request_id)s | %(message)s"
+
+
+# ------------------------------------------------------------
+# Setup (idempotent)
+# ------------------------------------------------------------
+def setup_logging():
+    """
+    Configures the "sifra" logger tree once per process:
+    records go through a QueueHandler so callers never block on I/O;
+    a QueueListener thread writes them to the log file and console.
+    """
+    global _listener
+
+    root = logging.getLogger("sifra")
+    if getattr(root, "_sifra_configured", False):
+        return root
+    root._sifra_configured = True
+    root.propagate = False
 
-        # Configure logger
-        self.logger = logging.getLogger(name)
-        self.logger.setLevel(logging.INFO)
+    if not Settings.ENABLE_LOGS:
+        root.addHandler(logging.NullHandler())
+        root.setLevel(logging.CRITICAL + 1)
+        return root
 
-        # File handler
-        file_handler = logging.FileHandler(log_file)
-        file_handler.setLevel(logging.INFO)
+    root.setLevel(Settings.LOG_LEVEL)
+
+    formatter = JsonFormatter() if Settings.LOG_FORMAT == "json" else logging.Formatter(TEXT_FORMAT)
+    handlers = []
+
+    if Settings.LOG_FILE:
+        os.makedirs(os.path.dirname(Settings.LOG_FILE) or ".", exist_ok=True)
+        handlers.append(logging.FileHandler(Settings.LOG_FILE))
+    if Settings.LOG_CONSOLE:
+        handlers.append(logging.StreamHandler())
+
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    log_queue = queue.SimpleQueue()
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    queue_handler.addFilter(RequestIdFilter())
+    root.addHandler(queue_handler)
+
+    _listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    atexit.register(shutdown_logging)
+    return root
+
+
+def shutdown_logging():
+    """
+    Flushes queued records (called at exit).
+    """
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def _reset_after_fork():
+    """
+    A forked worker inherits the queue but not the listener thread:
+    start over with a fresh queue + listener of its own.
+    """
+    global _listener
+    root = logging.getLogger("sifra")
+    if not getattr(root, "_sifra_configured", False):
+        return
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root._sifra_configured = False
+    _listener = None
+    setup_logging()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def get_logger(name):
+    """
+    Logger under the "sifra" tree. Use lazy %-style arguments:
+        logger.debug("Shape: %s", df.shape)
+    """
+    setup_logging()
+    if not name.startswith("sifra"):
+        name = f"sifra.{name}"
+    return logging.getLogger(name)
+
+
+class SifraLogger:
+    """
+    Central logging utility for SIFRA AI (thin wrapper over get_logger).
+    Messages are formatted lazily, only when the level is enabled.
+    """
+
+    def __init__(self, name="SIFRA_AI"):
+        self.logger = get_logger(name)
 
-        # Console handler
-        console_handler = logging.StreamHandler()
-        console_handler.setLevel(logging.INFO)
+    def isEnabledFor(self, level):
+        return self.logger.isEnabledFor(level)
 
-        formatter = logging.Formatter(
-            "%(asctime)s | %(name)s | %(levelname)s | %(message)s"
-        )
+    def debug(self, message, *args, **kwargs):
+        self.logger.debug(message, *args, **kwargs)
 
-        file_handler.setFormatter(formatter)
-        console_handler.setFormatter(formatter)
+    def info(self, message, *args, **kwargs):
+        self.logger.info(message, *args, **kwargs)
 
-        # Avoid double logging
-        if not self.logger.handlers:
-            self.logger.addHandler(file_handler)
-            self.logger.addHandler(console_handler)
+    def warning(self, message, *args, **kwargs):
+        self.logger.warning(message, *args, **kwargs)
 
-    def info(self, message):
-        self.logger.info(message)
+    def error(self, message, *args, **kwargs):
+        self.logger.error(message, *args, **kwargs)
 
-    def error(self, message):
-        self.logger.error(message)
 
-    def warning(self, message):
-        self.logger.warning(message)
 # Singleton instance
-sifra_logger = SifraLogger()
\ No newline at end of file
+sifra_logger = SifraLogger()
@@ -0,0 +1,156 @@
+# utils/metrics.py
+
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+
+from config.settings import Settings
+
+# Per-request stage timings (a dict while the request asked for them)
+request_timings = contextvars.ContextVar("sifra_request_timings", default=None)
+
+
+# ------------------------------------------------------------
+# Histogram / registry (Prometheus text exposition)
+# ------------------------------------------------------------
+class Histogram:
+    """
+    Cumulative-bucket histogram (Prometheus semantics).
+    """
+
+    def __init__(self, buckets):
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)   # last = +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        else:
+            self.counts[-1] += 1
+        self.sum += value
+        self.count += 1
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(labels, extra=None):
+    items = list(labels) + ([extra] if extra else [])
+    if not items:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in items) + "}"
+
+
+class MetricsRegistry:
+    """
+    In-process metrics for SIFRA AI: histograms keyed by (name, labels).
+    Each worker process keeps its own registry.
+    """
+
+    def __init__(self):
+        self._histograms = {}   # name → {labels tuple → Histogram}
+        self._help = {}
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def histogram(self, name, help_text, buckets):
+        self._help[name] = help_text
+        self._buckets[name] = buckets
+        self._histograms.setdefault(name, {})
+
+    def observe(self, name, value, **labels):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self._histograms[name]
+            if key not in series:
+                series[key] = Histogram(self._buckets[name])
+            series[key].observe(value)
+
+    def render(self):
+        """
+        Prometheus text format (version 0.0.4).
+        """
+        lines = []
+        with self._lock:
+            for name, series in self._histograms.items():
+                lines.append(f"# HELP {name} {self._help[name]}")
+                lines.append(f"# TYPE {name} histogram")
+                for labels, hist in series.items():
+                    cumulative = 0
+                    for bound, count in zip(hist.buckets, hist.counts):
+                        cumulative += count
+                        lines.append(f"{name}_bucket{_labels(labels, ('le', repr(float(bound))))} {cumulative}")
+                    lines.append(f"{name}_bucket{_labels(labels, ('le', '+Inf'))} {hist.count}")
+                    lines.append(f"{name}_sum{_labels(labels)} {hist.sum}")
+                    lines.append(f"{name}_count{_labels(labels)} {hist.count}")
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+registry.histogram("sifra_stage_seconds", "Wall time per SifraCore.run stage.", Settings.METRICS_STAGE_BUCKETS)
+registry.histogram("sifra_stage_cpu_seconds", "CPU time per SifraCore.run stage.", Settings.METRICS_STAGE_BUCKETS)
+registry.histogram("sifra_stage_input_cells", "Input size (cells) per SifraCore.run stage.", Settings.METRICS_SIZE_BUCKETS)
+registry.histogram("sifra_request_seconds", "API request latency by route.", Settings.METRICS_REQUEST_BUCKETS)
+
+
+# ------------------------------------------------------------
+# Stage timing
+# ------------------------------------------------------------
+def _size(data):
+    size = getattr(data, "size", None)
+    if size is not None:
+        return int(size)
+    try:
+        return len(data)
+    except TypeError:
+        return 0
+
+
+@contextmanager
+def stage(name, data=None):
+    """
+    Times one pipeline stage (wall + thread CPU time) and records it in
+    the histograms and, when requested, in the per-request timings.
+        with stage("trend", clean_data):
+            ...
+    """
+    if not Settings.METRICS_ENABLED:
+        yield
+        return
+
+    wall, cpu = time.perf_counter(), time.thread_time()
+    try:
+        yield
+    finally:
+        wall = time.perf_counter() - wall
+        cpu = time.thread_time() - cpu
+        cells = _size(data)
+
+        registry.observe("sifra_stage_seconds", wall, stage=name)
+        registry.observe("sifra_stage_cpu_seconds", cpu, stage=name)
+        registry.observe("sifra_stage_input_cells", cells, stage=name)
+
+        timings = request_timings.get()
+        if timings is not None:
+            entry = timings.setdefault(name, {"calls": 0, "wall_ms": 0.0, "cpu_ms": 0.0, "input_cells": cells})
+            entry["calls"] += 1
+            entry["wall_ms"] = round(entry["wall_ms"] + wall * 1000, 3)
+            entry["cpu_ms"] = round(entry["cpu_ms"] + cpu * 1000, 3)
+
+
+def collect_timings():
+    """
+    Starts collecting per-request stage timings in the current context.
+    """
+    return request_timings.set({})
+
+
+def observe_request(route, method, status, seconds):
+    if Settings.METRICS_ENABLED:
+        registry.observe("sifra_request_seconds", seconds, route=route, method=method, status=status)
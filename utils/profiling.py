@@ -0,0 +1,153 @@
+# utils/profiling.py
+
+import cProfile
+import io
+import json
+import os
+import pstats
+import re
+import shutil
+import threading
+import time
+import tracemalloc
+import uuid
+
+from config.settings import Settings
+
+_ID_PATTERN = re.compile(r"^[0-9a-f]{16}$")
+
+# cProfile and tracemalloc are process-wide: one profiled request at a time
+_active = threading.Lock()
+
+ARTIFACTS = {
+    "profile.pstats": "application/octet-stream",
+    "cpu.txt": "text/plain",
+    "memory.txt": "text/plain",
+    "meta.json": "application/json",
+}
+
+
+def profile_root():
+    return os.path.join(Settings.DATA_DIR, "profiles")
+
+
+def profile_dir(profile_id):
+    if not isinstance(profile_id, str) or not _ID_PATTERN.match(profile_id):
+        raise KeyError(f"Invalid profile id: {profile_id!r}")
+    return os.path.join(profile_root(), profile_id)
+
+
+def requested(flag):
+    """
+    True when a request flag ("1" / "true") asks for profiling and
+    profiling is enabled in Settings.
+    """
+    return Settings.PROFILING_ENABLED and str(flag).lower() in ("1", "true")
+
+
+class ProfileSession:
+    """
+    Profiles one request: cProfile for CPU time, tracemalloc for peak
+    memory and the allocation sites responsible for it.
+    Artifacts are written to DATA_DIR/profiles/<id>/.
+    """
+
+    def __init__(self, label):
+        self.label = label
+        self.profile_id = uuid.uuid4().hex[:16]
+        self.profiler = cProfile.Profile()
+        self._owns_tracemalloc = False
+        self._started = None
+
+    def start(self):
+        """
+        Returns False (and profiles nothing) when another request is
+        already being profiled.
+        """
+        if not _active.acquire(blocking=False):
+            return False
+
+        try:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start(Settings.PROFILE_TRACEBACK_DEPTH)
+                self._owns_tracemalloc = True
+            tracemalloc.reset_peak()
+            self._started = time.perf_counter()
+            self.profiler.enable()
+        except Exception:
+            self._cleanup()
+            raise
+        return True
+
+    def stop(self, **meta):
+        """
+        Stops profiling, writes the artifacts and returns the meta dict.
+        """
+        try:
+            self.profiler.disable()
+            wall = time.perf_counter() - self._started
+            snapshot = tracemalloc.take_snapshot()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            self._cleanup()
+
+        path = profile_dir(self.profile_id)
+        os.makedirs(path, exist_ok=True)
+
+        self.profiler.dump_stats(os.path.join(path, "profile.pstats"))
+
+        cpu = io.StringIO()
+        pstats.Stats(self.profiler, stream=cpu).sort_stats("cumulative").print_stats(Settings.PROFILE_TOP)
+        with open(os.path.join(path, "cpu.txt"), "w", encoding="utf-8") as fh:
+            fh.write(cpu.getvalue())
+
+        with open(os.path.join(path, "memory.txt"), "w", encoding="utf-8") as fh:
+            fh.write(f"Peak traced memory: {peak / (1024 * 1024):.3f} MB\n\n")
+            for stat in snapshot.statistics("traceback")[:Settings.PROFILE_TOP]:
+                fh.write(f"{stat.size / 1024:.1f} KiB in {stat.count} blocks\n")
+                for line in stat.traceback.format(limit=Settings.PROFILE_TRACEBACK_DEPTH):
+                    fh.write(f"  {line}\n")
+                fh.write("\n")
+
+        meta = dict(meta, profile_id=self.profile_id, label=self.label, created=time.time(),
+                    wall_ms=round(wall * 1000, 3), peak_mem_mb=round(peak / (1024 * 1024), 3),
+                    artifacts=sorted(ARTIFACTS))
+        with open(os.path.join(path, "meta.json"), "w", encoding="utf-8") as fh:
+            json.dump(meta, fh)
+
+        prune()
+        return meta
+
+    def _cleanup(self):
+        if self._owns_tracemalloc:
+            tracemalloc.stop()
+        _active.release()
+
+
+def load_meta(profile_id):
+    path = os.path.join(profile_dir(profile_id), "meta.json")
+    if not os.path.exists(path):
+        raise KeyError(f"Unknown profile id: {profile_id}")
+    with open(path, "r", encoding="utf-8") as fh:
+        return json.load(fh)
+
+
+def artifact_path(profile_id, name):
+    if name not in ARTIFACTS:
+        raise KeyError(f"Unknown artifact: {name}")
+    load_meta(profile_id)
+    return os.path.join(profile_dir(profile_id), name)
+
+
+def prune():
+    """
+    Keeps only the newest PROFILE_KEEP profiles on disk.
+    """
+    root = profile_root()
+    if not os.path.isdir(root):
+        return
+    entries = sorted(
+        (os.path.getmtime(os.path.join(root, name)), name) for name in os.listdir(root)
+    )
+    for _, name in entries[:-Settings.PROFILE_KEEP]:
+        shutil.rmtree(os.path.join(root, name), ignore_errors=True)
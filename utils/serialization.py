@@ -0,0 +1,157 @@
+# utils/serialization.py
+
+import base64
+import io
+import json
+
+import numpy as np
+
+try:
+    import orjson
+except ImportError:  # optional fast encoder
+    orjson = None
+
+# Arrays larger than this are streamed block by block by the stdlib encoder
+STREAM_MIN_CELLS = 10000
+STREAM_BLOCK_ROWS = 2048
+
+
+def json_default(obj):
+    """
+    Fallback encoder for NumPy values (stdlib json.dumps).
+    """
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if isinstance(obj, np.generic):
+        value = obj.item()
+        return float(value) if isinstance(value, np.floating) else value   # long double
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _orjson_array(arr):
+    """
+    Numeric array in a layout orjson encodes correctly: contiguous,
+    native byte order, float16 / long double widened to float64.
+    """
+    dtype = arr.dtype.newbyteorder("=")
+    if dtype.kind == "f" and dtype.itemsize not in (4, 8):
+        dtype = np.dtype(np.float64)
+    return np.ascontiguousarray(arr, dtype=dtype)
+
+
+def _orjson_default(obj):
+    """
+    orjson fallback: numeric arrays it could not take directly (views,
+    float16, ...) are passed back normalized, which OPT_SERIALIZE_NUMPY
+    encodes natively; anything else becomes a list.
+    """
+    if isinstance(obj, np.ndarray) and obj.dtype.kind in "biuf":
+        arr = _orjson_array(obj)
+        if arr is not obj:
+            return arr
+    return json_default(obj)
+
+
+def _orjson_ready(obj):
+    """
+    Byte-swaps non-native arrays before orjson sees them — it encodes
+    their raw bytes as native (wrong values) instead of calling default.
+    """
+    if isinstance(obj, np.ndarray):
+        return obj if obj.dtype.isnative or obj.dtype.kind not in "biuf" else _orjson_array(obj)
+    if isinstance(obj, dict):
+        return {key: _orjson_ready(value) for key, value in obj.items()}
+    if isinstance(obj, (list, tuple)) and any(isinstance(v, (np.ndarray, dict, list, tuple)) for v in obj):
+        return [_orjson_ready(value) for value in obj]
+    return obj
+
+
+# ------------------------------------------------------------
+# JSON encoders
+# ------------------------------------------------------------
+def dumps(obj):
+    """
+    Encodes obj to JSON bytes in one shot.
+    Uses orjson (NumPy buffers serialized natively) when installed.
+    """
+    if orjson is not None:
+        return orjson.dumps(
+            _orjson_ready(obj),
+            default=_orjson_default,
+            option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        )
+    return json.dumps(obj, default=json_default).encode("utf-8")
+
+
+def _iter_array(arr):
+    if arr.ndim == 0:
+        yield json.dumps(arr.item())
+        return
+
+    yield "["
+    for start in range(0, arr.shape[0], STREAM_BLOCK_ROWS):
+        block = json.dumps(arr[start:start + STREAM_BLOCK_ROWS].tolist())[1:-1]
+        yield ("," if start else "") + block
+    yield "]"
+
+
+def iter_json(obj):
+    """
+    Incremental stdlib encoder: large numeric arrays are converted one
+    block of rows at a time, so peak memory stays bounded.
+    """
+    if isinstance(obj, np.ndarray) and obj.dtype.kind in "biuf" and obj.size >= STREAM_MIN_CELLS:
+        yield from _iter_array(obj)
+    elif isinstance(obj, dict):
+        yield "{"
+        for i, (key, value) in enumerate(obj.items()):
+            yield ("," if i else "") + json.dumps(str(key)) + ":"
+            yield from iter_json(value)
+        yield "}"
+    else:
+        yield json.dumps(obj, default=json_default)
+
+
+# ------------------------------------------------------------
+# Binary encoders
+# ------------------------------------------------------------
+def to_npy(arr):
+    buf = io.BytesIO()
+    np.save(buf, np.ascontiguousarray(arr), allow_pickle=False)
+    return buf.getvalue()
+
+
+def to_arrow(arr, column_names=None, metadata=None):
+    """
+    Encodes a 1D/2D array as an Arrow IPC stream (requires pyarrow).
+    """
+    import pyarrow as pa
+
+    arr = np.asarray(arr)
+    if arr.ndim == 1:
+        arr = arr.reshape(-1, 1)
+
+    names = list(column_names) if column_names is not None else [str(i) for i in range(arr.shape[1])]
+    # from_arrays: repeated names (e.g. feature names) must not collapse
+    table = pa.Table.from_arrays([pa.array(arr[:, i]) for i in range(arr.shape[1])], names=names)
+    if metadata:
+        table = table.replace_schema_metadata(
+            {key: json.dumps(value, default=json_default) for key, value in metadata.items()}
+        )
+
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def to_base64(arr, dtype="float32"):
+    arr = np.ascontiguousarray(arr, dtype=dtype)
+    return {
+        "encoding": "base64",
+        "dtype": str(arr.dtype),
+        "shape": list(arr.shape),
+        "data": base64.b64encode(arr.tobytes()).decode("ascii"),
+    }